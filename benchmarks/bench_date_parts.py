@@ -0,0 +1,69 @@
+"""Benchmark da derivação das partes de data (por linha x por data distinta).
+
+Uso:
+    python benchmarks/bench_date_parts.py --rows 10000000 --days 4000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.date_parts import derive_date_parts
+
+
+def synthetic_dates(rows: int, days: int, seed: int = 42) -> pd.Series:
+    """Gera `rows` datas sorteadas entre `days` dias distintos."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2015-01-01", "ns")
+    offsets = rng.integers(0, days, size=rows).astype("timedelta64[D]")
+    return pd.Series(start + offsets, name="Date")
+
+
+def derive_per_row(dates: pd.Series) -> pd.DataFrame:
+    """Implementação anterior: strftime e isocalendar em todas as linhas."""
+    return pd.DataFrame({
+        "Day": dates.dt.day,
+        "Month": dates.dt.month,
+        "Year": dates.dt.year,
+        "Month_Year": dates.dt.strftime("%Y-%m"),
+        "Week": dates.dt.isocalendar().week,
+    })
+
+
+def timed(function, *args) -> tuple[float, pd.DataFrame]:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--days", type=int, default=4_000)
+    args = parser.parse_args()
+
+    dates = synthetic_dates(args.rows, args.days)
+    print(f"{args.rows:,} linhas, {dates.nunique():,} datas distintas")
+
+    per_row_time, per_row = timed(derive_per_row, dates)
+    dimension_time, dimension = timed(derive_date_parts, dates)
+
+    # Confere se os resultados são equivalentes
+    for column in ["Day", "Month", "Year", "Week"]:
+        assert (per_row[column].to_numpy() == dimension[column].to_numpy()).all()
+    expected_code = per_row["Month_Year"].str.replace("-", "").astype("int32")
+    assert (expected_code.to_numpy() == dimension["Month_Year"].to_numpy()).all()
+
+    print(f"por linha:          {per_row_time:8.3f} s")
+    print(f"dimensão de datas:  {dimension_time:8.3f} s")
+    print(f"aceleração:         {per_row_time / dimension_time:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Redução de séries temporais (LTTB) antes do envio ao navegador.
+
+Sobre um export sintético (ver generate_fleet.SCALES) compara, sem e com a
+redução de utils.downsampling (~1 ponto por pixel de
+ChartSettings.DOWNSAMPLE_WIDTH_PX por linha):
+
+- MonthView: a série de todas as linhas enviada ao st.line_chart (tamanho em
+  Arrow, como o Streamlit envia);
+- LineChart diário: energia diária total da frota (uma linha);
+- LineChart por porta: energia diária de cada porta de microinversor (uma
+  linha por porta).
+
+Para os LineChart mede a montagem (redução incluída) e o envio pelo
+st.plotly_chart (ver bench_figure_serialization.py), pelo menor de `--repeat`
+execuções, e o tamanho do JSON. Os resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_downsampling.py --scale 1m --output downsampling.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bench_figure_serialization import encode
+from generate_fleet import SCALES, generate_fleet, write_fleet
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+from charts.line_chart import LineChart
+from charts.serialization import wire_figure
+from config.constants import ChartSettings
+from utils.downsampling import downsample_frame
+from utils.ingest import load_frame
+
+DATA_DIR = ROOT / ".cache" / "benchmarks"
+
+
+def best_of(function, repeat: int) -> tuple[float, object]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def month_view(df, reduce: bool, repeat: int) -> dict:
+    """Série do MonthView e seu tamanho em Arrow."""
+
+    def series():
+        data = df[["Date", "Energy"]]
+        if reduce:
+            data = downsample_frame(data, "Date", "Energy")
+        return data.set_index("Date")["Energy"]
+
+    prepare_s, values = best_of(series, repeat)
+    payload = convert_pandas_df_to_arrow_bytes(values.reset_index())
+    return {"prepare_s": prepare_s, "points": len(values), "bytes": len(payload)}
+
+
+def line_chart(data, color_col: str, reduce: bool, repeat: int) -> dict:
+    """Montagem e envio de um LineChart diário."""
+
+    def build():
+        return LineChart(
+            data,
+            "Date",
+            "Energy",
+            color_col,
+            theme="dark",
+            width_px=ChartSettings.DOWNSAMPLE_WIDTH_PX if reduce else None,
+        ).fig
+
+    build_s, fig = best_of(build, repeat)
+    encode_s, spec = best_of(lambda: encode(wire_figure(fig)), repeat)
+    return {
+        "build_s": build_s,
+        "encode_s": encode_s,
+        "points": sum(len(trace.x) for trace in fig.data),
+        "bytes": len(spec.encode()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+
+    path = DATA_DIR / f"fleet_{args.scale}.csv"
+    if not path.exists():
+        write_fleet(generate_fleet(**SCALES[args.scale]), path)
+    df = load_frame(path)
+    repeat = max(args.repeat, 1)
+
+    total = df.groupby("Date", as_index=False)["Energy"].sum().assign(Serie="Frota")
+    ports = df.assign(
+        Porta=df["Microinversor"].astype(str) + "/" + df["Port"].astype(str)
+    )
+    ports = ports.groupby(["Porta", "Date"], as_index=False)["Energy"].sum()
+
+    cases = {
+        "MonthView": lambda reduce: month_view(df, reduce, repeat),
+        "LineChart diário": lambda reduce: line_chart(total, "Serie", reduce, repeat),
+        "LineChart por porta": lambda reduce: line_chart(
+            ports, "Porta", reduce, repeat
+        ),
+    }
+
+    results = {}
+    for name, measure in cases.items():
+        full, reduced = measure(False), measure(True)
+        results[name] = {"completo": full, "reduzido": reduced}
+        print(
+            f"{name:20s} pontos {full['points']:9d} -> {reduced['points']:7d}  "
+            f"{full['bytes'] / 1024:9.1f} -> {reduced['bytes'] / 1024:7.1f} KB"
+        )
+        if "build_s" in full:
+            print(
+                f"{'':20s} montagem {full['build_s'] * 1000:8.1f} -> "
+                f"{reduced['build_s'] * 1000:6.1f} ms  envio "
+                f"{full['encode_s'] * 1000:8.1f} -> {reduced['encode_s'] * 1000:6.1f} ms"
+            )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps({"scale": args.scale, "charts": results}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""Tempo de montagem das figuras: Plotly Express versus modo raw (charts.raw).
+
+Mede, pelo menor de `--repeat` execuções, a montagem de cada classe de
+gráfico (BarChart, LineChart, AreaChart, GroupedBarChart e Heatmap) com os
+mesmos passos dos construtores da Home (títulos, estilo, picos e médias) e
+até a go.Figure final (``chart.fig``), nos dois modos:
+
+- px: Plotly Express e update_layout/update_traces validados;
+- raw: dicionários montados dos arrays agregados, com o template do tema
+  compilado uma vez (a primeira montagem fica fora da medição).
+
+Os dados são tabelas agregadas sintéticas do tamanho das da Home
+(`--years` anos x `--microinverters` microinversores). O envio
+(st.plotly_chart) não entra: ver bench_figure_serialization.py. Os
+resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_figure_build.py --years 10 --microinverters 35 --output build.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from charts.bar_chart import BarChart
+from charts.chart_area import AreaChart
+from charts.grouped_bar_chart import GroupedBarChart
+from charts.line_chart import LineChart
+from charts.safe_heatmap_chart import Heatmap
+from config.constants import Colors
+
+MONTHS = {
+    month: name
+    for month, name in enumerate(
+        [
+            "janeiro",
+            "fevereiro",
+            "março",
+            "abril",
+            "maio",
+            "junho",
+            "julho",
+            "agosto",
+            "setembro",
+            "outubro",
+            "novembro",
+            "dezembro",
+        ],
+        start=1,
+    )
+}
+
+
+def best_of(function, repeat: int) -> float:
+    """Menor tempo de `repeat` execuções."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def synthetic_tables(years: int, microinverters: int) -> dict:
+    """Tabelas agregadas como as da Home."""
+    rng = np.random.default_rng(42)
+    year_values = np.arange(2025 - years, 2025)
+    names = [f"MI-{i:04d}" for i in range(microinverters)]
+    return {
+        "yearly": pd.DataFrame(
+            {"Year": year_values, "Energy": rng.uniform(1e3, 5e3, years)}
+        ),
+        "monthly": pd.DataFrame(
+            {
+                "Year": np.repeat(year_values, 12),
+                "Month": np.tile(np.arange(1, 13), years),
+                "Energy": rng.uniform(100, 400, years * 12),
+            }
+        ),
+        "by_microinverter": pd.DataFrame(
+            {
+                "Year": np.repeat(year_values, microinverters),
+                "Microinversor": np.tile(names, years),
+                "Energy": rng.uniform(10, 40, years * microinverters),
+            }
+        ),
+        "matrix": rng.uniform(0, 5e3, (microinverters, years)).astype("float32"),
+        "names": names,
+        "years": year_values.tolist(),
+    }
+
+
+def builders(tables: dict) -> dict:
+    """Montagem de cada gráfico até a go.Figure, com o modo como argumento."""
+    return {
+        "BarChart": lambda raw: (
+            BarChart(
+                tables["yearly"], "Year", "Energy", Colors.GREEN_SEQUENTIAL, raw=raw
+            )
+            .set_titles("Produção", "Anual")
+            .apply_customizations(line_width=2, opacity=0.9)
+            .fig
+        ),
+        "LineChart": lambda raw: (
+            LineChart(
+                tables["monthly"],
+                "Month",
+                "Energy",
+                "Year",
+                colors=Colors.LINE_COLORS,
+                period_mapping=MONTHS,
+                raw=raw,
+            )
+            .set_titles("Produção", "Mensal")
+            .apply_style()
+            .add_peaks_per_group()
+            .fig
+        ),
+        "AreaChart": lambda raw: (
+            AreaChart(
+                tables["monthly"],
+                "Month",
+                "Energy",
+                "Year",
+                Colors.GREEN_DISCRETE,
+                MONTHS,
+                raw=raw,
+            )
+            .set_titles("Produção", "Mensal")
+            .apply_style(opacity=0.8, line_width=3)
+            .add_peak_annotation(y_offset=50)
+            .fig
+        ),
+        "GroupedBarChart": lambda raw: (
+            GroupedBarChart(
+                tables["by_microinverter"].astype({"Year": str}),
+                "Year",
+                "Energy",
+                "Microinversor",
+                Colors.GREEN_DISCRETE,
+                raw=raw,
+            ).fig
+        ),
+        "Heatmap": lambda raw: (
+            Heatmap(
+                tables["matrix"],
+                tables["years"],
+                tables["names"],
+                Colors.GREEN_SEQUENTIAL,
+                theme="dark",
+                raw=raw,
+            )
+            .set_titles("Distribuição", "Anual")
+            .fig
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--microinverters", type=int, default=35)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+
+    results = {}
+    for name, build in builders(
+        synthetic_tables(args.years, args.microinverters)
+    ).items():
+        build(True)  # Compila o template do tema fora da medição
+        px_s = best_of(lambda build=build: build(False), repeat)
+        raw_s = best_of(lambda build=build: build(True), repeat)
+        results[name] = {"px_s": px_s, "raw_s": raw_s, "speedup": px_s / raw_s}
+        print(
+            f"{name:16s} px {px_s * 1000:8.1f} ms  raw {raw_s * 1000:7.1f} ms  "
+            f"{px_s / raw_s:5.1f}x"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "years": args.years,
+                    "microinverters": args.microinverters,
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Serialização das figuras para o st.plotly_chart: bytes enviados e tempo.
+
+Para cada figura mede o caminho que o st.plotly_chart percorre até o
+navegador (revalidação da figura e codificação em JSON) em dois modos:
+
+- padrão: a figura como montada pelas classes de src/charts/;
+- rápido: após charts.serialization.wire_figure (arrays NumPy tipados,
+  enviados como buffers binários, e floats em ChartSettings.WIRE_FLOAT_DTYPE).
+
+As figuras são as da Home (FigureRegistry.BUILDERS) sobre a consulta ao cubo
+de todos os microinversores e duas figuras densas sobre a energia diária por
+microinversor: um LineChart e um Heatmap (microinversor x dia). O tempo é o
+menor de `--repeat` execuções. Os resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_figure_serialization.py --scale 1m --output ser.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import plotly.io as pio
+import plotly.tools
+from generate_fleet import SCALES, generate_fleet, write_fleet
+
+from charts.line_chart import LineChart
+from charts.safe_heatmap_chart import Heatmap
+from charts.serialization import wire_figure
+from config.constants import Colors
+from modules.home.charts import FigureRegistry
+from utils.aggregates import ROLLUP_KEYS, get_cube
+from utils.ingest import load_frame
+
+DATA_DIR = ROOT / ".cache" / "benchmarks"
+
+
+def encode(fig) -> str:
+    """O que o st.plotly_chart faz com a figura antes de enviá-la."""
+    figure = plotly.tools.return_figure_from_figure_or_data(fig, validate_figure=True)
+    return pio.to_json(figure, validate=False)
+
+
+def figure_builders(df) -> dict:
+    """Construtores das figuras medidas, sobre o export carregado."""
+    cube = get_cube(df)
+    microinverters = cube.cuboid(ROLLUP_KEYS)["Microinversor"].unique()
+    query = cube.query(ROLLUP_KEYS, microinverters=microinverters, show_zeros=True)
+    builders = {
+        name: (lambda b=builder: b(query))
+        for name, builder in FigureRegistry.BUILDERS.items()
+    }
+
+    daily = df.groupby(["Microinversor", "Date"], observed=True, as_index=False)[
+        "Energy"
+    ].sum()
+    grid = daily.pivot(index="Microinversor", columns="Date", values="Energy")
+    builders["linha diária"] = lambda: LineChart(
+        daily, "Date", "Energy", "Microinversor", theme="dark"
+    ).fig
+    builders["heatmap diário"] = lambda: Heatmap(
+        grid.fillna(0).to_numpy(dtype="float32"),
+        x_labels=[str(day.date()) for day in grid.columns],
+        y_labels=grid.index.astype(str).tolist(),
+        color_scale=Colors.GREEN_SEQUENTIAL,
+        theme="dark",
+    ).fig
+    return builders
+
+
+def measure(build, fast: bool, repeat: int) -> dict:
+    """Menor tempo (preparo + codificação) e tamanho do JSON de uma figura."""
+    best = None
+    for _ in range(repeat):
+        fig = build()
+        start = time.perf_counter()
+        if fast:
+            wire_figure(fig)
+        spec = encode(fig)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {"encode_s": best, "bytes": len(spec.encode())}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1m")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+
+    path = DATA_DIR / f"fleet_{args.scale}.csv"
+    if not path.exists():
+        write_fleet(generate_fleet(**SCALES[args.scale]), path)
+    builders = figure_builders(load_frame(path))
+
+    results = {}
+    for name, build in builders.items():
+        default = measure(build, fast=False, repeat=max(args.repeat, 1))
+        fast = measure(build, fast=True, repeat=max(args.repeat, 1))
+        results[name] = {"padrão": default, "rápido": fast}
+        print(
+            f"{name:16s} "
+            f"{default['encode_s'] * 1000:8.1f} -> {fast['encode_s'] * 1000:8.1f} ms  "
+            f"{default['bytes'] / 1024:9.1f} -> {fast['bytes'] / 1024:9.1f} KB"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps({"scale": args.scale, "figures": results}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
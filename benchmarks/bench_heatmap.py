@@ -0,0 +1,119 @@
+"""Heatmap denso: montagem e envio de uma matriz microinversor x dia.
+
+Monta o Heatmap de src/charts/safe_heatmap_chart.py sobre uma matriz
+aleatória de `--rows` x `--cols` células (padrão 500 x 3650: 500
+microinversores em 10 anos de dias) e mede, pelo menor de `--repeat`
+execuções:
+
+- montagem: Heatmap(...) a partir de um array NumPy float32 e a partir de uma
+  lista de listas (como o código chamava antes);
+- envio: o que o st.plotly_chart faz com a figura (ver
+  bench_figure_serialization.py), com o tamanho do JSON resultante.
+
+Também registra o pico de memória (tracemalloc) de cada montagem. Os
+resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_heatmap.py --rows 500 --cols 3650 --output heatmap.json
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from bench_figure_serialization import encode
+
+from charts.safe_heatmap_chart import Heatmap
+from charts.serialization import wire_figure
+from config.constants import Colors
+
+
+def build(values, rows: int, cols: int) -> Heatmap:
+    """Heatmap com os mesmos parâmetros da Home."""
+    return Heatmap(
+        data_values=values,
+        x_labels=[f"d{day}" for day in range(cols)],
+        y_labels=[f"MI-{row:04d}" for row in range(rows)],
+        color_scale=Colors.GREEN_SEQUENTIAL,
+        theme="dark",
+    )
+
+
+def best_of(function, repeat: int) -> tuple[float, object]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def peak_bytes(function) -> int:
+    """Pico de memória alocada por `function` (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--cols", type=int, default=3650)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    array = rng.uniform(0, 5_000, size=(args.rows, args.cols)).astype(np.float32)
+    inputs = {"numpy": lambda: array, "listas": array.tolist}
+
+    results = {}
+    for name, values in inputs.items():
+        data = values()
+
+        def make(data=data):
+            return build(data, args.rows, args.cols)
+
+        build_s, heatmap = best_of(make, args.repeat)
+        encode_s, spec = best_of(
+            lambda fig=heatmap.fig: encode(wire_figure(fig)), args.repeat
+        )
+        results[name] = {
+            "build_s": build_s,
+            "build_peak_bytes": peak_bytes(make),
+            "encode_s": encode_s,
+            "bytes": len(spec.encode()),
+            "z_dtype": str(np.asarray(heatmap.fig.data[0].z).dtype),
+        }
+        print(
+            f"{name:8s} montagem {build_s * 1000:8.1f} ms  "
+            f"pico {results[name]['build_peak_bytes'] / 1024**2:8.1f} MB  "
+            f"envio {encode_s * 1000:8.1f} ms  "
+            f"{results[name]['bytes'] / 1024**2:6.1f} MB"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {"rows": args.rows, "cols": args.cols, "results": results}, indent=2
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""Latência da Home por tipo de interação do usuário.
+
+Executa src/app.py com o AppTest do Streamlit sobre um export sintético (ver
+generate_fleet.SCALES) já carregado na sessão e mede o tempo do rerun
+disparado por cada interação:
+
+- anos, microinversores, zeros: filtros da barra lateral (rerun do app);
+- aba: troca entre a Visão Anual e a Análise Detalhada;
+- detalhes: "Mostrar detalhes técnicos" da aba de análise detalhada;
+- amostra: "Mostrar amostra" da visualização rápida, que não afeta a Home.
+
+Se o widget pertence a um fragmento (st.fragment), o rerun é restrito a ele,
+como faz o navegador; caso contrário o script inteiro é reexecutado. Abas sem
+estado no servidor são trocadas só no navegador (tempo zero no servidor). Cada
+interação alterna entre dois valores, e o resultado é o menor e a mediana de
+`--repeat` reruns. Os resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_home_interactions.py --scale 1m --output home.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+sys.path.insert(0, str(SRC))
+
+import streamlit.testing.v1.local_script_runner as local_script_runner
+from generate_fleet import SCALES, generate_fleet, write_fleet
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+from streamlit.testing.v1 import AppTest
+
+import utils.dataset_store as dataset_store_module
+from utils.dataset_store import DatasetStore
+from utils.ingest import load_frame
+
+DATA_DIR = ROOT / ".cache" / "benchmarks"
+
+# Fragmento de cada widget, segundo o último delta enviado (id -> fragment_id)
+_widget_fragments: dict[str, str] = {}
+# Fragmento do próximo rerun; None reexecuta o script inteiro
+_rerun_fragment: str | None = None
+
+_enqueue = ForwardMsgQueue.enqueue
+_RerunData = local_script_runner.RerunData
+
+
+def _recording_enqueue(self, msg):
+    if msg.WhichOneof("type") == "delta":
+        widget_id = None
+        if msg.delta.HasField("new_element"):
+            element = msg.delta.new_element
+            widget = getattr(element, element.WhichOneof("type") or "", None)
+            widget_id = getattr(widget, "id", None)
+        elif msg.delta.HasField("add_block"):
+            widget_id = msg.delta.add_block.id  # Abas com estado (st.tabs)
+        if widget_id:
+            _widget_fragments[widget_id] = msg.delta.fragment_id
+    return _enqueue(self, msg)
+
+
+def _rerun_data(**kwargs):
+    # O navegador envia o fragment_id quando o widget está em um fragmento
+    return _RerunData(**kwargs, fragment_id=_rerun_fragment)
+
+
+ForwardMsgQueue.enqueue = _recording_enqueue
+local_script_runner.RerunData = _rerun_data
+
+
+# Abas da Home e chave do widget de abas (ver HomeView)
+TABS = ("📅 Visão Anual", "🔍 Análise Detalhada")
+TABS_KEY = "home_tabs"
+
+
+def _by_label(widgets, label: str):
+    return next(widget for widget in widgets if widget.label == label)
+
+
+def _toggle(label: str, tab: str = TABS[0]):
+    def interact(app: AppTest, step: int) -> str:
+        _open_tab(app, tab)
+        checkbox = _by_label(app.checkbox, label)
+        checkbox.set_value(step % 2 == 0)
+        return checkbox.id
+
+    return interact
+
+
+def _tabs_id() -> str | None:
+    """Id do widget de abas da Home, se as abas tiverem estado no servidor."""
+    return next((id for id in _widget_fragments if id.endswith(f"-{TABS_KEY}")), None)
+
+
+def _open_tab(app: AppTest, tab: str) -> None:
+    """Abre a aba `tab` da Home (fora da medição), se ainda não estiver aberta."""
+    if _tabs_id() is None:
+        return  # Sem estado de abas: todas as abas são executadas
+    if TABS_KEY in app.session_state and app.session_state[TABS_KEY] == tab:
+        return
+    app.session_state[TABS_KEY] = tab
+    app.run()
+
+
+def _tabs(app: AppTest, step: int) -> str | None:
+    if _tabs_id() is None:
+        return None  # A troca de abas acontece só no navegador
+    _open_tab(app, TABS[0])
+    app.session_state[TABS_KEY] = TABS[(step + 1) % 2]
+    return _tabs_id()
+
+
+def _years(app: AppTest, step: int) -> str:
+    _open_tab(app, TABS[0])
+    slider = _by_label(app.slider, "Selecione o intervalo de anos:")
+    low, high = slider.min, slider.max
+    slider.set_range(low, high if step % 2 else max(low, high - 1))
+    return slider.id
+
+
+def _microinverters(app: AppTest, step: int) -> str:
+    _open_tab(app, TABS[0])
+    multiselect = _by_label(app.multiselect, "Selecione os microinversores:")
+    first = multiselect.options[0]
+    if step % 2:
+        multiselect.select(first)
+    else:
+        multiselect.unselect(first)
+    return multiselect.id
+
+
+INTERACTIONS = {
+    "anos": _years,
+    "microinversores": _microinverters,
+    "zeros": _toggle("Mostrar valores zero"),
+    "aba": _tabs,
+    "detalhes": _toggle("Mostrar detalhes técnicos", TABS[1]),
+    "amostra": _toggle("Mostrar amostra"),
+}
+
+
+def load_session_dataset(scale: str):
+    """Carrega o export da escala em um DatasetStore temporário."""
+    path = DATA_DIR / f"fleet_{scale}.csv"
+    if not path.exists():
+        write_fleet(generate_fleet(**SCALES[scale]), path)
+    store = DatasetStore(Path(tempfile.mkdtemp()))
+    dataset_store_module.dataset_store = store  # O app importa o store sob demanda
+    return store.acquire(load_frame(path))
+
+
+def measure_interactions(scale: str, repeat: int) -> dict:
+    """Mede o rerun de cada interação e devolve tempos e escopo."""
+    global _rerun_fragment
+
+    app = AppTest.from_file(str(SRC / "app.py"), default_timeout=600)
+    app.session_state["dataset"] = load_session_dataset(scale)
+    app.run()
+
+    results = {}
+    for name, interact in INTERACTIONS.items():
+        times = []
+        scope = "app"
+        for step in range(repeat + 1):
+            widget_id = interact(app, step)
+            if widget_id is None:
+                scope = "navegador"
+                times.append(0.0)
+                continue
+            _rerun_fragment = _widget_fragments.get(widget_id) or None
+            scope = "fragmento" if _rerun_fragment else "app"
+            start = time.perf_counter()
+            app.run()
+            elapsed = time.perf_counter() - start
+            if app.exception:
+                raise RuntimeError(app.exception[0].value)
+            if _rerun_fragment:
+                # O AppTest só guarda os elementos do último rerun: refaz a
+                # árvore completa (fora da medição) para a próxima interação
+                _rerun_fragment = None
+                app.run()
+            if step:  # O primeiro rerun aquece caches e é descartado
+                times.append(elapsed)
+        results[name] = {
+            "scope": scope,
+            "min_s": min(times),
+            "median_s": statistics.median(times),
+            "times_s": times,
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, default="1m")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+
+    results = measure_interactions(args.scale, max(args.repeat, 1))
+    for name, result in results.items():
+        print(
+            f"{name:16s} {result['scope']:10s} "
+            f"mín {result['min_s'] * 1000:8.1f} ms  "
+            f"mediana {result['median_s'] * 1000:8.1f} ms"
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps({"scale": args.scale, "interactions": results}, indent=2),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Benchmark das métricas dos cards da Home: um cálculo por card x compute_home_metrics.
+
+Uso:
+    python benchmarks/bench_home_metrics.py --microinverters 100 --days 3650
+"""
+
+import argparse
+import logging
+import math
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bench_home_render import synthetic_fleet
+
+from modules.home.components import calculate_energy_efficiency
+from modules.home.metrics import (
+    alculate_current_year_energy,
+    calculate_coefficient_of_variation,
+    calculate_current_month_energy,
+    calculate_energy_std_dev,
+    calculate_total_energy,
+    compute_home_metrics,
+    count_records,
+    date_bounds,
+)
+from utils.aggregates import ROLLUP_KEYS, get_cube
+
+
+def per_card_metrics(data: pd.DataFrame) -> dict:
+    """Caminho anterior: cada card calcula a sua própria métrica."""
+    start_date, end_date = date_bounds(data)
+    return {
+        "start_date": start_date,
+        "end_date": end_date,
+        "records": count_records(data),
+        "microinverters": data["Microinversor"].nunique(),
+        "current_month_energy": calculate_current_month_energy(data),
+        "current_year_energy": alculate_current_year_energy(data),
+        "total_energy": calculate_total_energy(data),
+        "std_dev": calculate_energy_std_dev(data),
+        "efficiency": calculate_energy_efficiency(data),
+        "coefficient_of_variation": calculate_coefficient_of_variation(data),
+        # Carvão, CO2 e árvores somavam a energia novamente
+        "coal": data["Energy"].sum(),
+        "co2": data["Energy"].sum(),
+        "trees": data["Energy"].sum(),
+    }
+
+
+def timed(function, data: pd.DataFrame, repeat: int) -> tuple[float, object]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(data)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--microinverters", type=int, default=100)
+    parser.add_argument("--days", type=int, default=3_650)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Silencia o log de calculate_total_energy
+    data = synthetic_fleet(args.microinverters, args.days)
+    data = data[data["Energy"] > 0]  # Filtro "Mostrar valores zero" desligado
+    cube_slice = get_cube(data).query(ROLLUP_KEYS)
+    print(f"{len(data):,} linhas, {len(cube_slice):,} linhas no cubo")
+
+    for label, frame in [("linhas brutas", data), ("consulta ao cubo", cube_slice)]:
+        per_card_time, expected = timed(per_card_metrics, frame, args.repeat)
+        engine_time, metrics = timed(compute_home_metrics, frame, args.repeat)
+
+        for field in ("records", "microinverters", "start_date", "end_date"):
+            assert getattr(metrics, field) == expected[field], field
+        for field in ("total_energy", "std_dev", "efficiency", "coefficient_of_variation"):
+            # O caminho anterior soma em float32; o motor acumula em float64
+            assert math.isclose(getattr(metrics, field), expected[field], rel_tol=1e-6)
+
+        print(
+            f"{label:16s} por card {per_card_time * 1000:8.2f} ms"
+            f" | passada única {engine_time * 1000:8.2f} ms"
+            f" | redução {per_card_time / engine_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Benchmark da renderização da Home: linhas brutas filtradas x consulta ao cubo.
+
+Executa o corpo do dashboard (cards e gráficos) fora do servidor do Streamlit,
+onde as chamadas st.* não desenham nada, medindo apenas o custo de cálculo. A
+etapa de dados (filtros, métricas dos cards e agregações dos gráficos) é medida
+também separadamente da construção das figuras Plotly.
+
+Uso:
+    python benchmarks/bench_home_render.py --microinverters 40 --days 1500
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generate_fleet import generate_fleet
+
+from modules.home.components import calculate_energy_efficiency
+from modules.home.home_view import HomeView
+from modules.home.metrics import (
+    aggregate_energy_by_year,
+    aggregate_energy_by_year_microinverter,
+    calculate_coefficient_of_variation,
+    calculate_current_month_energy,
+    calculate_energy_std_dev,
+    calculate_total_energy,
+    count_records,
+    date_bounds,
+    prepare_data_for_heatmap,
+    prepare_monthly_comparison_data,
+)
+from utils.aggregates import ROLLUP_KEYS, get_cube
+from utils.ingest import normalize_data
+
+PORTS = 4
+
+
+def synthetic_fleet(microinverters: int, days: int, seed: int = 42) -> pd.DataFrame:
+    """Gera um export com uma leitura diária por porta de cada microinversor."""
+    raw = generate_fleet(
+        microinverters=microinverters,
+        ports=PORTS,
+        start_year=2021,
+        days=days,
+        zero_rate=0.1,  # Dias sem geração
+        seed=seed,
+    )
+    df = normalize_data(raw)
+    df.attrs["fingerprint"] = f"bench-{microinverters}-{days}-{seed}"
+    return df
+
+
+def filter_raw(view: HomeView, data: pd.DataFrame) -> pd.DataFrame:
+    """Filtro anterior ao cubo, aplicado às linhas brutas a cada renderização."""
+    return data[
+        (data["Year"].between(*view.year_range))
+        & (data["Microinversor"].isin(view.microinverters))
+        & ((data["Energy"] > 0) if not view.show_zeros else True)
+    ]
+
+
+def compute_page_data(data: pd.DataFrame) -> None:
+    """Cálculos de dados feitos pelos cards e gráficos da Home."""
+    calculate_total_energy(data)
+    calculate_current_month_energy(data)
+    calculate_energy_std_dev(data)
+    calculate_coefficient_of_variation(data)
+    calculate_energy_efficiency(data)
+    count_records(data)
+    date_bounds(data)
+    data["Microinversor"].nunique()
+    aggregate_energy_by_year(data)
+    aggregate_energy_by_year_microinverter(data)
+    prepare_data_for_heatmap(data)
+    prepare_monthly_comparison_data(data)
+
+
+def timed(function, repeat: int) -> float:
+    """Menor tempo de `repeat` execuções."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--microinverters", type=int, default=40)
+    parser.add_argument("--days", type=int, default=1_500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Avisos do Streamlit fora do servidor
+    data = synthetic_fleet(args.microinverters, args.days)
+    print(f"{len(data):,} linhas, {args.microinverters} microinversores")
+
+    view = HomeView()
+    view.year_range = (int(data["Year"].min()), int(data["Year"].max()))
+    view.microinverters = list(data["Microinversor"].cat.categories)
+    view.show_zeros = False
+
+    def render_raw():
+        view._render_dashboard(filter_raw(view, data))
+
+    def render_cube():
+        view._render_dashboard(view._apply_filters(get_cube(data)))
+
+    def data_raw():
+        compute_page_data(filter_raw(view, data))
+
+    def data_cube():
+        compute_page_data(view._apply_filters(get_cube(data)))
+
+    build_time = timed(lambda: get_cube(data).cuboid(ROLLUP_KEYS), 1)
+    print(f"construção do cubo (uma vez): {build_time:8.3f} s")
+
+    for label, raw, cube in [
+        ("etapa de dados", data_raw, data_cube),
+        ("render completo", render_raw, render_cube),
+    ]:
+        raw_time = timed(raw, args.repeat)
+        cube_time = timed(cube, args.repeat)
+        print(
+            f"{label:16s} linhas brutas {raw_time:7.3f} s | cubo {cube_time:7.3f} s"
+            f" | redução {raw_time / cube_time:5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Tempo de importação do núcleo sem interface (core) x adaptador do Streamlit.
+
+Cada medição roda em um interpretador novo com `python -X importtime`, e o
+resultado é o menor de `--repeat` execuções. Também lista os pacotes de
+terceiros que mais pesam e falha se o núcleo importar Streamlit ou Plotly, ou
+se passar de `--max-ms`.
+
+Uso:
+    python benchmarks/bench_import_time.py --repeat 5 --max-ms 1500
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+TARGETS = {
+    "core": "import core",
+    "utils.load_data": "import utils.load_data",
+    "modules.home.home_view": "import modules.home.home_view",
+}
+
+# Pacotes que o núcleo nunca deve importar
+UI_PACKAGES = ("streamlit", "plotly")
+
+# Pacotes e módulos do próprio projeto (fora do ranking de terceiros)
+LOCAL_PACKAGES = {
+    path.stem for path in SRC.iterdir() if path.is_dir() or path.suffix == ".py"
+}
+
+
+def import_times(statement: str) -> dict[str, tuple[int, int]]:
+    """Nível de aninhamento e tempo cumulativo (µs) de cada módulo importado."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[12:].split("|")
+        level = (len(name) - len(name.lstrip()) - 1) // 2
+        times[name.strip()] = (level, int(cumulative))
+    return times
+
+
+def summarize(times: dict, startup: dict) -> tuple[float, list[tuple[str, int]]]:
+    """
+    Tempo total da importação (ms), sem a inicialização do interpretador, e os
+    pacotes de terceiros importados, do mais ao menos pesado.
+    """
+    imported = {name: value for name, value in times.items() if name not in startup}
+    total_ms = sum(
+        cumulative for level, cumulative in imported.values() if level == 0
+    ) / 1000
+    packages = defaultdict(int)
+    for name, (_, cumulative) in imported.items():
+        package = name.split(".")[0]
+        if package not in LOCAL_PACKAGES:
+            packages[package] = max(packages[package], cumulative)
+    return total_ms, sorted(packages.items(), key=lambda item: -item[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--max-ms", type=float, help="Falha se `import core` passar deste tempo"
+    )
+    args = parser.parse_args()
+
+    startup = import_times("pass")  # Módulos já carregados antes do -c
+    failed = False
+    for target, statement in TARGETS.items():
+        total_ms, packages = min(
+            (
+                summarize(import_times(statement), startup)
+                for _ in range(max(args.repeat, 1))
+            ),
+            key=lambda summary: summary[0],
+        )
+        heavy = ", ".join(f"{name} {time / 1000:.0f} ms" for name, time in packages[:5])
+        print(f"{target:24s} {total_ms:8.1f} ms  ({heavy})")
+
+        if target == "core":
+            leaked = [name for name, _ in packages if name in UI_PACKAGES]
+            if leaked:
+                print(f"  core importou {', '.join(leaked)}", file=sys.stderr)
+                failed = True
+            if args.max_ms is not None and total_ms > args.max_ms:
+                print(f"  core passou de {args.max_ms:.0f} ms", file=sys.stderr)
+                failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Custo das sobreposições (médias, picos e rótulos de tendência) dos gráficos.
+
+Monta tabelas agregadas sintéticas de `--years` anos x `--microinverters`
+microinversores (padrão 50 x 200) e mede, pelo menor de `--repeat` execuções:
+
+- GroupedBarChart por ano e por microinversor (barras agrupadas com a linha e
+  o rótulo da média de cada categoria do eixo X), inteiro e sem
+  add_styles_and_averages (estilo das barras e médias), para isolar o custo;
+- LineChart mensal (uma linha por ano) com os rótulos no fim de cada linha e
+  add_peaks_per_group;
+- add_average_lines e add_trend_annotations (modules/home/visualization.py),
+  uma linha e um rótulo por ano.
+
+Os resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_overlays.py --years 50 --microinverters 200 --output overlays.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+import plotly.graph_objects as go
+
+from charts.grouped_bar_chart import GroupedBarChart
+from charts.line_chart import LineChart
+from config.constants import Colors
+from modules.home.visualization import (
+    add_average_lines,
+    add_trend_annotations,
+)
+
+
+class BareGroupedBarChart(GroupedBarChart):
+    """GroupedBarChart sem estilo e médias, para isolar o custo deles."""
+
+    def add_styles_and_averages(self):
+        pass
+
+
+def best_of(function, repeat: int) -> float:
+    """Menor tempo de `repeat` execuções."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def synthetic_tables(years: int, microinverters: int) -> tuple:
+    """Energia anual por microinversor e mensal por ano."""
+    rng = np.random.default_rng(42)
+    year_values = np.arange(2025 - years, 2025)
+    yearly = pd.DataFrame({
+        "Year": np.repeat(year_values, microinverters),
+        "Microinversor": np.tile(
+            [f"MI-{i:04d}" for i in range(microinverters)], years
+        ),
+        "Energy": rng.uniform(10, 40, years * microinverters),
+    })
+    monthly = pd.DataFrame({
+        "Year": np.repeat(year_values, 12),
+        "Month": np.tile(np.arange(1, 13), years),
+        "Energy": rng.uniform(100, 400, years * 12),
+    })
+    return yearly, monthly
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=50)
+    parser.add_argument("--microinverters", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+    repeat = max(args.repeat, 1)
+
+    yearly, monthly = synthetic_tables(args.years, args.microinverters)
+
+    def grouped(chart_class, x_col, color_col):
+        return lambda: chart_class(
+            data=yearly,
+            x_col=x_col,
+            y_col="Energy",
+            color_col=color_col,
+            colors=Colors.GREEN_DISCRETE,
+        )
+
+    def line_chart():
+        LineChart(
+            monthly, "Month", "Energy", "Year", colors=Colors.LINE_COLORS
+        ).add_peaks_per_group()
+
+    averages = monthly.groupby("Year")["Energy"].mean().to_dict()
+    trends = {
+        year: (value - 250, color)
+        for (year, value), color in zip(
+            averages.items(), np.resize(Colors.LINE_COLORS, len(averages))
+        )
+    }
+
+    def home_overlays():
+        fig = go.Figure(go.Scatter(x=monthly["Month"], y=monthly["Energy"]))
+        add_average_lines(fig, averages, Colors.LINE_COLORS)
+        add_trend_annotations(fig, trends, monthly)
+
+    cases = {
+        "barras por ano": (
+            grouped(GroupedBarChart, "Year", "Microinversor"),
+            grouped(BareGroupedBarChart, "Year", "Microinversor"),
+        ),
+        "barras por microinversor": (
+            grouped(GroupedBarChart, "Microinversor", "Year"),
+            grouped(BareGroupedBarChart, "Microinversor", "Year"),
+        ),
+        "LineChart mensal": (line_chart, None),
+        "médias e tendências": (home_overlays, None),
+    }
+
+    results = {}
+    for name, (build, bare) in cases.items():
+        total = best_of(build, repeat)
+        overlays = total - best_of(bare, repeat) if bare else None
+        results[name] = {"total_s": total, "styles_and_averages_s": overlays}
+        print(
+            f"{name:26s} total {total * 1000:9.1f} ms"
+            + (f"  estilo e médias {overlays * 1000:9.1f} ms" if bare else "")
+        )
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "years": args.years,
+                    "microinverters": args.microinverters,
+                    "results": results,
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark dos filtros da Home: varredura com isin/between x RowIndex.
+
+Uso:
+    python benchmarks/bench_row_index.py --microinverters 500 --days 1500
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from bench_home_render import synthetic_fleet
+
+from utils.aggregates import ROLLUP_KEYS, get_cube
+from utils.row_index import RowIndex
+
+
+def timed(function, repeat: int) -> tuple[float, np.ndarray]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--microinverters", type=int, default=500)
+    parser.add_argument("--days", type=int, default=1_500)
+    parser.add_argument("--selected", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = synthetic_fleet(args.microinverters, args.days)
+    micros = list(data["Microinversor"].cat.categories[: args.selected])
+    years = (int(data["Year"].min()) + 1, int(data["Year"].max()))
+    dates = (np.datetime64(f"{years[0]}-01-01"), np.datetime64(f"{years[1]}-12-31"))
+    raw_strings = data.assign(Microinversor=data["Microinversor"].astype(object))
+    cuboid = get_cube(data).cuboid(ROLLUP_KEYS)
+    print(f"{len(data):,} linhas brutas, {len(cuboid):,} linhas no cuboide")
+
+    start = time.perf_counter()
+    raw_index = RowIndex(data)
+    print(f"construção do índice (linhas brutas): {time.perf_counter() - start:.3f} s")
+    cube_index = get_cube(data).index(ROLLUP_KEYS)
+
+    cases = [
+        ("brutas, strings", lambda: (
+            raw_strings["Date"].between(*dates)
+            & raw_strings["Microinversor"].isin(micros)
+        ).to_numpy()),
+        ("brutas, categórica", lambda: (
+            data["Date"].between(*dates) & data["Microinversor"].isin(micros)
+        ).to_numpy()),
+        ("brutas, RowIndex", lambda: raw_index.select(
+            {"Microinversor": micros}, between=dates
+        )),
+        ("cuboide, isin", lambda: (
+            cuboid["Year"].between(*years) & cuboid["Microinversor"].isin(micros)
+        ).to_numpy()),
+        ("cuboide, RowIndex", lambda: cube_index.select(
+            {"Microinversor": micros}, between=years
+        )),
+    ]
+    reference = {}
+    for label, function in cases:
+        elapsed, mask = timed(function, args.repeat)
+        source = label.split(",")[0]
+        assert (reference.setdefault(source, mask) == mask).all()
+        print(f"{label:20s} {elapsed * 1000:9.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
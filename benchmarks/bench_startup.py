@@ -0,0 +1,116 @@
+"""Cold start do app: tempo até a primeira pintura e importações da página vazia.
+
+Cada medição roda em um interpretador novo e executa src/app.py com o AppTest
+do Streamlit, sem CSV carregado (a página vazia que o usuário vê ao abrir o
+app). São registrados:
+
+- first_paint_s: do início do processo ao primeiro elemento enviado ao
+  navegador;
+- script_s: do início do processo ao fim do primeiro rerun;
+- pacotes pesados (pandas, plotly, gráficos) já importados na primeira pintura.
+
+Também mostra o detalhamento de `import app` por pacote (ver
+bench_import_time.py). Os resultados são gravados em JSON.
+
+Uso:
+    python benchmarks/bench_startup.py --repeat 5 --output startup.json
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+from bench_import_time import SRC, import_times, summarize
+
+# Módulos que não deveriam ser necessários para desenhar a página vazia
+DEFERRED_MODULES = ("pandas", "plotly.express", "charts.bar_chart", "modules.home")
+
+# Executado no processo filho: mede o primeiro delta enviado pelo script
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+
+from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
+
+first_paint = {}
+enqueue = ForwardMsgQueue.enqueue
+
+def timed_enqueue(self, msg):
+    if not first_paint and msg.WhichOneof("type") == "delta":
+        first_paint["s"] = time.perf_counter() - start
+        first_paint["loaded"] = [m for m in DEFERRED if m in sys.modules]
+    return enqueue(self, msg)
+
+ForwardMsgQueue.enqueue = timed_enqueue
+
+from streamlit.testing.v1 import AppTest
+
+app = AppTest.from_file(APP, default_timeout=120)
+app.run()
+print(json.dumps({
+    "first_paint_s": first_paint.get("s"),
+    "script_s": time.perf_counter() - start,
+    "loaded_at_first_paint": first_paint.get("loaded", []),
+    "exception": [str(error.value) for error in app.exception],
+}))
+"""
+
+
+def measure_startup() -> dict:
+    """Executa o app uma vez em um processo novo e devolve os tempos."""
+    code = (
+        f"DEFERRED = {DEFERRED_MODULES!r}\n"
+        f"APP = {str(SRC / 'app.py')!r}\n" + CHILD
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=SRC,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="Arquivo JSON")
+    args = parser.parse_args()
+
+    runs = [measure_startup() for _ in range(max(args.repeat, 1))]
+    best = min(runs, key=lambda run: run["first_paint_s"] or float("inf"))
+    total_ms, packages = summarize(import_times("import app"), import_times("pass"))
+
+    print(f"primeira pintura  {best['first_paint_s'] * 1000:8.1f} ms")
+    print(f"primeiro rerun    {best['script_s'] * 1000:8.1f} ms")
+    print(f"import app        {total_ms:8.1f} ms")
+    for name, cumulative in packages[:8]:
+        print(f"  {name:22s} {cumulative / 1000:8.1f} ms")
+    loaded = ", ".join(best["loaded_at_first_paint"]) or "nenhum"
+    print(f"adiados já carregados na primeira pintura: {loaded}")
+    if best["exception"]:
+        print(f"exceções no app: {best['exception']}", file=sys.stderr)
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(
+                {
+                    "runs": runs,
+                    "best": best,
+                    "import_app_ms": total_ms,
+                    "import_breakdown_ms": {
+                        name: cumulative / 1000 for name, cumulative in packages
+                    },
+                },
+                indent=2,
+            ),
+            encoding="utf-8",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+"""Compara uma execução da suíte de benchmarks com uma linha de base gravada.
+
+Cada medição (escala, grupo, nome, entrada) é comparada à da linha de base pelo
+tempo mínimo e pelo pico de memória. O limite de tempo de cada caso é a
+tolerância configurada somada ao ruído observado (a distância relativa entre o
+tempo médio e o mínimo, na pior das duas execuções), e diferenças absolutas
+abaixo de MIN_DELTA_S ou MIN_DELTA_BYTES nunca contam como regressão.
+
+Sai com código 1 se algum caso dos grupos verificados regredir além do limite
+ou passar a falhar. As linhas de base em benchmarks/baselines/ dependem da
+máquina: regrave-as (run_benchmarks.py --output) ao trocar o ambiente de medição.
+
+Uso:
+    python benchmarks/compare_benchmarks.py benchmarks/baselines/10k.json \\
+        .cache/benchmarks/results.json --tolerance 0.25
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Caminhos quentes verificados por padrão (grupos de run_benchmarks.Case)
+HOT_GROUPS = ("load", "cube", "filters", "metrics", "charts")
+
+TIME_TOLERANCE = 0.25  # +25% sobre o tempo mínimo da linha de base
+MEMORY_TOLERANCE = 0.20  # +20% sobre o pico de memória da linha de base
+MIN_DELTA_S = 0.001  # Diferenças abaixo de 1 ms são ruído do relógio
+MIN_DELTA_BYTES = 256 * 1024  # Diferenças abaixo de 256 KB são ruído do alocador
+
+
+def load_results(path: Path) -> dict[tuple, dict]:
+    """Lê um JSON de run_benchmarks e indexa as medições por caso."""
+    payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    return {
+        (item["scale"], item["group"], item["name"], item["input"]): item
+        for item in payload["results"]
+    }
+
+
+def _noise(result: dict) -> float:
+    """Dispersão relativa das repetições de um caso (0 com uma só repetição)."""
+    if result.get("repeats", 1) < 2 or not result["min_s"]:
+        return 0.0
+    return (result["mean_s"] - result["min_s"]) / result["min_s"]
+
+
+def _relative(current: float, baseline: float) -> float:
+    return (current - baseline) / baseline if baseline else 0.0
+
+
+def compare_case(
+    baseline: dict,
+    current: dict,
+    tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+) -> dict:
+    """
+    Compara um caso medido nas duas execuções.
+
+    Returns:
+        dict: Variação relativa de tempo e memória, limite de tempo aplicado e
+        status ("regressão", "melhora", "estável" ou "erro").
+    """
+    if "error" in current:
+        status = "estável" if "error" in baseline else "erro"
+        return {"status": status, "detail": current["error"]}
+    if "error" in baseline:
+        return {"status": "melhora", "detail": "falhava na linha de base"}
+
+    time_change = _relative(current["min_s"], baseline["min_s"])
+    time_limit = tolerance + max(_noise(baseline), _noise(current))
+    time_delta = current["min_s"] - baseline["min_s"]
+    slower = time_change > time_limit and time_delta > MIN_DELTA_S
+    faster = time_change < -time_limit and -time_delta > MIN_DELTA_S
+
+    memory_change = None
+    heavier = False
+    if current.get("peak_bytes") is not None and baseline.get("peak_bytes"):
+        memory_change = _relative(current["peak_bytes"], baseline["peak_bytes"])
+        memory_delta = current["peak_bytes"] - baseline["peak_bytes"]
+        heavier = memory_change > memory_tolerance and memory_delta > MIN_DELTA_BYTES
+
+    if slower or heavier:
+        status = "regressão"
+    elif faster:
+        status = "melhora"
+    else:
+        status = "estável"
+    return {
+        "status": status,
+        "time_change": time_change,
+        "time_limit": time_limit,
+        "memory_change": memory_change,
+    }
+
+
+def compare_results(
+    baseline: dict[tuple, dict],
+    current: dict[tuple, dict],
+    tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+    groups: tuple[str, ...] = HOT_GROUPS,
+) -> list[dict]:
+    """
+    Compara todos os casos presentes nas duas execuções.
+
+    Casos só da linha de base ou só da execução atual são listados como
+    "removido" e "novo" e não contam como regressão. Escalas que não foram
+    medidas na execução atual são ignoradas.
+
+    Returns:
+        list[dict]: Um item por caso, com a chave, o status e as variações.
+    """
+    scales = {key[0] for key in current}
+    comparison = []
+    for key in sorted(set(baseline) | set(current)):
+        if key[0] not in scales:
+            continue
+        if key not in current:
+            result = {"status": "removido"}
+        elif key not in baseline:
+            result = {"status": "novo"}
+        else:
+            result = compare_case(
+                baseline[key], current[key], tolerance, memory_tolerance
+            )
+        result["gated"] = key[1] in groups
+        case = dict(zip(("scale", "group", "name", "input"), key))
+        comparison.append(case | result)
+    return comparison
+
+
+def failures(comparison: list[dict]) -> list[dict]:
+    """Casos verificados que regrediram ou passaram a falhar."""
+    return [
+        item for item in comparison
+        if item["gated"] and item["status"] in {"regressão", "erro"}
+    ]
+
+
+def print_report(comparison: list[dict]) -> None:
+    """Imprime uma linha por caso, com as variações de tempo e memória."""
+    for item in comparison:
+        columns = (
+            f"[{item['scale']}] {item['group']:8s} {item['name']:40s} "
+            f"{item['input']:7s}"
+        )
+        if "time_change" in item:
+            memory = (
+                f"{item['memory_change']:+8.1%}" if item["memory_change"] is not None
+                else f"{'-':>8s}"
+            )
+            columns += (
+                f" tempo {item['time_change']:+8.1%} (limite {item['time_limit']:.0%})"
+                f" memória {memory}"
+            )
+        elif "detail" in item:
+            columns += f" {item['detail']}"
+        marker = "" if item["gated"] else " (não verificado)"
+        print(f"{columns}  {item['status']}{marker}")
+
+
+def check(
+    baseline_path: Path,
+    results_path: Path,
+    tolerance: float = TIME_TOLERANCE,
+    memory_tolerance: float = MEMORY_TOLERANCE,
+    groups: tuple[str, ...] = HOT_GROUPS,
+) -> int:
+    """Compara os dois arquivos, imprime o relatório e devolve o código de saída."""
+    comparison = compare_results(
+        load_results(baseline_path),
+        load_results(results_path),
+        tolerance,
+        memory_tolerance,
+        groups,
+    )
+    print_report(comparison)
+    failed = failures(comparison)
+    print(
+        f"{len(comparison)} casos comparados com {baseline_path}, "
+        f"{len(failed)} regressões",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def add_gate_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opções de tolerância compartilhadas com run_benchmarks.py."""
+    parser.add_argument(
+        "--tolerance", type=float, default=TIME_TOLERANCE,
+        help="Aumento relativo de tempo tolerado, além do ruído medido",
+    )
+    parser.add_argument(
+        "--memory-tolerance", type=float, default=MEMORY_TOLERANCE,
+        help="Aumento relativo do pico de memória tolerado",
+    )
+    parser.add_argument(
+        "--groups", nargs="+", default=list(HOT_GROUPS),
+        help="Grupos verificados (os demais são apenas reportados)",
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path, help="JSON da linha de base")
+    parser.add_argument("results", type=Path, help="JSON da execução atual")
+    add_gate_arguments(parser)
+    args = parser.parse_args()
+
+    sys.exit(check(
+        args.baseline,
+        args.results,
+        args.tolerance,
+        args.memory_tolerance,
+        tuple(args.groups),
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Gera exports sintéticos de uma frota de usinas no formato de data/arquivo.csv.
+
+O tamanho é usinas x microinversores x portas x dias (anos completos), com uma
+leitura diária por porta. A energia segue a sazonalidade do hemisfério sul,
+com variação diária de clima, diferenças de capacidade entre portas e dias
+sem geração.
+
+Uso:
+    python benchmarks/generate_fleet.py --plants 2 --microinverters 35 --years 10 \\
+        --output data/frota.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EXPORT_COLUMNS = ["Plant Name", "Date", "SN", "Port", "Energy", "Year", "Microinversor"]
+
+# Escalas usadas pela suíte de benchmarks (~10 mil, ~1 milhão e ~10 milhões de linhas)
+SCALES: dict[str, dict[str, int]] = {
+    "10k": {"plants": 1, "microinverters": 7, "ports": 4, "years": 1},
+    "1m": {"plants": 2, "microinverters": 35, "ports": 4, "years": 10},
+    "10m": {"plants": 5, "microinverters": 137, "ports": 4, "years": 10},
+}
+
+
+def generate_fleet(
+    plants: int = 1,
+    microinverters: int = 4,
+    ports: int = 4,
+    years: int = 1,
+    start_year: int = 2015,
+    days: int | None = None,
+    zero_rate: float = 0.05,
+    seed: int = 42,
+) -> pd.DataFrame:
+    """
+    Gera o export de uma frota sintética.
+
+    Args:
+        plants: Número de usinas.
+        microinverters: Microinversores por usina.
+        ports: Portas por microinversor.
+        years: Anos completos a partir de `start_year`.
+        start_year: Primeiro ano dos dados.
+        days: Se informado, substitui `years` pelo número exato de dias.
+        zero_rate: Fração de leituras sem geração.
+        seed: Semente do gerador aleatório.
+
+    Returns:
+        pd.DataFrame: Colunas de EXPORT_COLUMNS, ordenadas como no export real
+        (datas mais recentes primeiro).
+    """
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp(start_year, 1, 1)
+    if days is None:
+        end = pd.Timestamp(start_year + years - 1, 12, 31)
+    else:
+        end = start + pd.Timedelta(days=days - 1)
+    dates = pd.date_range(start, end, freq="D")[::-1]
+    devices = plants * microinverters * ports
+    rows = devices * len(dates)
+
+    # Uma linha por (data, dispositivo), com os dispositivos variando mais rápido
+    date_codes = np.repeat(np.arange(len(dates)), devices)
+    device = np.tile(np.arange(devices), len(dates))
+    plant = device // (microinverters * ports)
+    micro = device // ports  # Índice global do microinversor
+    port = device % ports + 1
+
+    # Sazonalidade (pico em dezembro/janeiro), clima diário e capacidade da porta
+    day_of_year = dates.dayofyear.to_numpy()
+    season = 0.75 + 0.25 * np.cos(2 * np.pi * (day_of_year - 15) / 365.25)
+    weather = rng.beta(5, 2, size=len(dates))
+    capacity = rng.normal(1.9, 0.15, size=devices).clip(1.2, 2.4)
+    energy = season[date_codes] * weather[date_codes] * capacity[device]
+    energy *= rng.normal(1.0, 0.05, size=rows).clip(0.7, 1.3)
+    energy[rng.random(rows) < zero_rate] = 0.0
+
+    # Nomes repetem entre usinas (Micro_01 em cada usina), como no export real
+    micro_names = [f"Micro_{index + 1:02d}" for index in range(microinverters)]
+    plant_names = [f"Usina_{index + 1:02d}" for index in range(plants)]
+    return pd.DataFrame({
+        "Plant Name": pd.Categorical.from_codes(plant, plant_names),
+        "Date": dates[date_codes],
+        "SN": 106272400000 + micro,
+        "Port": port,
+        "Energy": energy.round(3),
+        "Year": dates.year.to_numpy()[date_codes],
+        "Microinversor": pd.Categorical.from_codes(micro % microinverters, micro_names),
+    })[EXPORT_COLUMNS]
+
+
+def write_fleet(df: pd.DataFrame, path: Path) -> Path:
+    """Grava o export em CSV no mesmo formato de data/arquivo.csv."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=False, date_format="%Y-%m-%d")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scale", choices=SCALES, help="Usa uma escala predefinida")
+    parser.add_argument("--plants", type=int, default=1)
+    parser.add_argument("--microinverters", type=int, default=4)
+    parser.add_argument("--ports", type=int, default=4)
+    parser.add_argument("--years", type=int, default=1)
+    parser.add_argument("--start-year", type=int, default=2015)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, required=True, help="Arquivo CSV")
+    args = parser.parse_args()
+
+    shape = SCALES[args.scale] if args.scale else {
+        "plants": args.plants,
+        "microinverters": args.microinverters,
+        "ports": args.ports,
+        "years": args.years,
+    }
+    df = generate_fleet(**shape, start_year=args.start_year, seed=args.seed)
+    write_fleet(df, args.output)
+    print(f"{len(df):,} linhas gravadas em {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
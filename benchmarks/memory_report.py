@@ -0,0 +1,44 @@
+"""Relatório de memória do DataFrame carregado, antes e depois do schema compacto.
+
+Uso:
+    python benchmarks/memory_report.py data/arquivo.csv
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from utils.ingest import normalize_columns, normalize_data
+from utils.schema import memory_report
+
+
+def load_untyped(path: Path) -> pd.DataFrame:
+    """Reproduz o carregamento anterior ao schema (object/int64/strings)."""
+    df = normalize_columns(pd.read_csv(path))
+    df["Day"] = df["Date"].dt.day
+    df["Month"] = df["Date"].dt.month
+    df["Month_Year"] = df["Date"].dt.strftime("%Y-%m")
+    df["Year"] = df["Date"].dt.year
+    df["Week"] = df["Date"].dt.isocalendar().week
+    return df
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", type=Path, help="Arquivo CSV exportado")
+    args = parser.parse_args()
+
+    before = load_untyped(args.csv)
+    after = normalize_data(pd.read_csv(args.csv))
+    report = memory_report(before, after[before.columns])
+
+    pd.set_option("display.width", 120)
+    print(report.to_string(float_format=lambda value: f"{value:,.1f}"))
+
+
+if __name__ == "__main__":
+    main()
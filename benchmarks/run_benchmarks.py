@@ -0,0 +1,418 @@
+"""Suíte de benchmarks: carga, agregações, filtros e gráficos da Home por escala.
+
+Para cada escala (ver generate_fleet.SCALES) gera o export sintético uma única
+vez em .cache/benchmarks/ e mede:
+
+- carga: load_data com o cache em Parquet vazio (frio) e preenchido (quente),
+  e load_data_streaming;
+- cubo: construção do RollupCube na granularidade da Home;
+- filtros: HomeView._apply_filters sem e com o filter_cache;
+- métricas: cada agregação de modules/home/metrics.py sobre as linhas
+  carregadas e sobre a consulta ao cubo que a Home usa;
+- gráficos: cada construtor de modules/home/charts.py sobre a consulta ao cubo.
+
+Os resultados são gravados em JSON (tempos em segundos, pico de memória em
+bytes medido por tracemalloc em uma execução separada).
+
+Com --baseline, a execução é comparada a uma linha de base gravada (ver
+compare_benchmarks.py) e o script sai com código 1 se algum caminho quente
+regredir além da tolerância.
+
+Uso:
+    python benchmarks/run_benchmarks.py --scales 10k 1m --output resultados.json
+    python benchmarks/run_benchmarks.py --scales 10k \\
+        --baseline benchmarks/baselines/10k.json
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+import plotly
+import streamlit as st
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+from compare_benchmarks import add_gate_arguments, check
+from generate_fleet import SCALES, generate_fleet, write_fleet
+
+import utils.ingest as ingest
+import utils.load_data as load_data_module
+from config.constants import Colors
+from modules.home import charts, metrics
+from modules.home.home_view import HomeView
+from utils.aggregates import (
+    ROLLUP_KEYS,
+    RollupCube,
+    filter_cache,
+    get_cube,
+)
+from utils.dataset_cache import DatasetCache
+from utils.figure_cache import figure_cache
+from utils.profiler import StageProfiler
+
+DATA_DIR = ROOT / ".cache" / "benchmarks"
+
+# Orçamento de tempo por caso: casos lentos são repetidos menos vezes
+TIME_BUDGET_S = 2.0
+
+
+@dataclass
+class Case:
+    """Um item medido: `function` recebe o contexto da escala."""
+
+    group: str
+    name: str
+    input: str
+    function: Callable[[dict], object]
+    setup: Callable[[dict], None] | None = None
+
+
+def _metric_cases() -> list[Case]:
+    """Agregações de metrics.py sobre as linhas carregadas e sobre o cubo."""
+    on_frame = {
+        "count_records": metrics.count_records,
+        "energy_moments": metrics.energy_moments,
+        "date_bounds": metrics.date_bounds,
+        "calculate_total_energy": metrics.calculate_total_energy,
+        "calculate_current_month_energy": metrics.calculate_current_month_energy,
+        "alculate_current_year_energy": metrics.alculate_current_year_energy,
+        "calculate_energy_std_dev": metrics.calculate_energy_std_dev,
+        "calculate_efficiency": metrics.calculate_efficiency,
+        "calculate_coefficient_of_variation": (
+            metrics.calculate_coefficient_of_variation
+        ),
+        "compute_home_metrics": metrics.compute_home_metrics,
+        "aggregate_energy_by_year": metrics.aggregate_energy_by_year,
+        "aggregate_energy_by_year_microinverter": (
+            metrics.aggregate_energy_by_year_microinverter
+        ),
+        "prepare_monthly_comparison_data": metrics.prepare_monthly_comparison_data,
+        "prepare_year_production_data": metrics.prepare_year_production_data,
+        "prepare_data_for_heatmap": metrics.prepare_data_for_heatmap,
+        "filter_positive_energy": metrics.filter_positive_energy,
+        "clean_year_column": metrics.clean_year_column,
+        "format_year_range": lambda data: metrics.format_year_range(data["Year"]),
+    }
+    # Janelas do mês e do ano atuais, com a última data do export como referência
+    windowed = {
+        "current_year_window": metrics.current_year_window,
+        "current_month_window": metrics.current_month_window,
+    }
+    cases = [
+        Case("metrics", name, source, lambda ctx, f=function, s=source: f(ctx[s]))
+        for source in ("linhas", "cubo")
+        for name, function in on_frame.items()
+    ]
+    cases += [
+        Case(
+            "metrics",
+            name,
+            source,
+            lambda ctx, f=function, s=source: f(ctx[s], ctx["reference_date"]),
+        )
+        for source in ("linhas", "cubo")
+        for name, function in windowed.items()
+    ]
+
+    # Funções que recebem uma tabela já agregada, como nos gráficos
+    cases += [
+        Case(
+            "metrics",
+            "calculate_heatmap_height",
+            "cubo",
+            lambda ctx: metrics.calculate_heatmap_height(ctx["heatmap"]),
+        ),
+        Case(
+            "metrics",
+            "calculate_color_mapping",
+            "cubo",
+            lambda ctx: metrics.calculate_color_mapping(
+                ctx["by_year"], "Energy", Colors.GREEN_SEQUENTIAL
+            ),
+        ),
+        Case(
+            "metrics",
+            "calculate_yearly_averages",
+            "cubo",
+            lambda ctx: metrics.calculate_yearly_averages(ctx["monthly"]),
+        ),
+        Case(
+            "metrics",
+            "detect_significant_trends",
+            "cubo",
+            lambda ctx: metrics.detect_significant_trends(ctx["monthly"]),
+        ),
+    ]
+    return cases
+
+
+def _chart_cases() -> list[Case]:
+    """Construtores de gráficos de charts.py sobre a consulta que a Home usa."""
+    builders = [
+        charts.plot_energy_production_by_year,
+        charts.plot_energy_trend_by_year,
+        charts.plot_line_comparison_by_year,
+        charts.plot_microinverter_year_barchart,
+        charts.plot_energy_heatmap_by_microinverter,
+        charts.plot_grafico_area_empilhada,
+    ]
+    cases = [
+        Case("charts", builder.__name__, "cubo", lambda ctx, f=builder: f(ctx["cubo"]))
+        for builder in builders
+    ]
+
+    # Todas as figuras da Home pelo FigureRegistry, sem e com o figure_cache
+    def clear_figures(ctx: dict) -> None:
+        figure_cache.clear()
+
+    def home_figures(ctx: dict) -> None:
+        registry = charts.FigureRegistry(ctx["cubo"])
+        for name in registry.BUILDERS:
+            registry.get(name)
+
+    cases += [
+        Case(
+            "charts",
+            "FigureRegistry (frio)",
+            "cubo",
+            home_figures,
+            setup=clear_figures,
+        ),
+        Case("charts", "FigureRegistry (cache)", "cubo", home_figures),
+    ]
+    return cases
+
+
+def _load_cases() -> list[Case]:
+    """Carga do CSV com o cache em Parquet vazio e preenchido."""
+    load_data = load_data_module.load_data.__wrapped__  # Sem o st.cache_data
+    load_streaming = load_data_module.load_data_streaming.__wrapped__
+
+    def empty_cache(ctx: dict) -> None:
+        ctx["dataset_cache"].invalidate()
+
+    return [
+        Case(
+            "load",
+            "load_data (frio)",
+            "csv",
+            lambda ctx: load_data(ctx["csv"]),
+            setup=empty_cache,
+        ),
+        Case("load", "load_data (quente)", "csv", lambda ctx: load_data(ctx["csv"])),
+        Case(
+            "load", "load_data_streaming", "csv", lambda ctx: load_streaming(ctx["csv"])
+        ),
+    ]
+
+
+def _filter_cases() -> list[Case]:
+    """Construção do cubo e consulta da barra lateral da Home."""
+
+    def clear_filters(ctx: dict) -> None:
+        filter_cache.clear()
+
+    def apply_filters(ctx: dict) -> pd.DataFrame:
+        return ctx["view"]._apply_filters(ctx["cube"])
+
+    return [
+        Case(
+            "cube",
+            "RollupCube.cuboid",
+            "linhas",
+            lambda ctx: RollupCube(ctx["linhas"]).cuboid(ROLLUP_KEYS),
+        ),
+        Case(
+            "filters",
+            "HomeView._apply_filters (frio)",
+            "cubo",
+            apply_filters,
+            setup=clear_filters,
+        ),
+        Case("filters", "HomeView._apply_filters (cache)", "cubo", apply_filters),
+    ]
+
+
+def measure(case: Case, ctx: dict, repeat: int, trace_memory: bool) -> dict:
+    """
+    Mede um caso: tempos de até `repeat` execuções e o pico de memória.
+
+    Returns:
+        dict: Tempos mínimo e médio (s), repetições e pico (bytes), ou o erro.
+    """
+    timings = []
+    try:
+        while len(timings) < repeat:
+            if case.setup:
+                case.setup(ctx)
+            start = time.perf_counter()
+            case.function(ctx)
+            timings.append(time.perf_counter() - start)
+            # Para quando a próxima execução estouraria o orçamento do caso
+            if sum(timings) + timings[-1] > TIME_BUDGET_S:
+                break
+
+        peak_bytes = None
+        if trace_memory:
+            if case.setup:
+                case.setup(ctx)
+            profiler = StageProfiler(history=1)
+            with profiler.run(trace_memory=True):
+                case.function(ctx)
+            peak_bytes = profiler.runs[-1]["peak_bytes"]
+    except Exception as error:  # O erro é registrado e a suíte continua
+        return {"error": f"{type(error).__name__}: {error}"}
+
+    return {
+        "min_s": min(timings),
+        "mean_s": sum(timings) / len(timings),
+        "repeats": len(timings),
+        "peak_bytes": peak_bytes,
+    }
+
+
+def fleet_csv(scale: str) -> Path:
+    """Caminho do export sintético da escala, gerado na primeira vez."""
+    path = DATA_DIR / f"fleet-{scale}.csv"
+    if not path.exists():
+        print(f"[{scale}] gerando {path.name}...", file=sys.stderr)
+        write_fleet(generate_fleet(**SCALES[scale]), path)
+    return path
+
+
+def run_scale(scale: str, repeat: int, trace_memory: bool) -> list[dict]:
+    """Executa todos os casos em uma escala."""
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache = DatasetCache(cache_dir)
+        ingest.dataset_cache = cache  # Não toca no cache do app
+        ctx = {"csv": fleet_csv(scale), "dataset_cache": cache}
+
+        results = []
+
+        def record(case: Case, rows: int) -> None:
+            result = measure(case, ctx, repeat, trace_memory)
+            results.append({
+                "scale": scale,
+                "rows": rows,
+                "group": case.group,
+                "name": case.name,
+                "input": case.input,
+                **result,
+            })
+            timing = (
+                f"{result['min_s'] * 1000:10.2f} ms" if "error" not in result
+                else result["error"]
+            )
+            print(f"[{scale}] {case.group:8s} {case.name:40s} {case.input:7s} {timing}")
+            gc.collect()
+
+        for case in _load_cases():
+            record(case, 0)
+        ctx["linhas"] = load_data_module.load_data.__wrapped__(ctx["csv"])
+        rows = len(ctx["linhas"])
+        for result in results:
+            result["rows"] = rows
+
+        view = HomeView()
+        years = ctx["linhas"]["Year"]
+        view.year_range = (int(years.min()), int(years.max()))
+        view.microinverters = list(ctx["linhas"]["Microinversor"].unique())
+        view.show_zeros = False
+        ctx["view"] = view
+        ctx["cube"] = get_cube(ctx["linhas"])
+        for case in _filter_cases():
+            record(case, rows)
+
+        # Entradas dos gráficos: a consulta da Home e suas tabelas derivadas
+        ctx["cubo"] = view._apply_filters(ctx["cube"])
+        ctx["reference_date"] = metrics.date_bounds(ctx["linhas"])[1]
+        ctx["monthly"] = metrics.prepare_monthly_comparison_data(ctx["cubo"])
+        ctx["by_year"] = metrics.aggregate_energy_by_year(ctx["cubo"])
+        ctx["heatmap"] = metrics.prepare_data_for_heatmap(ctx["cubo"])
+        for case in _metric_cases() + _chart_cases():
+            record(case, rows)
+
+        filter_cache.clear()
+    return results
+
+
+def environment() -> dict:
+    """Versões e máquina, para comparar resultados entre execuções."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "versions": {
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "plotly": plotly.__version__,
+            "streamlit": st.__version__,
+        },
+        "time_budget_s": TIME_BUDGET_S,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scales", nargs="+", choices=SCALES, default=["10k", "1m"],
+        help="Escalas a medir (10m requer alguns GB de memória)",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Máximo de repetições")
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Não mede o pico de memória"
+    )
+    parser.add_argument(
+        "--output", type=Path, default=DATA_DIR / "results.json", help="Arquivo JSON"
+    )
+    parser.add_argument(
+        "--baseline", type=Path, help="Compara com esta linha de base ao final"
+    )
+    add_gate_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)  # Avisos do Streamlit fora do servidor
+    original_cache = ingest.dataset_cache
+    results = []
+    try:
+        for scale in args.scales:
+            results += run_scale(scale, max(args.repeat, 1), not args.no_memory)
+    finally:
+        ingest.dataset_cache = original_cache
+
+    errors = sum("error" in result for result in results)
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(
+        json.dumps({"meta": environment(), "results": results}, indent=2)
+    )
+    print(
+        f"{len(results)} medições ({errors} com erro) gravadas em {args.output}",
+        file=sys.stderr,
+    )
+
+    if args.baseline:
+        sys.exit(check(
+            args.baseline,
+            args.output,
+            args.tolerance,
+            args.memory_tolerance,
+            tuple(args.groups),
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,13 @@
-import time
-
 import streamlit as st
 
-from utils.load_data import load_data
+from config.constants import IngestSettings
+from utils.profiler import StageProfiler, stage
 from utils.router import Router
 
+# A camada de dados (pandas) e as páginas (plotly, gráficos e cards) são
+# importadas apenas onde são usadas, para que a página vazia seja exibida sem
+# esperar por elas (ver benchmarks/bench_startup.py).
+
 # Configuração avançada da página
 st.set_page_config(
     layout="wide",
@@ -18,7 +21,111 @@ st.set_page_config(
 )
 
 
+def _render_profiler(profiler: StageProfiler):
+    """Exibe o tempo por etapa dos últimos reruns no painel de Debug."""
+    st.subheader("⏱️ Perfil por etapa")
+    st.toggle(
+        "Medir pico de memória",
+        key="profile_memory",
+        help="Usa tracemalloc; deixa os reruns mais lentos enquanto ativo",
+    )
+
+    summary = profiler.summary()
+    if summary.empty:
+        st.caption("Nenhum rerun registrado ainda.")
+        return
+    st.caption(f"Últimos {len(profiler.runs)} rerun(s)")
+    st.dataframe(
+        summary,
+        hide_index=True,
+        column_config={
+            column: st.column_config.NumberColumn(format="%.2f")
+            for column in ["média (ms)", "último (ms)", "máximo (ms)", "pico (MB)"]
+        },
+    )
+
+    if st.toggle("Exportar perfil em JSON", key="profile_export"):
+        st.download_button(
+            "Baixar JSON",
+            data=profiler.to_json(),
+            file_name="perfil_reruns.json",
+            mime="application/json",
+        )
+
+
+def _render_debug():
+    """Painel de Debug: caches, memória e perfil por etapa."""
+    from utils.aggregates import filter_cache
+    from utils.dataset_cache import dataset_cache
+    from utils.dataset_store import dataset_store
+    from utils.figure_cache import figure_cache
+    from utils.load_data import load_data, load_data_streaming
+
+    with st.expander("🐞 Debug", False):
+        if st.button("Limpar cache"):
+            if "dataset" in st.session_state:
+                st.session_state.dataset.release()  # Sem depender do coletor
+            st.session_state.clear()
+            st.rerun()
+
+        if "dataset" in st.session_state:
+            memory_mb = (
+                st.session_state.dataset.frame.memory_usage(deep=True).sum() / 1024**2
+            )
+            st.caption(f"Memória do DataFrame: {memory_mb:,.1f} MB")
+
+        store_stats = dataset_store.stats()
+        st.caption(
+            f"Dados compartilhados: {store_stats['entries']} conjunto(s), "
+            f"{store_stats['refs']} sessão(ões), "
+            f"{store_stats['bytes'] / 1024**2:,.1f} de "
+            f"{store_stats['max_bytes'] / 1024**2:,.0f} MB mapeados"
+        )
+
+        cache_stats = dataset_cache.stats()
+        st.caption(
+            f"Cache de dados: {cache_stats['entries']} arquivo(s), "
+            f"{cache_stats['bytes'] / 1024**2:,.1f} de "
+            f"{cache_stats['max_bytes'] / 1024**2:,.0f} MB"
+        )
+        filter_stats = filter_cache.stats()
+        st.caption(
+            f"Cache de filtros: {filter_stats['entries']} consulta(s), "
+            f"{filter_stats['bytes'] / 1024**2:,.1f} de "
+            f"{filter_stats['max_bytes'] / 1024**2:,.0f} MB, "
+            f"{filter_stats['hits']} acerto(s) / {filter_stats['misses']} falha(s)"
+        )
+        figure_stats = figure_cache.stats()
+        st.caption(
+            f"Cache de figuras: {figure_stats['entries']} figura(s), "
+            f"{figure_stats['bytes'] / 1024**2:,.1f} de "
+            f"{figure_stats['max_bytes'] / 1024**2:,.0f} MB, "
+            f"{figure_stats['hits']} acerto(s) / {figure_stats['misses']} falha(s)"
+        )
+        if st.button("Invalidar cache de dados"):
+            removed = dataset_cache.invalidate()
+            load_data.clear()
+            load_data_streaming.clear()
+            filter_cache.clear()
+            figure_cache.clear()
+            dataset_store.clear()  # Apenas conjuntos sem sessões
+            st.session_state.pop("ingest_job", None)
+            st.toast(f"{removed} arquivo(s) removido(s) do cache", icon="🗑️")
+
+        _render_profiler(st.session_state.profiler)
+
+
 def main():
+    # Cada rerun é medido por etapa (ver utils.profiler)
+    profiler = st.session_state.setdefault("profiler", StageProfiler())
+    with profiler.run(trace_memory=st.session_state.get("profile_memory", False)):
+        _render_app()
+        # Debug por último: a camada de dados é importada depois da página
+        with st.sidebar:
+            _render_debug()
+
+
+def _render_app():
     router = Router()
 
     # Sidebar melhorada
@@ -39,37 +146,61 @@ def main():
             )
 
             if uploaded_file is not None:
-                with st.spinner("Processando..."):
-                    try:
-                        progress_bar = st.progress(0)
-                        for percent in range(100):
-                            time.sleep(0.01)
-                            progress_bar.progress(percent + 1)
-
-                        data = load_data(uploaded_file)
-                        st.session_state.df = data
+                streaming = st.checkbox(
+                    "Leitura em blocos (arquivos grandes)",
+                    value=uploaded_file.size > IngestSettings.STREAMING_MIN_BYTES,
+                    help="Lê o CSV em partes e mantém apenas dados agregados",
+                )
+                from utils.dataset_store import dataset_store
+                from utils.ingest import start_ingest
+
+                # A carga roda em uma thread; reruns reaproveitam a mesma carga
+                upload_key = (uploaded_file.file_id, uploaded_file.size, streaming)
+                job = st.session_state.get("ingest_job")
+                if job is None or job.key != upload_key:
+                    job = start_ingest(uploaded_file, streaming, key=upload_key)
+                    st.session_state.ingest_job = job
+
+                try:
+                    loader = "load_data_streaming" if streaming else "load_data"
+                    with stage(loader):
+                        # Arquivos pequenos terminam antes da primeira consulta
+                        if not job.wait(IngestSettings.POLL_INTERVAL_S):
+                            progress_bar = st.progress(0.0)
+                            while not job.wait(IngestSettings.POLL_INTERVAL_S):
+                                progress_bar.progress(
+                                    job.progress.fraction, text=job.progress.describe()
+                                )
+                            progress_bar.empty()
+                    if job.error is not None:
+                        raise job.error
+
+                    # A sessão guarda só um handle; os dados são compartilhados
+                    dataset = st.session_state.get("dataset")
+                    loaded_key = job.result.attrs["fingerprint"]
+                    if dataset is None or dataset.key != loaded_key:
+                        st.session_state.dataset = dataset_store.acquire(job.result)
+                        if dataset is not None:
+                            dataset.release()
                         st.toast("Arquivo carregado!", icon="✅")
-                        progress_bar.empty()
 
-                    except Exception as e:
-                        st.error(f"Erro: {e!s}")
-                        st.stop()
+                except Exception as e:
+                    st.error(f"Erro: {e!s}")
+                    st.stop()
 
         # Seção de pré-visualização
-        if "df" in st.session_state:
+        if "dataset" in st.session_state:
+            from utils.aggregates import is_rollup
+
             with st.expander("📊 Visualização Rápida"):
-                st.write(f"**Registros:** {len(st.session_state.df):,}")
+                df = st.session_state.dataset.frame
+                records = df["Records"].sum() if is_rollup(df) else len(df)
+                st.write(f"**Registros:** {records:,}")
                 if st.checkbox("Mostrar amostra"):
-                    st.dataframe(st.session_state.df.head(3))
-
-        # Debug (opcional)
-        with st.expander("🐞 Debug", False):
-            if st.button("Limpar cache"):
-                st.session_state.clear()
-                st.rerun()
+                    st.dataframe(df.head(3))
 
     # Validação de dados
-    if "df" not in st.session_state:
+    if "dataset" not in st.session_state:
         st.warning("Por favor, carregue um arquivo CSV")
         col1, col2 = st.columns(2)
         with col1:
@@ -120,7 +251,7 @@ def main():
     # Container principal
     main_container = st.container()
     with main_container:
-        router.navigate(selected, st.session_state.df)
+        router.navigate(selected, st.session_state.dataset.frame)
         st.markdown(
             "<div style='height: 100px;'></div>", unsafe_allow_html=True
         )  # Espaço no rodapé
@@ -3,8 +3,12 @@ import plotly.express as px
 import streamlit as st
 from plotly import graph_objects as go
 
+from charts.raw import FigureSpec, RawFigureMixin, continuous_bar_spec
+from charts.serialization import plotly_chart
+from config.constants import ChartSettings
 
-class BarChart:
+
+class BarChart(RawFigureMixin):
     """Classe para criação de gráficos de barras temáticos e reutilizáveis"""
 
     THEME_SETTINGS = {
@@ -42,6 +46,7 @@ class BarChart:
         margin: dict | None = None,
         xaxis_title: str | None = None,
         yaxis_title: str | None = None,
+        raw: bool = ChartSettings.RAW_FIGURES,
     ):
         self.data = data
         self.x_col = x_col
@@ -53,18 +58,29 @@ class BarChart:
         self.margin = margin or dict(l=60, r=30, t=70, b=60)  # Adjusted top margin
         self.xaxis_title = xaxis_title
         self.yaxis_title = yaxis_title
+        self.raw = raw  # Monta a figura sem Plotly Express (ver charts.raw)
         self.fig = self._create_base_figure()
         self._apply_theme_settings()
 
-    def _create_base_figure(self) -> go.Figure:
-        """Cria a figura inicial com Plotly Express"""
+    def _create_base_figure(self) -> go.Figure | FigureSpec:
+        """Cria a figura inicial com Plotly Express (ou em dicionários, no modo raw)"""
+        labels = {self.y_col: self.yaxis_title} if self.yaxis_title else None
+        if self.raw:
+            return continuous_bar_spec(
+                self.data,
+                self.x_col,
+                self.y_col,
+                self.color_scale,
+                labels=labels,
+                height=self.height,
+            )
         return px.bar(
             self.data,
             x=self.x_col,
             y=self.y_col,
             color=self.y_col,
             color_continuous_scale=self.color_scale,
-            labels={self.y_col: self.yaxis_title} if self.yaxis_title else None,
+            labels=labels,
             height=self.height,
         )
 
@@ -72,7 +88,7 @@ class BarChart:
         """Aplica as configurações visuais do tema selecionado"""
         theme = self.THEME_SETTINGS[self.theme]
 
-        self.fig.update_traces(
+        self._figure.update_traces(
             marker=dict(
                 line=dict(width=1.5, color="rgba(255,255,255,0.7)"), opacity=0.85
             ),
@@ -85,7 +101,7 @@ class BarChart:
             textfont=dict(color="white", size=11),
         )
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             plot_bgcolor=theme["plot_bg_color"],
             paper_bgcolor=theme["bg_color"],
             margin=self.margin,
@@ -141,7 +157,7 @@ class BarChart:
         """
         theme = self.THEME_SETTINGS[self.theme]
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             title={
                 "text": (
                     f"<b>{title}</b><br><span style='font-size:{subtitle_font['size'] if subtitle_font else 16}px;color:{subtitle_font['color'] if subtitle_font else theme['subtitle_color']}'>{subtitle}</span>"
@@ -163,7 +179,7 @@ class BarChart:
         text_color: str = "white",
     ) -> "BarChart":
         """Permite personalizações adicionais nas barras"""
-        self.fig.update_traces(
+        self._figure.update_traces(
             marker_line_width=line_width,
             opacity=opacity,
             textposition=text_position,
@@ -185,4 +201,4 @@ class BarChart:
             """,
             unsafe_allow_html=True,
         )
-        st.plotly_chart(self.fig, use_container_width=True)
+        plotly_chart(self.fig, use_container_width=True)
@@ -1,9 +1,13 @@
 import pandas as pd
 import plotly.express as px
-import streamlit as st
 
+from charts.raw import RawFigureMixin, grouped_traces_spec
+from charts.serialization import plotly_chart
+from charts.webgl import to_webgl, use_webgl
+from config.constants import ChartSettings
 
-class AreaChart:
+
+class AreaChart(RawFigureMixin):
     """Classe para criação de gráficos de área com suporte a temas dark/light"""
 
     # Configurações de tema padrão
@@ -44,12 +48,15 @@ class AreaChart:
         xaxis_title: str = "Mês",
         yaxis_title: str = "Energia Gerada",
         legend_title: str = "Ano",
+        raw: bool = ChartSettings.RAW_FIGURES,
     ):
         """
         Inicializa o gráfico com configurações de tema
 
         Args:
             theme: 'dark' ou 'light' - define o esquema de cores
+            raw: Monta a figura como dicionários, sem Plotly Express
+                (ver charts.raw)
             ... outros parâmetros permanecem iguais ...
         """
         self.data = data
@@ -66,6 +73,7 @@ class AreaChart:
         self.xaxis_title = xaxis_title
         self.yaxis_title = yaxis_title
         self.legend_title = legend_title
+        self.raw = raw
 
         # Validação do tema
         if self.theme not in self.THEME_SETTINGS:
@@ -84,16 +92,42 @@ class AreaChart:
         )
 
         # Cria o gráfico apenas com os dados filtrados
-        self.fig = px.area(
-            filtered_data,
-            x=self.x_col,
-            y=self.y_col,
-            color=self.color_col,
-            color_discrete_sequence=self.colors,
-            height=self.height,
-            labels={self.y_col: f"{self.y_col} ({self.unit})"},
-            template="plotly_dark" if self.theme == "dark" else None,
-        )
+        labels = {self.y_col: f"{self.y_col} ({self.unit})"}
+        template = "plotly_dark" if self.theme == "dark" else None
+        if self.raw:
+            self._figure = grouped_traces_spec(
+                filtered_data,
+                self.x_col,
+                self.y_col,
+                self.color_col,
+                self.colors,
+                {
+                    "type": "scatter",
+                    "fillpattern": {"shape": ""},
+                    "marker": {"symbol": "circle"},
+                    "mode": "lines",
+                    "orientation": "v",
+                    "stackgroup": "1",
+                },
+                labels=labels,
+                template=template,
+                height=self.height,
+            )
+        else:
+            self._figure = px.area(
+                filtered_data,
+                x=self.x_col,
+                y=self.y_col,
+                color=self.color_col,
+                color_discrete_sequence=self.colors,
+                height=self.height,
+                labels=labels,
+                template=template,
+            )
+        # Séries longas em WebGL, com o empilhamento feito em to_webgl
+        self.webgl = use_webgl(len(filtered_data))
+        if self.webgl:
+            self._figure = to_webgl(self._figure)
 
         self._apply_theme_settings()
 
@@ -110,7 +144,7 @@ class AreaChart:
             k: v for k, v in self.period_mapping.items() if k in active_periods
         }
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             xaxis={
                 "title": {
                     "text": self.xaxis_title,
@@ -144,7 +178,7 @@ class AreaChart:
         if subtitle is not None:
             self.subtitle = subtitle
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             title={
                 "text": (
                     f"<b>{self.title}</b><br><span style='font-size:{subtitle_font['size'] if subtitle_font else 16}px;color:{subtitle_font['color'] if subtitle_font else self.THEME_SETTINGS[self.theme]['subtitle_color']}'>{self.subtitle}</span>"
@@ -176,8 +210,10 @@ class AreaChart:
     ) -> "AreaChart":
         """Aplica estilização ao gráfico"""
         theme = self.THEME_SETTINGS[self.theme]
+        # No WebGL o y é o topo da pilha; o valor do ponto fica em customdata
+        value = "%{customdata:,.0f}" if self.webgl else "%{y:,.0f}"
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             hoverlabel=dict(
                 bgcolor="rgba(0, 0, 0, 0.8)",  # Fundo escuro semi-transparente
                 bordercolor="rgba(255, 255, 255, 0.5)",  # Borda branca semi-transparente
@@ -216,16 +252,16 @@ class AreaChart:
         )
 
         if bg_color:
-            self.fig.update_layout(paper_bgcolor=bg_color)
+            self._figure.update_layout(paper_bgcolor=bg_color)
         if plot_bg_color:
-            self.fig.update_layout(plot_bgcolor=plot_bg_color)
+            self._figure.update_layout(plot_bgcolor=plot_bg_color)
 
-        self.fig.update_traces(
+        self._figure.update_traces(
             line=dict(width=line_width),
             marker=dict(size=6, line=dict(width=1, color="white")),
             opacity=opacity,
             mode="lines+markers",
-            hovertemplate=f"<b>%{{fullData.name}}</b><br>{self.xaxis_title}: %{{x}}<br>{self.yaxis_title}: <b>%{{y:,.0f}} {self.unit}</b><extra></extra>",
+            hovertemplate=f"<b>%{{fullData.name}}</b><br>{self.xaxis_title}: %{{x}}<br>{self.yaxis_title}: <b>{value} {self.unit}</b><extra></extra>",
         )
         return self
 
@@ -240,7 +276,7 @@ class AreaChart:
 
     def show(self, **kwargs) -> None:
         """Exibe o gráfico no Streamlit"""
-        st.plotly_chart(self.fig, use_container_width=True, **kwargs)
+        plotly_chart(self.fig, use_container_width=True, **kwargs)
 
     def add_peak_annotation(
         self,
@@ -272,7 +308,7 @@ class AreaChart:
         theme = self.THEME_SETTINGS[self.theme]
 
         # Adiciona a anotação
-        self.fig.add_annotation(
+        self._figure.add_annotation(
             text=text,
             x=peak_data[self.x_col] + x_offset,
             y=peak_data[self.y_col] + y_offset,
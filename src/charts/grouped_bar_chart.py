@@ -1,10 +1,14 @@
 import pandas as pd
 import plotly.express as px
-import plotly.graph_objects as go
 import streamlit as st
 
+from charts.overlays import OverlayLayer
+from charts.raw import RawFigureMixin, grouped_traces_spec
+from charts.serialization import plotly_chart
+from config.constants import ChartSettings
 
-class GroupedBarChart:
+
+class GroupedBarChart(RawFigureMixin):
     THEME_SETTINGS = {
         "dark": {
             "title_color": "white",
@@ -46,6 +50,7 @@ class GroupedBarChart:
         text_auto: bool = True,
         barmode: str = "group",
         legend_title: str = "Legenda",
+        raw: bool = ChartSettings.RAW_FIGURES,
     ):
         self.data = data.copy()
         self.x_col = x_col
@@ -61,6 +66,7 @@ class GroupedBarChart:
         self.text_auto = text_auto
         self.barmode = barmode
         self.legend_title = legend_title
+        self.raw = raw  # Monta a figura sem Plotly Express (ver charts.raw)
         self.theme_settings = self.THEME_SETTINGS.get(
             theme, self.THEME_SETTINGS["dark"]
         )
@@ -74,7 +80,31 @@ class GroupedBarChart:
         self.add_styles_and_averages()
 
     def create_chart(self):
-        self.fig = px.bar(
+        # Cor numérica é escala contínua no Plotly Express: segue por ele
+        if self.raw and not pd.api.types.is_numeric_dtype(self.data[self.color_col]):
+            trace = {
+                "type": "bar",
+                "marker": {"pattern": {"shape": ""}},
+                "orientation": "v",
+                "textposition": "auto",
+            }
+            if self.barmode == "group":
+                trace["alignmentgroup"] = "True"
+            if self.text_auto:
+                fmt = "" if self.text_auto is True else f":{self.text_auto}"
+                trace["texttemplate"] = f"%{{y{fmt}}}"
+            self._figure = grouped_traces_spec(
+                self.data,
+                self.x_col,
+                self.y_col,
+                self.color_col,
+                self.colors,
+                trace,
+                height=self.height,
+                barmode=self.barmode,
+            )
+            return
+        self._figure = px.bar(
             self.data,
             x=self.x_col,
             y=self.y_col,
@@ -86,7 +116,7 @@ class GroupedBarChart:
         )
 
     def set_layout(self):
-        self.fig.update_layout(
+        self._figure.update_layout(
             title={
                 "text": (
                     f"<b>{self.title or 'Produção Anual por Microinversor'}</b><br>"
@@ -142,7 +172,7 @@ class GroupedBarChart:
         )
 
     def add_styles_and_averages(self):
-        self.fig.update_traces(
+        self._figure.update_traces(
             marker_line=dict(width=1, color=self.theme_settings["bar_line_color"]),
             hovertemplate=(
                 f"{(self.xlabel + ': ') if self.xlabel else ''}%{{x}}<br>"
@@ -152,34 +182,28 @@ class GroupedBarChart:
             textposition="outside",
         )
 
-        # ✅ Garante eixo X categórico (strings) nas médias
-        self.data[self.x_col] = self.data[self.x_col].astype(str)
-        averages = self.data.groupby(self.x_col)[self.y_col].mean().reset_index()
-        averages[self.x_col] = averages[self.x_col].astype(str)
-
-        for _, row in averages.iterrows():
-            x_val = row[self.x_col]
-            self.fig.add_trace(
-                go.Scatter(
-                    x=[x_val, x_val],
-                    y=[0, row[self.y_col]],
-                    mode="lines",
-                    line=dict(color="red", width=2, dash="dash"),
-                    showlegend=False,
-                )
-            )
-            self.fig.add_annotation(
-                x=x_val,
-                y=0,
-                text=f"Média: {row[self.y_col]:.2f}",
-                showarrow=True,
-                arrowhead=2,
-                ax=0,
-                ay=40,
-                bgcolor=self.theme_settings["hover_bg"],
-                bordercolor=self.theme_settings["grid_color"],
-                font=dict(color=self.theme_settings["hover_font_color"]),
-            )
+        # Médias por categoria do eixo X (strings), sobrepostas em lote
+        averages = self.data.groupby(self.x_col)[self.y_col].mean()
+        x_values = averages.index.astype(str).to_numpy()
+        OverlayLayer().add_segments(
+            x_values,
+            0,
+            x_values,
+            averages.to_numpy(),
+            line=dict(color="red", width=2, dash="dash"),
+            showlegend=False,
+        ).add_annotations(
+            x=x_values,
+            y=0,
+            text=[f"Média: {value:.2f}" for value in averages],
+            showarrow=True,
+            arrowhead=2,
+            ax=0,
+            ay=40,
+            bgcolor=self.theme_settings["hover_bg"],
+            bordercolor=self.theme_settings["grid_color"],
+            font=dict(color=self.theme_settings["hover_font_color"]),
+        ).commit(self._figure)
 
     def show(self, **kwargs):
         st.markdown(
@@ -193,4 +217,4 @@ class GroupedBarChart:
             """,
             unsafe_allow_html=True,
         )
-        st.plotly_chart(self.fig, use_container_width=True, **kwargs)
+        plotly_chart(self.fig, use_container_width=True, **kwargs)
@@ -4,8 +4,15 @@ import plotly.graph_objects as go
 import streamlit as st
 from plotly.colors import qualitative
 
+from charts.overlays import OverlayLayer
+from charts.raw import FigureSpec, RawFigureMixin, grouped_traces_spec
+from charts.serialization import plotly_chart
+from charts.webgl import use_webgl
+from config.constants import ChartSettings
+from utils.downsampling import downsample_frame
 
-class LineChart:
+
+class LineChart(RawFigureMixin):
     """Classe para criação de gráficos de linha com suporte a temas dark/light"""
 
     THEME_SETTINGS = {
@@ -53,6 +60,8 @@ class LineChart:
         legend_title: str = "Ano",
         height: int = 450,
         unit: str = "kWh",
+        width_px: int | None = ChartSettings.DOWNSAMPLE_WIDTH_PX,
+        raw: bool = ChartSettings.RAW_FIGURES,
     ):
         self.data = data
         self.x_col = x_col
@@ -68,6 +77,8 @@ class LineChart:
         self.legend_title = legend_title
         self.height = height
         self.unit = unit
+        self.width_px = width_px  # None: envia todos os pontos
+        self.raw = raw  # Monta a figura sem Plotly Express (ver charts.raw)
 
         if self.theme not in self.THEME_SETTINGS:
             raise ValueError(f"Tema '{theme}' inválido. Use 'dark' ou 'light'")
@@ -86,17 +97,50 @@ class LineChart:
                     f"Coluna obrigatória '{col}' não encontrada no DataFrame."
                 )
 
-    def _create_figure(self) -> go.Figure:
+    def _plot_data(self) -> pd.DataFrame:
+        """Dados traçados: cada linha reduzida a ~1 ponto por pixel de largura."""
+        if not self.width_px:
+            return self.data
+        return downsample_frame(
+            self.data, self.x_col, self.y_col, self.color_col, width_px=self.width_px
+        )
+
+    def _create_figure(self) -> go.Figure | FigureSpec:
+        data = self._plot_data()
+        self.webgl = use_webgl(len(data))  # Scattergl em séries longas
+        labels = {self.y_col: f"{self.ylabel} ({self.unit})"}
+        template = "plotly_dark" if self.theme == "dark" else "plotly_white"
+        if self.raw:
+            trace = {
+                "type": "scattergl" if self.webgl else "scatter",
+                "line": {"dash": "solid"},
+                "marker": {"symbol": "circle"},
+                "mode": "lines+markers",
+            }
+            if not self.webgl:
+                trace["orientation"] = "v"
+            return grouped_traces_spec(
+                data,
+                self.x_col,
+                self.y_col,
+                self.color_col,
+                self.colors,
+                trace,
+                labels=labels,
+                template=template,
+                height=self.height,
+            )
         fig = px.line(
-            self.data,
+            data,
             x=self.x_col,
             y=self.y_col,
             color=self.color_col,
             markers=True,
             color_discrete_sequence=self.colors,
-            labels={self.y_col: f"{self.ylabel} ({self.unit})"},
+            labels=labels,
             height=self.height,
-            template="plotly_dark" if self.theme == "dark" else "plotly_white",
+            template=template,
+            render_mode="webgl" if self.webgl else "svg",
         )
         return fig
 
@@ -118,23 +162,22 @@ class LineChart:
         )
 
     def _add_inline_labels(self):
-        for trace in self.fig.data:
-            if trace.mode and "lines" in trace.mode:
-                x_end = trace.x[-1]
-                y_end = trace.y[-1]
-                self.fig.add_annotation(
-                    x=x_end,
-                    y=y_end,
-                    text=trace.name,
-                    showarrow=False,
-                    font=dict(size=12, color=trace.line.color),
-                    xanchor="left",
-                    xshift=10,
-                    yshift=10,
-                )
+        lines = [
+            trace for trace in self._figure.data if trace.mode and "lines" in trace.mode
+        ]
+        OverlayLayer().add_annotations(
+            x=[trace.x[-1] for trace in lines],
+            y=[trace.y[-1] for trace in lines],
+            text=[trace.name for trace in lines],
+            showarrow=False,
+            font=[dict(size=12, color=trace.line.color) for trace in lines],
+            xanchor="left",
+            xshift=10,
+            yshift=10,
+        ).commit(self._figure)
 
     def _hide_legend(self):
-        self.fig.update_layout(showlegend=False)
+        self._figure.update_layout(showlegend=False)
 
     def set_titles(
         self,
@@ -155,7 +198,7 @@ class LineChart:
         }
         subtitle_font = subtitle_font or default_subtitle_font
 
-        self.fig.update_layout(
+        self._figure.update_layout(
             title={
                 "text": (
                     f"<b>{self.title}</b><br><span style='font-size:{subtitle_font['size']}px;color:{subtitle_font['color']}'>{self.subtitle}</span>"
@@ -228,7 +271,7 @@ class LineChart:
         }
 
         # Customiza o hover de cada linha
-        for trace in self.fig.data:
+        for trace in self._figure.data:
             trace.update(
                 hovertemplate=(
                     f"<b>Ano: %{{fullData.name}}</b><br>"
@@ -237,27 +280,36 @@ class LineChart:
                 )
             )
 
-        self.fig.update_layout(layout_updates)
+        self._figure.update_layout(layout_updates)
         return self
 
     def add_peaks_per_group(self, label_col="Year") -> "LineChart":
-        for name, group in self.data.groupby(label_col):
-            peak = group.loc[group[self.y_col].idxmax()]
-            self.fig.add_trace(
-                go.Scatter(
-                    x=[peak[self.x_col]],
-                    y=[peak[self.y_col]],
-                    mode="markers+text",
-                    name=f"Pico {name}",
-                    marker=dict(
-                        color=self.THEME_SETTINGS[self.theme]["highlight_color"],
-                        size=12,
-                    ),
-                    # text=[f"Pico {name}"],
-                    text=["P"],
-                    textposition="top center",
+        # Linha do pico de cada grupo, de uma vez; marcadores entram em lote
+        peaks = self.data.loc[
+            self.data.groupby(label_col, observed=True)[self.y_col].idxmax()
+        ]
+        marker = dict(
+            color=self.THEME_SETTINGS[self.theme]["highlight_color"],
+            size=12,
+        )
+        OverlayLayer().add_traces(
+            [
+                {
+                    "type": "scatter",
+                    "x": [x],
+                    "y": [y],
+                    "mode": "markers+text",
+                    "name": f"Pico {name}",
+                    "marker": marker,
+                    # "text": [f"Pico {name}"],
+                    "text": ["P"],
+                    "textposition": "top center",
+                }
+                for name, x, y in zip(
+                    peaks[label_col], peaks[self.x_col], peaks[self.y_col]
                 )
-            )
+            ]
+        ).commit(self._figure)
         return self
 
     def show(self, **kwargs) -> None:
@@ -273,4 +325,4 @@ class LineChart:
             """,
             unsafe_allow_html=True,
         )
-        st.plotly_chart(self.fig, use_container_width=True)
+        plotly_chart(self.fig, use_container_width=True)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from charts.raw import FigureSpec
+
+
+def _is_column(value) -> bool:
+    """Valores por item são sequências (listas, arrays, Series); textos não."""
+    return isinstance(value, (list, tuple, np.ndarray, pd.Series, pd.Index))
+
+
+def _records(columns: dict) -> list[dict]:
+    """
+    Um dicionário por item a partir de colunas (valores por item) e escalares.
+
+    Valores escalares e dicionários valem para todos os itens. Os arrays
+    viram tipos do Python, como o Plotly espera no layout.
+
+    Raises:
+        ValueError: Se as colunas tiverem tamanhos diferentes.
+    """
+    per_item = {
+        key: value.tolist() if hasattr(value, "tolist") else list(value)
+        for key, value in columns.items()
+        if _is_column(value)
+    }
+    shared = {key: value for key, value in columns.items() if key not in per_item}
+    sizes = {len(values) for values in per_item.values()}
+    if len(sizes) > 1:
+        raise ValueError(f"Colunas com tamanhos diferentes: {sorted(sizes)}")
+    count = sizes.pop() if sizes else 1
+    return [
+        {**shared, **{key: values[i] for key, values in per_item.items()}}
+        for i in range(count)
+    ]
+
+
+class OverlayLayer:
+    """
+    Sobreposições de um gráfico (linhas de referência, marcadores e rótulos).
+
+    Cada fig.add_shape/add_annotation revalida e copia todo o layout, então N
+    sobreposições custam O(N²). Aqui os itens são montados em lote a partir de
+    arrays (um argumento com lista/array é por item; escalares e dicionários
+    valem para todos) e entram na figura de uma vez em ``commit``: uma
+    atualização de layout e um add_traces.
+
+    Exemplo:
+        OverlayLayer().add_annotations(x=anos, y=0, text=rotulos).commit(fig)
+    """
+
+    def __init__(self):
+        self.shapes: list[dict] = []
+        self.annotations: list[dict] = []
+        self.traces: list[go.Scatter | dict] = []
+
+    def add_shapes(self, **columns) -> "OverlayLayer":
+        """Shapes do layout (ex.: type="line", x0, y0, x1, y1, line)."""
+        self.shapes.extend(_records(columns))
+        return self
+
+    def add_annotations(self, **columns) -> "OverlayLayer":
+        """Anotações do layout (ex.: x, y, text, font, showarrow)."""
+        self.annotations.extend(_records(columns))
+        return self
+
+    def add_segments(self, x0, y0, x1, y1, **style) -> "OverlayLayer":
+        """
+        Segmentos de reta em um único traço Scatter, separados por lacunas.
+
+        Equivale a um traço mode="lines" por segmento com o mesmo `style`,
+        sem o custo de um traço por item.
+        """
+        x0, y0, x1, y1 = (
+            np.asarray(values, dtype=object).ravel()
+            for values in np.broadcast_arrays(x0, y0, x1, y1)
+        )
+        gaps = np.full(len(x0), None, dtype=object)
+        self.traces.append(
+            {
+                "type": "scatter",
+                "x": np.column_stack((x0, x1, gaps)).ravel().tolist(),
+                "y": np.column_stack((y0, y1, gaps)).ravel().tolist(),
+                "mode": "lines",
+                **style,
+            }
+        )
+        return self
+
+    def add_traces(self, traces: list) -> "OverlayLayer":
+        """Traços já montados, objetos ou dicionários (ex.: um marcador por grupo)."""
+        self.traces.extend(traces)
+        return self
+
+    def commit(self, fig: go.Figure | FigureSpec) -> go.Figure | FigureSpec:
+        """Adiciona tudo à figura (ou FigureSpec) de uma vez e esvazia a camada."""
+        if self.traces:
+            fig.add_traces(self.traces)
+        layout = {}
+        if self.shapes:
+            layout["shapes"] = [*(fig.layout.shapes or ()), *self.shapes]
+        if self.annotations:
+            layout["annotations"] = [*(fig.layout.annotations or ()), *self.annotations]
+        if layout:
+            fig.update_layout(layout)
+        self.shapes, self.annotations, self.traces = [], [], []
+        return fig
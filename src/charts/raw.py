@@ -0,0 +1,391 @@
+import copy
+import functools
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.basedatatypes import BaseTraceType
+
+# Propriedades do Plotly cujo nome tem "_" (não são caminhos "pai_filho")
+_UNDERSCORE_NAMES = {
+    "copy_ystyle",
+    "copy_zstyle",
+    "error_x",
+    "error_y",
+    "error_z",
+    "paper_bgcolor",
+    "plot_bgcolor",
+}
+
+
+def base_template(name: str | None = None) -> dict:
+    """
+    Template Plotly do tema (ex.: "plotly_dark") como dicionário, montado uma vez.
+
+    Compartilhado por todas as figuras montadas em modo raw; nunca é alterado.
+    None é o template padrão do Plotly, como no Plotly Express sem `template`.
+    """
+    return _compiled_template(name or pio.templates.default)
+
+
+@functools.cache
+def _compiled_template(name: str) -> dict:
+    return pio.templates[name].to_plotly_json()
+
+
+@functools.cache
+def _path(key: str) -> tuple[str, ...]:
+    """Caminho de uma chave com sublinhados (ex.: "marker_line_width")."""
+    parts = key.split("_")
+    path = []
+    while parts:
+        name = parts.pop(0)
+        if parts and f"{name}_{parts[0]}" in _UNDERSCORE_NAMES:
+            name = f"{name}_{parts.pop(0)}"
+        path.append(name)
+    return tuple(path)
+
+
+def _plain(value):
+    """Séries e índices do pandas viram arrays, como na validação do Plotly."""
+    if isinstance(value, (pd.Series, pd.Index)):
+        return value.to_numpy()
+    return value
+
+
+def merge(target: dict, updates: dict) -> dict:
+    """
+    Aplica `updates` a `target` no lugar, com as regras do update do Plotly.
+
+    Dicionários são mesclados recursivamente; chaves com sublinhado são
+    caminhos ("xaxis_showgrid" é xaxis.showgrid); None remove a propriedade;
+    um texto em "title" substitui o título por {"text": ...}; os demais valores
+    (inclusive listas e arrays) substituem o anterior.
+    """
+    for key, value in updates.items():
+        *parents, leaf = _path(key)
+        node = target
+        for part in parents:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = node[part] = {}
+            node = child
+
+        if value is None:
+            node.pop(leaf, None)
+        elif isinstance(value, dict):
+            child = node.get(leaf)
+            if not isinstance(child, dict):
+                child = node[leaf] = {}
+            merge(child, value)
+        elif leaf == "title" and isinstance(value, str):
+            node[leaf] = {"text": value}
+        else:
+            node[leaf] = _plain(value)
+    return target
+
+
+class Props(dict):
+    """Dicionário com acesso por atributo, como nos objetos do Plotly."""
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)  # Protocolos (ex.: __array_struct__)
+        value = self.get(name)
+        if isinstance(value, dict) and not isinstance(value, Props):
+            value = self[name] = Props(value)
+        return value
+
+
+class FigureSpec:
+    """
+    Figura como dicionários simples, sem validação, convertida uma vez em go.Figure.
+
+    Oferece as operações de go.Figure usadas pelas classes de gráfico
+    (update_layout, update_traces, add_trace(s), add_annotation, data, layout)
+    com as mesmas regras de atualização (ver merge), mas cada chamada só
+    altera dicionários. ``to_figure`` cria a go.Figure sem validação e a
+    reaproveita até a próxima alteração; a figura é validada uma única vez, no
+    envio (st.plotly_chart).
+    """
+
+    def __init__(self, data: list[dict], layout: dict):
+        self._data = [Props(trace) for trace in data]
+        self._layout = Props(layout)
+        self._figure: go.Figure | None = None
+
+    @property
+    def data(self) -> list[Props]:
+        return self._data
+
+    @property
+    def layout(self) -> Props:
+        return self._layout
+
+    def update_layout(self, dict1: dict | None = None, **kwargs) -> "FigureSpec":
+        self._figure = None
+        updates = {**(dict1 or {}), **kwargs}
+        if any(_path(key)[0] == "template" for key in updates):
+            # O template de base é compartilhado: alterações vão para uma cópia
+            self._layout["template"] = copy.deepcopy(self._layout.get("template"))
+        merge(self._layout, updates)
+        return self
+
+    def update_traces(
+        self, patch: dict | None = None, selector: dict | None = None, **kwargs
+    ) -> "FigureSpec":
+        self._figure = None
+        updates = {**(patch or {}), **kwargs}
+        for trace in self._data:
+            if selector and any(trace.get(k) != v for k, v in selector.items()):
+                continue
+            merge(trace, updates)
+        return self
+
+    def add_trace(self, trace) -> "FigureSpec":
+        return self.add_traces([trace])
+
+    def add_traces(self, traces: list) -> "FigureSpec":
+        self._figure = None
+        for trace in traces:
+            if isinstance(trace, BaseTraceType):
+                trace = trace.to_plotly_json()
+            self._data.append(Props(merge({"type": "scatter"}, trace)))
+        return self
+
+    def add_annotation(self, arg: dict | None = None, **kwargs) -> "FigureSpec":
+        self._figure = None
+        annotation = merge({}, {**(arg or {}), **kwargs})
+        self._layout["annotations"] = [*(self._layout.annotations or ()), annotation]
+        return self
+
+    def to_figure(self) -> go.Figure:
+        """go.Figure sem validação (a mesma até a próxima alteração)."""
+        if self._figure is None:
+            self._figure = go.Figure(
+                {"data": self._data, "layout": self._layout}, _validate=False
+            )
+        return self._figure
+
+
+class RawFigureMixin:
+    """
+    ``fig`` das classes de gráfico com suporte ao modo raw.
+
+    Os métodos internos alteram ``self._figure``: uma go.Figure (modo padrão,
+    via Plotly Express) ou uma FigureSpec (modo raw). Quem lê ``fig`` recebe
+    sempre uma go.Figure.
+    """
+
+    _figure: "go.Figure | FigureSpec | None" = None
+
+    @property
+    def fig(self) -> go.Figure | None:
+        if isinstance(self._figure, FigureSpec):
+            return self._figure.to_figure()
+        return self._figure
+
+    @fig.setter
+    def fig(self, value: "go.Figure | FigureSpec | None") -> None:
+        self._figure = value
+
+
+# --- Montagem equivalente ao Plotly Express, direto dos arrays ---
+
+
+def _groups(data: pd.DataFrame, color_col: str) -> list[tuple]:
+    """(valor, posições) de cada grupo, na ordem do Plotly Express."""
+    column = data[color_col]
+    indices = column.groupby(column, sort=False, observed=True).indices
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        order = [value for value in column.cat.categories if value in indices]
+    else:
+        order = list(indices)  # Ordem de aparição
+    return [(value, indices[value]) for value in order]
+
+
+def _axes(x_title: str | None, y_title: str | None) -> dict:
+    """Eixos cartesianos como o Plotly Express os cria."""
+    xaxis = {"anchor": "y", "domain": [0.0, 1.0]}
+    yaxis = {"anchor": "x", "domain": [0.0, 1.0]}
+    if x_title is not None:
+        xaxis["title"] = {"text": x_title}
+    if y_title is not None:
+        yaxis["title"] = {"text": y_title}
+    return {"xaxis": xaxis, "yaxis": yaxis}
+
+
+def _colorscale(colors: list[str]) -> list[list]:
+    """Escala contínua com as cores igualmente espaçadas."""
+    if len(colors) == 1:
+        return [[0.0, colors[0]], [1.0, colors[0]]]
+    step = len(colors) - 1
+    return [[i / step, color] for i, color in enumerate(colors)]
+
+
+def _layout(axes: dict, template: str | None, height: int | None, **extra) -> dict:
+    layout = {**axes, **extra, "template": base_template(template)}
+    layout.setdefault("margin", {"t": 60})
+    if height is not None:
+        layout["height"] = height
+    return layout
+
+
+def grouped_traces_spec(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    color_col: str,
+    colors: list[str],
+    trace: dict,
+    labels: dict | None = None,
+    template: str | None = None,
+    height: int | None = None,
+    **layout,
+) -> FigureSpec:
+    """
+    Um traço por grupo de `color_col`, como px.line/px.area/px.bar com `color`.
+
+    `trace` tem as propriedades comuns do tipo de traço (ex.: type, mode,
+    stackgroup); a cor de cada grupo vai em "line" (ou em "marker", nas
+    barras), com as cores de `colors` em ciclo.
+    """
+    labels = labels or {}
+    x_label = labels.get(x_col, x_col)
+    y_label = labels.get(y_col, y_col)
+    color_label = labels.get(color_col, color_col)
+    x_values = data[x_col].to_numpy()
+    y_values = data[y_col].to_numpy()
+    color_key = "marker" if trace.get("type") == "bar" else "line"
+
+    traces = []
+    for i, (value, positions) in enumerate(_groups(data, color_col)):
+        name = str(value)
+        group = {
+            **trace,
+            "hovertemplate": (
+                f"{color_label}={name}<br>{x_label}=%{{x}}<br>{y_label}=%{{y}}"
+                "<extra></extra>"
+            ),
+            "legendgroup": name,
+            "name": name,
+            "showlegend": True,
+            "x": x_values[positions],
+            "xaxis": "x",
+            "y": y_values[positions],
+            "yaxis": "y",
+        }
+        group[color_key] = {
+            **trace.get(color_key, {}),
+            "color": colors[i % len(colors)],
+        }
+        if "alignmentgroup" in trace:
+            group["offsetgroup"] = name  # Barras lado a lado (barmode="group")
+        traces.append(group)
+
+    return FigureSpec(
+        traces,
+        _layout(
+            _axes(x_label, y_label),
+            template,
+            height,
+            legend={"title": {"text": color_label}, "tracegroupgap": 0},
+            **layout,
+        ),
+    )
+
+
+def continuous_bar_spec(
+    data: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    color_scale: list[str],
+    labels: dict | None = None,
+    height: int | None = None,
+) -> FigureSpec:
+    """Barras coloridas pelo próprio valor, como px.bar(color=y_col)."""
+    labels = labels or {}
+    x_label = labels.get(x_col, x_col)
+    y_label = labels.get(y_col, y_col)
+    y_values = data[y_col].to_numpy()
+    trace = {
+        "hovertemplate": (
+            f"{x_label}=%{{x}}<br>{y_label}=%{{marker.color}}<extra></extra>"
+        ),
+        "legendgroup": "",
+        "marker": {
+            "color": y_values,
+            "coloraxis": "coloraxis",
+            "pattern": {"shape": ""},
+        },
+        "name": "",
+        "orientation": "v",
+        "showlegend": False,
+        "textposition": "auto",
+        "x": data[x_col].to_numpy(),
+        "xaxis": "x",
+        "y": y_values,
+        "yaxis": "y",
+        "type": "bar",
+    }
+    return FigureSpec(
+        [trace],
+        _layout(
+            _axes(x_label, y_label),
+            None,
+            height,
+            coloraxis={
+                "colorbar": {"title": {"text": y_label}},
+                "colorscale": _colorscale(color_scale),
+                "autocolorscale": False,
+            },
+            legend={"tracegroupgap": 0},
+            barmode="relative",
+        ),
+    )
+
+
+def heatmap_spec(
+    z: np.ndarray,
+    x: list,
+    y: list,
+    color_scale: list[str],
+    labels: dict,
+    text_auto: str | None = None,
+) -> FigureSpec:
+    """Matriz de cores, como px.imshow(z, x=..., y=..., aspect="auto")."""
+    x_label = labels.get("x") or "x"
+    y_label = labels.get("y") or "y"
+    color_label = labels.get("color") or "color"
+    trace = {
+        "coloraxis": "coloraxis",
+        "name": "0",
+        "x": list(x),
+        "y": list(y),
+        "z": z,
+        "type": "heatmap",
+        "xaxis": "x",
+        "yaxis": "y",
+        "hovertemplate": (
+            f"{x_label}: %{{x}}<br>{y_label}: %{{y}}<br>{color_label}: %{{z}}"
+            "<extra></extra>"
+        ),
+    }
+    if text_auto:
+        trace["texttemplate"] = f"%{{z:{text_auto}}}"
+    axes = _axes(None, None)
+    axes["yaxis"]["autorange"] = "reversed"
+    return FigureSpec(
+        [trace],
+        _layout(
+            axes,
+            None,
+            None,
+            coloraxis={
+                "colorbar": {"title": {"text": color_label}},
+                "colorscale": _colorscale(color_scale),
+                "autocolorscale": False,
+            },
+        ),
+    )
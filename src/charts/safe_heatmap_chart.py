@@ -1,8 +1,12 @@
+import numpy as np
 import plotly.express as px
-import streamlit as st
 
+from charts.raw import RawFigureMixin, heatmap_spec
+from charts.serialization import plotly_chart
+from config.constants import ChartSettings
 
-class Heatmap:
+
+class Heatmap(RawFigureMixin):
     """Classe para criar heatmaps com temas e personalizações."""
 
     THEME_SETTINGS = {
@@ -28,7 +32,7 @@ class Heatmap:
 
     def __init__(
         self,
-        data_values: list,
+        data_values: np.ndarray | list,
         x_labels: list,
         y_labels: list,
         color_scale: list,
@@ -44,12 +48,14 @@ class Heatmap:
         unit: str = "kWh",
         margin: dict = None,
         show_colorbar: bool = True,  # add parameter
+        raw: bool = ChartSettings.RAW_FIGURES,
     ):
         """
         Inicializa o heatmap.
 
         Args:
-            data_values: Valores do heatmap.
+            data_values: Matriz de valores (array NumPy, DataFrame ou lista de
+                listas), mantida como array float32 até o Plotly.
             x_labels: Rótulos para o eixo x.
             y_labels: Rótulos para o eixo y.
             color_scale: Escala de cores para o heatmap.
@@ -65,6 +71,8 @@ class Heatmap:
             unit: Unidade de medida.
             margin: Margens personalizadas.
             show_colorbar: Show or hide colorbar
+            raw: Monta a figura como dicionários, sem Plotly Express
+                (ver charts.raw).
         """
         self.data_values = data_values
         self.x_labels = x_labels
@@ -84,6 +92,7 @@ class Heatmap:
             margin if margin else {"l": 40, "r": 40, "t": 40, "b": 40}
         )  # Ajustar margens
         self.show_colorbar = show_colorbar  # assign to self
+        self.raw = raw
         self.theme_settings = self.THEME_SETTINGS.get(
             theme, self.THEME_SETTINGS["dark"]
         )
@@ -94,14 +103,27 @@ class Heatmap:
         self.apply_style()
 
     def process_data(self):
-        """Divide os valores por 100 para transformar de kWh para MWh."""
-        self.data_values = [[value / 100 for value in row] for row in self.data_values]
+        """Converte para float32 e divide por 100 para transformar de kWh para MWh."""
+        self.data_values = np.asarray(self.data_values, dtype=np.float32) / np.float32(
+            100
+        )
 
     def create_chart(self):
         """Cria o heatmap."""
-        self.fig = px.imshow(
+        labels = dict(x=self.xlabel, y=self.ylabel, color=f"Valor ({self.unit})")
+        if self.raw:
+            self._figure = heatmap_spec(
+                self.data_values,
+                self.x_labels,
+                self.y_labels,
+                self.color_scale,
+                labels,
+                text_auto=".2f",
+            )
+            return
+        self._figure = px.imshow(
             self.data_values,
-            labels=dict(x=self.xlabel, y=self.ylabel, color=f"Valor ({self.unit})"),
+            labels=labels,
             color_continuous_scale=self.color_scale,
             aspect="auto",
             text_auto=".2f",  # Mostra duas casas decimais
@@ -168,11 +190,11 @@ class Heatmap:
         }
 
         # Aplica as configurações
-        self.fig.update_layout(layout_config)
+        self._figure.update_layout(layout_config)
 
     def apply_style(self):
         """Aplica o estilo ao heatmap."""
-        self.fig.update_traces(
+        self._figure.update_traces(
             hovertemplate=f"<b>{self.xlabel}: %{{x}}<br>{self.ylabel}: %{{y}}<br>Valor: %{{z:.2f}} {self.unit}</b><extra></extra>"
         )
 
@@ -195,4 +217,4 @@ class Heatmap:
 
     def show(self):
         """Exibe o heatmap no Streamlit."""
-        st.plotly_chart(self.fig, use_container_width=True)
+        plotly_chart(self.fig, use_container_width=True)
@@ -0,0 +1,66 @@
+import numpy as np
+import plotly.graph_objects as go
+import streamlit as st
+
+from config.constants import ChartSettings
+
+# Atributos de dados dos traços convertidos em arrays tipados
+WIRE_ATTRIBUTES = ("x", "y", "z")
+
+
+def to_typed_array(values, float_dtype: str | None) -> np.ndarray | None:
+    """
+    Array NumPy numérico para `values`, ou None se não puder ser tipado.
+
+    Datas (datetime64) viram milissegundos desde a época em float64, que os
+    eixos de data do Plotly interpretam como datas.
+    """
+    array = values if isinstance(values, np.ndarray) else np.asarray(values)
+    if array.dtype.kind == "M":
+        return array.astype("datetime64[ms]").astype("float64")
+    if array.dtype.kind not in "iuf":
+        return None  # Textos e valores mistos seguem como estão
+    if array.dtype.kind == "f" and float_dtype:
+        array = array.astype(float_dtype, copy=False)
+    return array
+
+
+def wire_figure(
+    fig: go.Figure,
+    float_dtype: str | None = ChartSettings.WIRE_FLOAT_DTYPE,
+    min_points: int = ChartSettings.WIRE_MIN_POINTS,
+) -> go.Figure:
+    """
+    Prepara a figura para o envio ao navegador, alterando-a no lugar.
+
+    Valores numéricos e datas dos traços (x, y e z) com pelo menos
+    `min_points` itens viram arrays NumPy tipados, que o Plotly envia como
+    buffers binários em base64 em vez de números e datas em texto; os floats
+    são reduzidos a `float_dtype`. Com arrays, a validação que o
+    st.plotly_chart refaz na figura é vetorizada em vez de item a item.
+    """
+    for trace in fig.data:
+        for name in WIRE_ATTRIBUTES:
+            if name not in trace:
+                continue
+            values = trace[name]
+            if values is None or isinstance(values, (str, dict)):
+                continue  # Vazio ou já serializado (ex.: vindo do figure_cache)
+            if np.size(values) < min_points:
+                continue
+            values = values if isinstance(values, np.ndarray) else np.asarray(values)
+            array = to_typed_array(values, float_dtype)
+            if array is None or array is values:
+                continue
+            if values.dtype.kind == "M" and name != "z":
+                # Números não são lidos como datas: o eixo é declarado como data
+                axis = trace[f"{name}axis"] or name  # "x", "x2", ...
+                fig.layout[axis.replace(name, f"{name}axis", 1)].type = "date"
+            trace[name] = None  # Valores iguais não seriam substituídos
+            trace[name] = array
+    return fig
+
+
+def plotly_chart(fig: go.Figure, **kwargs):
+    """st.plotly_chart pelo caminho rápido de serialização (ver wire_figure)."""
+    return st.plotly_chart(wire_figure(fig), **kwargs)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from charts.raw import FigureSpec
+from config.constants import ChartSettings
+
+# Propriedades de go.Scatter que não existem em go.Scattergl
+SVG_ONLY = (
+    "alignmentgroup",
+    "cliponaxis",
+    "fillgradient",
+    "fillpattern",
+    "groupnorm",
+    "hoveron",
+    "offsetgroup",
+    "orientation",
+    "stackgaps",
+    "zorder",
+)
+
+
+def use_webgl(points: int, min_points: int | None = None) -> bool:
+    """
+    Indica se um gráfico com `points` pontos deve usar traços WebGL.
+
+    Traços SVG criam um elemento por ponto e ficam lentos para desenhar e
+    responder ao hover a partir de alguns milhares de pontos; os traços WebGL
+    (Scattergl) desenham tudo em um canvas. Abaixo do limite o SVG é mantido:
+    os navegadores limitam os contextos WebGL por página.
+
+    Args:
+        points: Total de pontos dos traços do gráfico.
+        min_points: Limite. None: ChartSettings.WEBGL_MIN_POINTS (que, se None,
+            desativa o WebGL).
+    """
+    limit = ChartSettings.WEBGL_MIN_POINTS if min_points is None else min_points
+    return limit is not None and points >= limit
+
+
+def to_webgl(fig: go.Figure | FigureSpec) -> go.Figure | FigureSpec:
+    """
+    Figura com os traços Scatter trocados por Scattergl, com o mesmo estilo.
+
+    Propriedades que só existem no SVG são descartadas. O empilhamento
+    (stackgroup, usado pelo px.area) não existe no WebGL: os valores de cada
+    grupo são somados aqui e preenchidos até o traço anterior ("tonexty"),
+    com o valor original de cada ponto em customdata para o hover. Uma
+    FigureSpec (modo raw) continua FigureSpec.
+    """
+    raw = isinstance(fig, FigureSpec)
+    traces = []
+    stacks: dict[str, pd.Series] = {}  # Topo atual de cada grupo, por x
+    for trace in fig.data:
+        props = dict(trace) if raw else trace.to_plotly_json()
+        if props.get("type", "scatter") != "scatter":
+            traces.append(trace)
+            continue
+        props.pop("type", None)
+        group = props.pop("stackgroup", None)
+        if group is not None and props.get("orientation", "v") == "v":
+            x = np.asarray(trace["x"])
+            y = np.nan_to_num(np.asarray(trace["y"], dtype=np.float64))
+            below = stacks.get(group)
+            base = 0.0 if below is None else below.reindex(x, fill_value=0).to_numpy()
+            # Valores de x repetidos no traço se somam, como no empilhamento
+            own = pd.Series(y, index=x).groupby(level=0).sum()
+            stacks[group] = own if below is None else below.add(own, fill_value=0)
+            props.update(
+                y=base + y,
+                customdata=y,
+                fill="tozeroy" if below is None else "tonexty",
+            )
+        if raw:
+            for name in SVG_ONLY:
+                props.pop(name, None)
+            traces.append({**props, "type": "scattergl"})
+        else:
+            traces.append(go.Scattergl(props, skip_invalid=True))
+    if raw:
+        return FigureSpec(traces, fig.layout)
+    return go.Figure(data=traces, layout=fig.layout)
@@ -10,6 +10,45 @@ class LocaleSettings:
 
 # --- Caminhos ---
 ICONS_DIR: Final[Path] = Path(__file__).parent / "../../assets/icons/"
+CACHE_DIR: Final[Path] = Path(__file__).parent / "../../.cache/datasets/"
+STORE_DIR: Final[Path] = Path(__file__).parent / "../../.cache/shared/"
+
+
+# --- Cache de dados ---
+class CacheSettings:
+    # Incrementar sempre que a normalização em load_data mudar (invalida o cache)
+    VERSION: Final[int] = 3
+    MAX_BYTES: Final[int] = 512 * 1024 * 1024  # 512 MB em disco
+    FILTER_MAX_BYTES: Final[int] = 64 * 1024 * 1024  # 64 MB em memória (filtros)
+    FIGURE_MAX_BYTES: Final[int] = 32 * 1024 * 1024  # 32 MB de figuras em JSON
+    SHARED_MAX_BYTES: Final[int] = 1024 * 1024 * 1024  # 1 GB mapeado entre sessões
+
+
+# --- Ingestão ---
+class IngestSettings:
+    CHUNK_ROWS: Final[int] = 250_000  # Linhas por bloco na leitura em streaming
+    STREAMING_MIN_BYTES: Final[int] = 200 * 1024 * 1024  # Ativa streaming > 200 MB
+    POLL_INTERVAL_S: Final[float] = 0.1  # Intervalo de atualização do progresso
+
+
+# --- Gráficos ---
+class ChartSettings:
+    # Tipo dos valores numéricos enviados ao navegador (None mantém float64)
+    WIRE_FLOAT_DTYPE: Final[str | None] = "float32"
+    WIRE_MIN_POINTS: Final[int] = 1_000  # Traços menores seguem sem conversão
+    # Séries de linha reduzidas a ~1 ponto por pixel (ver utils.downsampling)
+    DOWNSAMPLE_WIDTH_PX: Final[int] = 1_600  # Largura-alvo no layout "wide"
+    DOWNSAMPLE_METHOD: Final[Literal["lttb", "minmax"]] = "lttb"
+    # Gráficos de linha/área passam a WebGL a partir deste total de pontos
+    WEBGL_MIN_POINTS: Final[int | None] = 2_000  # None mantém sempre SVG
+    # Figuras montadas como dicionários, sem Plotly Express (ver charts.raw)
+    RAW_FIGURES: Final[bool] = True
+
+
+# --- Profiler ---
+class ProfilerSettings:
+    HISTORY_RUNS: Final[int] = 20  # Reruns mantidos no painel de Debug
+
 
 # --- Tipos ---
 IconName = Literal[
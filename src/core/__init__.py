@@ -0,0 +1,76 @@
+# Núcleo de cálculo sem interface: ingestão, agregação e métricas.
+#
+# Nada aqui importa Streamlit ou Plotly, então jobs em lote, notebooks e testes
+# podem usar o mesmo motor do dashboard sem pagar a importação da interface. O
+# app (utils.load_data, modules.home.charts/components/home_view) é um adaptador
+# fino sobre estas funções. O tempo de importação é medido por
+# benchmarks/bench_import_time.py.
+
+from modules.home.metrics import (
+    HomeMetrics,
+    aggregate_energy_by_year,
+    aggregate_energy_by_year_microinverter,
+    compute_home_metrics,
+    date_bounds,
+    energy_moments,
+    prepare_data_for_heatmap,
+    prepare_monthly_comparison_data,
+    prepare_year_production_data,
+)
+from utils.aggregates import (
+    MEASURE_COLUMNS,
+    ROLLUP_KEYS,
+    RollupCube,
+    aggregate_measures,
+    combine_measures,
+    get_cube,
+    is_rollup,
+)
+from utils.dataset_cache import DatasetCache, dataset_cache
+from utils.downsampling import downsample_frame, lttb_indices, minmax_indices
+from utils.ingest import (
+    IngestJob,
+    IngestProgress,
+    aggregate_stream,
+    load_frame,
+    load_rollup,
+    normalize_data,
+    parse_frame,
+    start_ingest,
+)
+from utils.row_index import RowIndex
+from utils.time_window import date_window
+
+__all__ = [
+    "MEASURE_COLUMNS",
+    "ROLLUP_KEYS",
+    "DatasetCache",
+    "HomeMetrics",
+    "IngestJob",
+    "IngestProgress",
+    "RollupCube",
+    "RowIndex",
+    "aggregate_energy_by_year",
+    "aggregate_energy_by_year_microinverter",
+    "aggregate_measures",
+    "aggregate_stream",
+    "combine_measures",
+    "compute_home_metrics",
+    "dataset_cache",
+    "date_bounds",
+    "date_window",
+    "downsample_frame",
+    "energy_moments",
+    "get_cube",
+    "is_rollup",
+    "load_frame",
+    "load_rollup",
+    "lttb_indices",
+    "minmax_indices",
+    "normalize_data",
+    "parse_frame",
+    "prepare_data_for_heatmap",
+    "prepare_monthly_comparison_data",
+    "prepare_year_production_data",
+    "start_ingest",
+]
@@ -1,4 +1,7 @@
+import logging
+
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
 from charts.bar_chart import BarChart
@@ -6,7 +9,10 @@ from charts.chart_area import AreaChart
 from charts.grouped_bar_chart import GroupedBarChart
 from charts.line_chart import LineChart
 from charts.safe_heatmap_chart import Heatmap
+from charts.serialization import plotly_chart
 from config.constants import Colors
+from utils.figure_cache import figure_cache, frame_digest
+from utils.profiler import profiled
 
 from .metrics import (
     aggregate_energy_by_year,
@@ -16,9 +22,8 @@ from .metrics import (
     clean_year_column,
     detect_significant_trends,
     filter_positive_energy,
+    format_year_range,
     get_month_names,
-    handle_heatmap_error,
-    handle_plot_error,
     prepare_data_for_heatmap,
     prepare_monthly_comparison_data,
     validate_columns,
@@ -28,10 +33,101 @@ from .visualization import (
     validate_heatmap_input,
 )
 
+# --- Tratamento de erros ---
+
+
+def handle_plot_error(error: Exception, raw_data: pd.DataFrame = None) -> None:
+    """
+    Tratamento padronizado para erros em gráficos.
+
+    Args:
+        error: Exceção capturada
+        raw_data: Dados originais para debug
+    """
+    st.error(f"Erro na geração do gráfico: {error!s}")
+    if raw_data is not None and not raw_data.empty:
+        st.warning("Visualização parcial dos dados recebidos:")
+        st.dataframe(raw_data.head(3))
+
+
+def handle_heatmap_error(error: Exception, data: pd.DataFrame | None = None) -> None:
+    """
+    Trata erros na geração do heatmap.
+
+    Args:
+        error: Exceção capturada
+        data: DataFrame original para debug (opcional)
+    """
+    st.error(f"Erro ao criar heatmap: {error!s}")
+    if data is not None and not data.empty:
+        st.warning("Dados recebidos (amostra):")
+        st.dataframe(data.head(3))
+
+
 # --- Gráficos ---
 
 
+def show_figure(fig: go.Figure) -> None:
+    """Exibe uma figura já montada, sem bordas nem padding no contêiner."""
+    st.markdown(
+        """
+        <style>
+            .stPlotlyChart {
+                border: none !important;
+                padding: 0 !important;
+            }
+        </style>
+        """,
+        unsafe_allow_html=True,
+    )
+    plotly_chart(fig, use_container_width=True)
+
+
 # Gráficos de energia gerada por ano
+@profiled()
+def build_energy_production_by_year(
+    df: pd.DataFrame, unit: str = "kWh"
+) -> go.Figure:
+    """
+    Monta a figura do total de energia gerada por ano, sem exibi-la.
+
+    Args:
+        df: DataFrame com dados de produção
+        unit: Unidade de medida (padrão: kWh)
+
+    Raises:
+        ValueError: Se faltarem as colunas Year e Energy.
+    """
+    # Validação e preparação dos dados (mantido em metrics.py)
+    validate_columns(df, {"Year", "Energy"})
+    yearly_data = aggregate_energy_by_year(df)
+
+    # Criação do gráfico usando funções de visualization.py
+    chart = BarChart(
+        data=yearly_data,
+        x_col="Year",
+        y_col="Energy",
+        color_scale=Colors.GREEN_SEQUENTIAL,
+        theme="dark",
+        unit="MWh",
+        xaxis_title=None,
+        yaxis_title=None,
+    )
+
+    # Obter os anos únicos para inserir no subtítulo
+    year_range = format_year_range(yearly_data["Year"])
+
+    # Personalização com subtítulo dinâmico
+    chart.set_titles(
+        title="Produção Energética Anual",
+        subtitle=f"Análise da geração de energia por ano ({year_range}), destacando a variação da produção ao longo dos anos.",
+        title_font={"size": 24, "color": "white"},
+        subtitle_font={"size": 12, "color": "#CCCCCC"},
+    ).apply_customizations(line_width=2, opacity=0.9)
+    return chart.fig
+
+
+@profiled()
 def plot_energy_production_by_year(df: pd.DataFrame, unit: str = "kWh") -> None:
     """
     Exibe o total de energia gerada por ano com design aprimorado.
@@ -41,45 +137,13 @@ def plot_energy_production_by_year(df: pd.DataFrame, unit: str = "kWh") -> None:
         unit: Unidade de medida (padrão: kWh)
     """
     try:
-        # Validação e preparação dos dados (mantido em metrics.py)
-        validate_columns(df, {"Year", "Energy"})
-        yearly_data = aggregate_energy_by_year(df)
-
-        # Criação do gráfico usando funções de visualization.py
-        chart = BarChart(
-            data=yearly_data,
-            x_col="Year",
-            y_col="Energy",
-            color_scale=Colors.GREEN_SEQUENTIAL,
-            theme="dark",
-            unit="MWh",
-            xaxis_title=None,
-            yaxis_title=None,
-        )
-
-        # Obter os anos únicos para inserir no subtítulo
-        years = sorted(yearly_data["Year"].unique())  # Ordena os anos
-        year_range = (
-            f"{years[0]}-{years[-1]}" if len(years) > 1 else f"{years[0]}"
-        )  # Intervalo de anos
-
-        # Personalização e exibição com subtítulo dinâmico
-        (
-            chart.set_titles(
-                title="Produção Energética Anual",
-                subtitle=f"Análise da geração de energia por ano ({year_range}), destacando a variação da produção ao longo dos anos.",
-                title_font={"size": 24, "color": "white"},
-                subtitle_font={"size": 12, "color": "#CCCCCC"},
-            )
-            .apply_customizations(line_width=2, opacity=0.9)
-            .show()
-        )
-
+        show_figure(build_energy_production_by_year(df, unit))
     except Exception as e:
         handle_plot_error(e, df)
 
 
 # Gráficos de energia gerada por ano
+@profiled()
 def plot_energy_trend_by_year(df) -> None:
     """Exibe um gráfico de área comparativo dos meses por ano"""
 
@@ -122,90 +186,92 @@ def plot_energy_trend_by_year(df) -> None:
 
 
 # Grafico de linhas comparativo
-def plot_line_comparison_by_year(df) -> None:
-    """Exibe gráfico de linhas comparativo com análises de tendência aprimorado"""
-    try:
-        # Processamento de dados
-        monthly_data = prepare_monthly_comparison_data(df)
-        month_names = get_month_names()
-        calculate_yearly_averages(monthly_data)
-        detect_significant_trends(monthly_data)
-
-        # Obter os anos únicos para inserir no subtítulo
-        years = sorted(monthly_data["Year"].unique())  # Ordena os anos
-        year_range = (
-            f"{years[0]}-{years[-1]}" if len(years) > 1 else f"{years[0]}"
-        )  # Intervalo de anos
-
-        # Criação do gráfico usando a nova função
-        chart = (
-            LineChart(
-                data=monthly_data,
-                x_col="Month",
-                y_col="Energy",
-                color_col="Year",
-                colors=Colors.LINE_COLORS,
-                period_mapping=month_names,
-                theme="dark",
-                xlabel=None,
-                ylabel=None,
-            )
-            .set_titles(
-                title="Análise de Produção de Energia",
-                subtitle=f"Comparação da geração de energia por ano e mês ({year_range}), destacando os picos de produção por ano.",
-            )
-            .apply_style(line_width=3, marker_size=10, opacity=0.9)
-            .add_peaks_per_group()
+@profiled()
+def build_line_comparison_by_year(df: pd.DataFrame) -> go.Figure:
+    """Monta o gráfico de linhas comparativo por ano e mês, sem exibi-lo."""
+    # Processamento de dados
+    monthly_data = prepare_monthly_comparison_data(df)
+    month_names = get_month_names()
+    calculate_yearly_averages(monthly_data)
+    detect_significant_trends(monthly_data)
+
+    # Obter os anos únicos para inserir no subtítulo
+    year_range = format_year_range(monthly_data["Year"])
+
+    # Criação do gráfico usando a nova função
+    chart = (
+        LineChart(
+            data=monthly_data,
+            x_col="Month",
+            y_col="Energy",
+            color_col="Year",
+            colors=Colors.LINE_COLORS,
+            period_mapping=month_names,
+            theme="dark",
+            xlabel=None,
+            ylabel=None,
+        )
+        .set_titles(
+            title="Análise de Produção de Energia",
+            subtitle=f"Comparação da geração de energia por ano e mês ({year_range}), destacando os picos de produção por ano.",
         )
+        .apply_style(line_width=3, marker_size=10, opacity=0.9)
+        .add_peaks_per_group()
+    )
+    return chart.fig
 
-        chart.show()
 
+@profiled()
+def plot_line_comparison_by_year(df) -> None:
+    """Exibe gráfico de linhas comparativo com análises de tendência aprimorado"""
+    try:
+        show_figure(build_line_comparison_by_year(df))
     except Exception as e:
         handle_plot_error(e, df)
 
 
 # Gráfico de barras agrupadas
+@profiled()
+def build_microinverter_year_barchart(data: pd.DataFrame) -> go.Figure:
+    """Monta o gráfico de barras agrupadas por ano e microinversor."""
+    # Validação e pré-processamento
+    validate_columns(data, {"Microinversor", "Year", "Energy"})
+    df = clean_year_column(data)
+    df = filter_positive_energy(df)
+    df_agg = aggregate_energy_by_year_microinverter(df)
+
+    # Adiciona customdata para tooltips
+    df_agg["Microinversor"] = df_agg["Microinversor"].astype(str)
+
+    # Dividir os valores de energia por 100 para exibir em MWh
+    df_agg["Energy"] = df_agg["Energy"] / 100
+
+    # Obter os anos únicos para inserir no subtítulo
+    year_range = format_year_range(df_agg["Year"])
+
+    # Construção do gráfico
+    chart = GroupedBarChart(
+        title="Produção Anual por Microinversor",
+        subtitle=f"Comparativo da geração de energia entre microinversores nos anos de ({year_range}), com destaque para a média anual consolidada.",
+        data=df_agg,
+        x_col="Year",
+        y_col="Energy",
+        color_col="Microinversor",
+        colors=Colors.GREEN_DISCRETE,
+        theme="dark",
+        ylabel=None,
+        xlabel=None,
+        legend_title="Microinversor",
+        height=500,
+    )
+    return chart.fig
+
+
+@profiled()
 def plot_microinverter_year_barchart(data):
     """Exibe gráfico de barras agrupadas com anotações de pico e médias"""
     try:
-        # Validação e pré-processamento
-        validate_columns(data, {"Microinversor", "Year", "Energy"})
-        df = clean_year_column(data)
-        df = filter_positive_energy(df)
-        df_agg = aggregate_energy_by_year_microinverter(df)
-
-        # Adiciona customdata para tooltips
-        df_agg["Microinversor"] = df_agg["Microinversor"].astype(str)
-
-        # Dividir os valores de energia por 100 para exibir em MWh
-        df_agg["Energy"] = df_agg["Energy"] / 100
-
-        # Obter os anos únicos para inserir no subtítulo
-        monthly_data = prepare_monthly_comparison_data(df)
-        years = sorted(monthly_data["Year"].unique())  # Ordena os anos
-        year_range = (
-            f"{years[0]}-{years[-1]}" if len(years) > 1 else f"{years[0]}"
-        )  # Intervalo de anos
-
-        # Construção do gráfico
-        chart = GroupedBarChart(
-            title="Produção Anual por Microinversor",
-            subtitle=f"Comparativo da geração de energia entre microinversores nos anos de ({year_range}), com destaque para a média anual consolidada.",
-            data=df_agg,
-            x_col="Year",
-            y_col="Energy",
-            color_col="Microinversor",
-            colors=Colors.GREEN_DISCRETE,
-            theme="dark",
-            ylabel=None,
-            xlabel=None,
-            legend_title="Microinversor",
-            height=500,
-        )
-
-        fig = chart.fig
-
-        return fig
+        return build_microinverter_year_barchart(data)
 
     except Exception as e:
         handle_plot_error(e, data)
@@ -264,56 +330,103 @@ def plot_microinverter_year_barchart(data):
 
 
 # Gráfico de energia gerada por microinversor
+@profiled()
+def build_energy_heatmap_by_microinverter(data: pd.DataFrame) -> go.Figure:
+    """Monta o heatmap de energia por microinversor e ano, sem exibi-lo."""
+    # Validação e processamento
+    validate_heatmap_input(data)
+    df_agg = prepare_data_for_heatmap(data)
+    years = process_heatmap_years(df_agg.columns)
+
+    # Cálculo de altura com fallback
+    try:
+        calculate_heatmap_height(df_agg)
+    except Exception as e:
+        logging.warning(f"Heatmap com altura padrão: {e}")
+
+    # Obter os anos únicos para inserir no subtítulo
+    year_range = format_year_range(years)
+
+    # Criação e configuração do heatmap
+    heatmap = Heatmap(
+        data_values=df_agg.to_numpy(dtype="float32"),
+        x_labels=years,
+        y_labels=df_agg.index.tolist(),
+        color_scale=Colors.GREEN_SEQUENTIAL,
+        theme="dark",
+        title="Distribuição de Energia por Microinversor ao Longo dos Anos",
+        subtitle=f"Análise da produção de energia anual dos microinversores com produção superior a 0 kWh, de ({year_range}).",
+        xlabel=None,
+        ylabel=None,
+        height=450,
+        title_font={"size": 24, "color": "white"},
+        subtitle_font={"size": 16, "color": "#CCCCCC"},
+        margin=dict(l=30, r=145, t=90, b=30),
+    )
+    return heatmap.fig
+
+
+@profiled()
 def plot_energy_heatmap_by_microinverter(data):
     """
     Cria um heatmap com anos inteiros no eixo X e melhor legibilidade.
     Versão refatorada usando funções externalizadas.
     """
     try:
-        # Validação e processamento
-        validate_heatmap_input(data)
-        df_agg = prepare_data_for_heatmap(data)
-        years = process_heatmap_years(df_agg.columns)
-
-        # Cálculo de altura com fallback
-        try:
-            calculate_heatmap_height(df_agg)
-        except Exception as e:
-            st.warning(f"Usando altura padrão: {e}")
-
-        # Obter os anos únicos para inserir no subtítulo
-        monthly_data = prepare_monthly_comparison_data(data)
-        years = sorted(monthly_data["Year"].unique())  # Ordena os anos
-        year_range = (
-            f"{years[0]}-{years[-1]}" if len(years) > 1 else f"{years[0]}"
-        )  # Intervalo de anos
-
-        # Criação e configuração do heatmap
-        heatmap = Heatmap(
-            data_values=df_agg.values.tolist(),
-            x_labels=years,
-            y_labels=df_agg.index.tolist(),
-            color_scale=Colors.GREEN_SEQUENTIAL,
-            theme="dark",
-            title="Distribuição de Energia por Microinversor ao Longo dos Anos",
-            subtitle=f"Análise da produção de energia anual dos microinversores com produção superior a 0 kWh, de ({year_range}).",
-            xlabel=None,
-            ylabel=None,
-            height=450,
-            title_font={"size": 24, "color": "white"},
-            subtitle_font={"size": 16, "color": "#CCCCCC"},
-            margin=dict(l=30, r=145, t=90, b=30),
-        )
-
-        # Exibição do heatmap
-        fig = heatmap.fig
-        return fig
+        return build_energy_heatmap_by_microinverter(data)
 
     except Exception as e:
         handle_heatmap_error(e, data)
         return None
 
 
+# --- Registro de figuras da Home ---
+
+
+class FigureRegistry:
+    """Figuras da Home para um conjunto de dados filtrado, montadas sob demanda.
+
+    Cada figura é obtida no primeiro get() e reaproveitada pelas seções
+    seguintes (as abas da Home compartilham o gráfico de barras agrupadas e o
+    heatmap); figuras que nenhuma seção pede, como as de abas fechadas, não
+    são montadas. As figuras vêm do figure_cache, então os mesmos dados
+    filtrados (em qualquer sessão) não remontam o gráfico. Erros de montagem
+    são guardados e devolvidos no lugar da figura, para que cada seção os
+    exiba à sua maneira.
+    """
+
+    BUILDERS = {
+        "production": build_energy_production_by_year,
+        "comparison": build_line_comparison_by_year,
+        "barchart": build_microinverter_year_barchart,
+        "heatmap": build_energy_heatmap_by_microinverter,
+    }
+
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self._digest: str | None = None
+        self._figures: dict[str, go.Figure | Exception] = {}
+
+    def get(self, name: str) -> go.Figure | Exception:
+        """Devolve a figura `name` (ou o erro da montagem), montando-a uma vez."""
+        if name not in self._figures:
+            try:
+                if self._digest is None:  # Um hash dos dados para todas as figuras
+                    self._digest = frame_digest(self.data)
+                self._figures[name] = figure_cache.get_or_build(
+                    self.BUILDERS[name], self.data, digest=self._digest
+                )
+            except Exception as e:
+                self._figures[name] = e
+        return self._figures[name]
+
+    @property
+    def built(self) -> list[str]:
+        """Nomes das figuras já montadas, na ordem de montagem."""
+        return list(self._figures)
+
+
+@profiled()
 def plot_grafico_area_empilhada(data):
 
     pass
@@ -12,14 +12,17 @@ from config.constants import (
     SystemFactors,
 )
 from utils.helpers import load_icon_as_base64
+from utils.profiler import profiled
 
 from .metrics import (
+    HomeMetrics,
     alculate_current_year_energy,
     calculate_coefficient_of_variation,
     calculate_current_month_energy,
     calculate_efficiency,
     calculate_energy_std_dev,
     calculate_total_energy,
+    date_bounds,
 )
 
 
@@ -280,9 +283,9 @@ def display_efficiency_card(data: pd.DataFrame):
 
 # --- Cards de informações gerais ---
 #  Card de energia gerada no mês atual
-def card_info_energy_month(data: pd.DataFrame, tariff_kwh=None):
-    # Calcula as métricas
-    current_month_energy = calculate_current_month_energy(data)
+@profiled()
+def card_info_energy_month(metrics: HomeMetrics, tariff_kwh=None):
+    current_month_energy = metrics.current_month_energy
 
     # Usa o valor padrão da tarifa se não for fornecido
     if tariff_kwh is None:
@@ -311,9 +314,9 @@ def card_info_energy_month(data: pd.DataFrame, tariff_kwh=None):
 
 
 # Card de energia gerada no ano atual
-def card_info_energy_year(data: pd.DataFrame, tariff_kwh=None):
-    # Calcula as métricas
-    current_year_energy_mwh = alculate_current_year_energy(data)
+@profiled()
+def card_info_energy_year(metrics: HomeMetrics, tariff_kwh=None):
+    current_year_energy_mwh = metrics.current_year_energy
 
     # Usa o valor padrão da tarifa se não for fornecido
     if tariff_kwh is None:
@@ -342,9 +345,9 @@ def card_info_energy_year(data: pd.DataFrame, tariff_kwh=None):
 
 
 # Card de energia gerada total
-def card_info_energy_total(data: pd.DataFrame, tariff_kwh=None):
-    # Calcula as métricas
-    total_energy_mwh = calculate_total_energy(data)
+@profiled()
+def card_info_energy_total(metrics: HomeMetrics, tariff_kwh=None):
+    total_energy_mwh = metrics.total_energy
 
     # Usa o valor padrão da tarifa se não for fornecido
     if tariff_kwh is None:
@@ -373,9 +376,10 @@ def card_info_energy_total(data: pd.DataFrame, tariff_kwh=None):
 
 
 # --- Cards de informações impacto ambiental ---
-def card_info_raw_coal_saved(data: pd.DataFrame):
+@profiled()
+def card_info_raw_coal_saved(metrics: HomeMetrics):
     # Calcula a energia total em MWh
-    total_energy_mwh = data["Energy"].sum() / 1000  # Converte kWh para MWh
+    total_energy_mwh = metrics.total_energy / 1000  # Converte kWh para MWh
 
     # Calcula o carvão bruto economizado
     raw_coal_saved = total_energy_mwh * EnergyFactors.COAL_SAVED_PER_MWH
@@ -393,11 +397,10 @@ def card_info_raw_coal_saved(data: pd.DataFrame):
     )
 
 
-def card_info_co2(data: pd.DataFrame):
-
+@profiled()
+def card_info_co2(metrics: HomeMetrics):
     # Calcula as métricas
-    total_energy = data["Energy"].sum()
-    co2_reduced = (total_energy * EnergyFactors.CO2_KG_PER_KWH) / 1000
+    co2_reduced = (metrics.total_energy * EnergyFactors.CO2_KG_PER_KWH) / 1000
 
     # Renderiza o card
     card_info_2(
@@ -412,10 +415,10 @@ def card_info_co2(data: pd.DataFrame):
     )
 
 
-def card_info_tree(data: pd.DataFrame):
+@profiled()
+def card_info_tree(metrics: HomeMetrics):
     # Calcula as métricas
-    total_energy = data["Energy"].sum()
-    trees_equivalent = total_energy * EnergyFactors.TREES_PER_KG_CO2
+    trees_equivalent = metrics.total_energy * EnergyFactors.TREES_PER_KG_CO2
 
     # Renderiza o card
     card_info_2(
@@ -432,9 +435,9 @@ def card_info_tree(data: pd.DataFrame):
 
 # --- Cards de informações desvio padrão | eficiência ---
 # Card de desvio padrão
-def card_info_std_dev(data: pd.DataFrame):
-    # Calcula as métricas
-    energy_std_dev = calculate_energy_std_dev(data)
+@profiled()
+def card_info_std_dev(metrics: HomeMetrics):
+    energy_std_dev = metrics.std_dev
 
     # Renderiza o card
     card_info_2(
@@ -464,8 +467,9 @@ def calculate_energy_efficiency(data: pd.DataFrame):
     total_energy = data["Energy"].sum()  # Energia total gerada em kWh
 
     # Calcula o número de dias no período analisado
-    if "Date" in data.columns:
-        num_days = (data["Date"].max() - data["Date"].min()).days + 1
+    if "Date" in data.columns or "Date_min" in data.columns:
+        start_date, end_date = date_bounds(data)
+        num_days = (end_date - start_date).days + 1
     else:
         raise ValueError("A coluna 'Date' é necessária para calcular o período.")
 
@@ -481,9 +485,9 @@ def calculate_energy_efficiency(data: pd.DataFrame):
 
 
 # Card de Eficiência Média
-def card_info_average_efficiency(data: pd.DataFrame):
-    # Calcula as métricas
-    efficiency = calculate_energy_efficiency(data)
+@profiled()
+def card_info_average_efficiency(metrics: HomeMetrics):
+    efficiency = metrics.efficiency
 
     # Renderiza o card
     card_info_2(
@@ -500,9 +504,9 @@ def card_info_average_efficiency(data: pd.DataFrame):
 
 
 #  Card decoeficiente de variação
-def card_info_coefficient_of_variation(data: pd.DataFrame):
-    # Calcula as métricas
-    coefficient_of_variation = calculate_coefficient_of_variation(data)
+@profiled()
+def card_info_coefficient_of_variation(metrics: HomeMetrics):
+    coefficient_of_variation = metrics.coefficient_of_variation
 
     # Renderiza o card
     card_info_2(
@@ -519,9 +523,9 @@ def card_info_coefficient_of_variation(data: pd.DataFrame):
 
 # --- Cards de informações gerais do sistema ---
 # Card de registros
-def card_info_records(data: pd.DataFrame):
-    # Calcula as métricas
-    num_records = data.shape[0]
+@profiled()
+def card_info_records(metrics: HomeMetrics):
+    num_records = metrics.records
 
     # Renderiza o card
     card_info_2(
@@ -538,9 +542,9 @@ def card_info_records(data: pd.DataFrame):
 
 
 # Card de microinversores ativos
-def card_info_microinverters(data: pd.DataFrame):
-    # Calcula as métricas
-    num_microinverters = data["Microinversor"].nunique()
+@profiled()
+def card_info_microinverters(metrics: HomeMetrics):
+    num_microinverters = metrics.microinverters
 
     # Renderiza o card
     card_info_2(
@@ -557,10 +561,9 @@ def card_info_microinverters(data: pd.DataFrame):
 
 
 # Card de períodos analisados
-def card_info_period(data: pd.DataFrame):
-    # Calcula as métricas
-    start_date = data["Date"].min()
-    end_date = data["Date"].max()
+@profiled()
+def card_info_period(metrics: HomeMetrics):
+    start_date, end_date = metrics.start_date, metrics.end_date
     period = f"{start_date.strftime('%d/%m/%Y')} a {end_date.strftime('%d/%m/%Y')}"
 
     # Renderiza o card
@@ -1,13 +1,20 @@
+from collections.abc import Callable, Hashable
+from typing import TypeVar
+
 import pandas as pd
+import plotly.graph_objects as go
 import streamlit as st
 
+from charts.serialization import plotly_chart
 from config.styles import setup_shared_styles
+from utils.aggregates import ROLLUP_KEYS, RollupCube, filter_cache, get_cube
+from utils.profiler import profiled
 
 from .charts import (
-    plot_energy_heatmap_by_microinverter,
-    plot_energy_production_by_year,
-    plot_line_comparison_by_year,
-    plot_microinverter_year_barchart,
+    FigureRegistry,
+    handle_heatmap_error,
+    handle_plot_error,
+    show_figure,
 )
 from .components import (
     card_info_average_efficiency,
@@ -23,58 +30,123 @@ from .components import (
     card_info_std_dev,
     card_info_tree,
 )
+from .metrics import aggregate_energy_by_year_microinverter, compute_home_metrics
+
+T = TypeVar("T")
+
+
+def section_result(section: str, inputs: Hashable | None, compute: Callable[[], T]) -> T:
+    """
+    Resultado de uma seção da Home, recalculado só quando suas entradas mudam.
+
+    Reruns que não alteram as entradas da seção (widgets de outras seções ou de
+    outras partes do app) reaproveitam o resultado guardado na sessão; apenas o
+    último resultado de cada seção é mantido. Com `inputs` None o resultado é
+    sempre recalculado.
+    """
+    results = st.session_state.setdefault("home_sections", {})
+    cached = results.get(section)
+    if inputs is None or cached is None or cached[0] != inputs:
+        cached = results[section] = (inputs, compute())
+    return cached[1]
 
 
 class HomeView:
+    """Dashboard da Home.
+
+    Os filtros da barra lateral valem para a página toda; cada seção (cards,
+    abas de gráficos) é um fragmento do Streamlit que recebe os dados filtrados
+    e a chave dos filtros. Widgets de uma seção reexecutam só o fragmento dela,
+    e nos demais reruns as seções cujas entradas não mudaram reaproveitam
+    métricas e figuras (ver section_result). As abas compartilham um
+    FigureRegistry e só a aba aberta é executada, então cada figura é montada
+    no máximo uma vez por consulta e apenas quando exibida. A latência por
+    tipo de interação é medida por benchmarks/bench_home_interactions.py.
+    """
+
     def __init__(self):
         """Configura estilos compartilhados para a página."""
         setup_shared_styles()
 
     def display(self, data: pd.DataFrame):
         """Método principal para exibir o dashboard."""
-        self._render_sidebar(data)
-        filtered_data = self._apply_filters(data)
-        self._render_dashboard(filtered_data)
+        cube = get_cube(data)
+        self._render_sidebar(cube)
+        filtered_data = self._apply_filters(cube)
+        self._render_dashboard(filtered_data, self._filter_key(cube))
 
-    def _render_sidebar(self, data: pd.DataFrame):
+    def _render_sidebar(self, cube: RollupCube):
         """Renderiza a barra lateral com filtros."""
+        by_microinverter = cube.cuboid(ROLLUP_KEYS)
+        min_year = int(by_microinverter["Year"].min())
+        max_year = int(by_microinverter["Year"].max())
+        microinverters = by_microinverter["Microinversor"].unique()
+
         with st.sidebar:
             st.header("⚙️ Filtros")
             self.year_range = st.slider(
                 "Selecione o intervalo de anos:",
-                min_value=int(data["Year"].min()),
-                max_value=int(data["Year"].max()),
-                value=(int(data["Year"].min()), int(data["Year"].max())),
+                min_value=min_year,
+                max_value=max_year,
+                value=(min_year, max_year),
             )
             self.microinverters = st.multiselect(
                 "Selecione os microinversores:",
-                options=data["Microinversor"].unique(),
-                default=data["Microinversor"].unique()[:4],
+                options=microinverters,
+                default=microinverters[:4],
             )
             self.show_zeros = st.checkbox("Mostrar valores zero", False)
-            self.show_details = st.checkbox("Mostrar detalhes técnicos", False)
 
-    def _apply_filters(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Aplica os filtros selecionados na barra lateral."""
-        return data[
-            (data["Year"].between(*self.year_range))
-            & (data["Microinversor"].isin(self.microinverters))
-            & ((data["Energy"] > 0) if not self.show_zeros else True)
-        ]
+    def _filter_key(self, cube: RollupCube) -> tuple | None:
+        """Identifica a consulta atual; None se o conjunto não tiver fingerprint."""
+        if cube.fingerprint is None:
+            return None
+        return (
+            cube.fingerprint,
+            tuple(self.year_range),
+            tuple(sorted(self.microinverters)),  # A ordem da seleção não importa
+            self.show_zeros,
+        )
+
+    @profiled()
+    def _apply_filters(self, cube: RollupCube) -> pd.DataFrame:
+        """Consulta o cubo com os filtros selecionados na barra lateral.
+
+        O resultado fica na granularidade (usina, microinversor, ano, mês), que é
+        a usada por todos os cards e gráficos da página. Consultas repetidas são
+        servidas por utils.aggregates.filter_cache.
+        """
+
+        def query() -> pd.DataFrame:
+            return cube.query(
+                ROLLUP_KEYS,
+                year_range=self.year_range,
+                microinverters=self.microinverters,
+                show_zeros=self.show_zeros,
+            )
 
-    def _render_dashboard(self, data: pd.DataFrame):
+        key = self._filter_key(cube)
+        if key is None:
+            return query()
+        return filter_cache.get_or_compute(key, query)
+
+    def _render_dashboard(self, data: pd.DataFrame, inputs: tuple | None = None):
         """Renderiza o conteúdo principal do dashboard."""
         st.title("🌿 Dashboard de Eficiência Energética")
-        self._display_metric_cards(data)
+        self._display_metric_cards(data, inputs)
         # self._display_kpi_cards(data)
         st.divider()
-        self._display_main_visualizations(data)
+        self._display_main_visualizations(data, inputs)
         st.caption(
             f"Última atualização: {pd.Timestamp.now().strftime('%d/%m/%Y %H:%M')}"
         )
 
-    def _display_metric_cards(self, data: pd.DataFrame):
+    @st.fragment
+    def _display_metric_cards(self, data: pd.DataFrame, inputs: tuple | None):
         """Exibe os cards de receita e impacto ambiental."""
+        # Mês e ano "atuais" dos cards: a data de referência entra na chave
+        key = None if inputs is None else (inputs, pd.Timestamp.now().to_period("M"))
+        metrics = section_result("cards", key, lambda: compute_home_metrics(data))
         col1, col2, col3, col4 = st.columns(4)
         with col1:
             # display_system_overview_card(data)
@@ -82,60 +154,79 @@ class HomeView:
             # display_total_energy_card(data)
             # display_environmental_card(data)
             # display_efficiency_card(data)
-            card_info_period(data)
-            card_info_records(data)
-            card_info_microinverters(data)
+            card_info_period(metrics)
+            card_info_records(metrics)
+            card_info_microinverters(metrics)
 
         with col2:
-            card_info_energy_month(data)
-            card_info_energy_year(data)
-            card_info_energy_total(data)
+            card_info_energy_month(metrics)
+            card_info_energy_year(metrics)
+            card_info_energy_total(metrics)
 
         with col3:
-            card_info_std_dev(data)
-            card_info_average_efficiency(data)
-            card_info_coefficient_of_variation(data)
+            card_info_std_dev(metrics)
+            card_info_average_efficiency(metrics)
+            card_info_coefficient_of_variation(metrics)
         with col4:
-            card_info_raw_coal_saved(data)
-            card_info_co2(data)
-            card_info_tree(data)
-
-    def _display_main_visualizations(self, data: pd.DataFrame):
-        """Exibe as visualizações principais."""
-        tab1, tab2 = st.tabs(["📅 Visão Anual", "🔍 Análise Detalhada"])
-        with tab1:
-            self._display_yearly_overview(data)
-        with tab2:
-            self._display_microinverter_analysis(data)
-
-    def _display_yearly_overview(self, data: pd.DataFrame):
+            card_info_raw_coal_saved(metrics)
+            card_info_co2(metrics)
+            card_info_tree(metrics)
+
+    @st.fragment
+    def _display_main_visualizations(self, data: pd.DataFrame, inputs: tuple | None):
+        """Exibe as visualizações principais (apenas a seção escolhida é executada)."""
+        figures = section_result("figures", inputs, lambda: FigureRegistry(data))
+        # st.tabs executa o conteúdo de todas as abas; com o seletor só a seção
+        # escolhida monta suas figuras, e trocar de seção reexecuta só o fragmento
+        sections = ["📅 Visão Anual", "🔍 Análise Detalhada"]
+        section = (
+            st.segmented_control(
+                "Seção",
+                sections,
+                default=sections[0],
+                key="home_tabs",
+                label_visibility="collapsed",
+            )
+            or sections[0]  # Nenhuma seleção: volta à primeira
+        )
+        if section == sections[0]:
+            self._display_yearly_overview(figures)
+        else:
+            self._display_microinverter_analysis(figures, inputs)
+
+    def _display_yearly_overview(self, figures: FigureRegistry):
         """Exibe gráficos de evolução anual."""
+        data = figures.data
         col1, col2 = st.columns(2)
         with col1:
-            plot_energy_production_by_year(data)
+            self._show_figure(figures.get("production"), data)
         with col2:
             # plot_energy_trend_by_year(data)
 
-            plot_line_comparison_by_year(data)
+            self._show_figure(figures.get("comparison"), data)
 
         st.divider()
 
         col1, col2 = st.columns(2)
         with col1:
-            fig_barchart = plot_microinverter_year_barchart(data)
-            if fig_barchart:
-                st.plotly_chart(fig_barchart, use_container_width=True)
-            else:
-                st.warning("Não foi possível gerar o gráfico de barras agrupadas.")
+            self._show_figure(
+                figures.get("barchart"),
+                data,
+                fallback="Não foi possível gerar o gráfico de barras agrupadas.",
+            )
         with col2:
-            ig_heatmap = plot_energy_heatmap_by_microinverter(data)
-            if ig_heatmap:
-                st.plotly_chart(ig_heatmap, use_container_width=True)
-            else:
-                st.warning("Não foi possível gerar o gráfico de calor.")
+            self._show_figure(
+                figures.get("heatmap"),
+                data,
+                on_error=handle_heatmap_error,
+                fallback="Não foi possível gerar o gráfico de calor.",
+            )
 
-    def _display_microinverter_analysis(self, data: pd.DataFrame):
+    def _display_microinverter_analysis(
+        self, figures: FigureRegistry, inputs: tuple | None
+    ):
         """Exibe análise detalhada por microinversor."""
+        data = figures.data
         if data.empty:
             st.warning("Nenhum dado disponível com os filtros atuais")
             return
@@ -149,24 +240,50 @@ class HomeView:
             return
 
         # Gráfico de barras agrupadas
-        try:
-            fig_barchart = plot_microinverter_year_barchart(data)
-            if fig_barchart:
-                st.plotly_chart(fig_barchart, use_container_width=True)
-            else:
-                st.warning("Não foi possível gerar o gráfico de barras agrupadas.")
-        except Exception as e:
-            st.error(f"Erro ao gerar o gráfico de barras agrupadas: {e}")
+        fig_barchart = figures.get("barchart")
+        if isinstance(fig_barchart, Exception):
+            st.error(f"Erro ao gerar o gráfico de barras agrupadas: {fig_barchart}")
+        else:
+            plotly_chart(
+                fig_barchart,
+                use_container_width=True,
+                key="microinverter_analysis_barchart",  # Mesma figura da Visão Anual
+            )
 
         # Heatmap de energia
-        try:
-            fig_heatmap = plot_energy_heatmap_by_microinverter(data)
-            if fig_heatmap:
-                st.plotly_chart(fig_heatmap, use_container_width=True)
-            else:
-                st.warning("Não foi possível gerar o heatmap.")
-        except Exception as e:
-            st.error(f"Erro ao gerar o heatmap: {e}")
+        fig_heatmap = figures.get("heatmap")
+        if isinstance(fig_heatmap, Exception):
+            st.error(f"Erro ao gerar o heatmap: {fig_heatmap}")
+        else:
+            plotly_chart(
+                fig_heatmap,
+                use_container_width=True,
+                key="microinverter_analysis_heatmap",
+            )
+
+        # Widget da própria seção: reexecuta apenas este fragmento
+        if st.checkbox("Mostrar detalhes técnicos", False, key="home_show_details"):
+            details = section_result(
+                "microinverter_details",
+                inputs,
+                lambda: aggregate_energy_by_year_microinverter(data),
+            )
+            st.dataframe(details, hide_index=True)
+
+    @staticmethod
+    def _show_figure(
+        figure: go.Figure | Exception,
+        data: pd.DataFrame,
+        on_error: Callable = handle_plot_error,
+        fallback: str | None = None,
+    ):
+        """Exibe a figura montada ou o erro da montagem (e o aviso, se houver)."""
+        if isinstance(figure, Exception):
+            on_error(figure, data)
+            if fallback:
+                st.warning(fallback)
+        else:
+            show_figure(figure)
 
     # def display_efficiency_card(self, data: pd.DataFrame):
     #     """Exibe o card de desvio padrão, eficiência e coeficiente de variação."""
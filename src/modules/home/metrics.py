@@ -1,13 +1,83 @@
 import logging
+from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
-import streamlit as st
 
-from config.constants import Colors
+from config.constants import Colors, SystemFactors
+from utils.aggregates import is_rollup
+from utils.profiler import profiled
+from utils.time_window import date_window
 
 logging.basicConfig(level=logging.INFO)
 
 
+# Conta os registros (linhas brutas ou medidas pré-agregadas)
+def count_records(data: pd.DataFrame) -> int:
+    """
+    Conta os registros originais representados pelo DataFrame.
+
+    Args:
+        data (pd.DataFrame): Linhas brutas ou tabela pré-agregada com 'Records'.
+
+    Returns:
+        int: Número de registros.
+    """
+    if is_rollup(data):
+        return int(data["Records"].sum())
+    return len(data)
+
+
+# Obtém contagem, soma e soma dos quadrados da energia
+def energy_moments(data: pd.DataFrame) -> tuple[int, float, float]:
+    """
+    Calcula os momentos da energia usados em média e desvio padrão.
+
+    Args:
+        data (pd.DataFrame): Linhas brutas ou tabela pré-agregada.
+
+    Returns:
+        tuple: (número de registros, soma, soma dos quadrados).
+    """
+    if is_rollup(data):
+        return count_records(data), data["Energy"].sum(), data["Energy_sq"].sum()
+    energy = data["Energy"]
+    return len(energy), energy.sum(), (energy * energy).sum()
+
+
+# Obtém a primeira e a última data dos registros
+def date_bounds(data: pd.DataFrame) -> tuple[pd.Timestamp, pd.Timestamp]:
+    """
+    Retorna o intervalo de datas coberto pelos dados.
+
+    Args:
+        data (pd.DataFrame): Linhas brutas com 'Date' ou tabela pré-agregada.
+
+    Returns:
+        tuple: (data inicial, data final).
+    """
+    if is_rollup(data):
+        return data["Date_min"].min(), data["Date_max"].max()
+    return data["Date"].min(), data["Date"].max()
+
+
+# Seleciona as linhas do ano ou do mês de referência
+def current_year_window(
+    data: pd.DataFrame, reference_date: pd.Timestamp
+) -> pd.DataFrame:
+    """Linhas do ano de `reference_date` (fatia por busca binária)."""
+    year = reference_date.year
+    return date_window(data, pd.Timestamp(year, 1, 1), pd.Timestamp(year, 12, 31))
+
+
+def current_month_window(
+    data: pd.DataFrame, reference_date: pd.Timestamp
+) -> pd.DataFrame:
+    """Linhas do mês de `reference_date` (fatia por busca binária)."""
+    month_start = pd.Timestamp(reference_date.year, reference_date.month, 1)
+    return date_window(data, month_start, month_start + pd.offsets.MonthEnd(0))
+
+
 # Calcula o desvio padrão
 def calculate_energy_std_dev(data: pd.DataFrame) -> float:
     """
@@ -19,7 +89,15 @@ def calculate_energy_std_dev(data: pd.DataFrame) -> float:
     Returns:
         float: Desvio padrão da energia gerada.
     """
-    return data["Energy"].std()
+    if not is_rollup(data):
+        return data["Energy"].std()
+
+    # Desvio padrão amostral recomposto a partir dos momentos agregados
+    n, total, total_sq = energy_moments(data)
+    if n < 2:
+        return float("nan")
+    variance = (total_sq - total * total / n) / (n - 1)
+    return max(variance, 0.0) ** 0.5
 
 
 # Calcula a eficiência média
@@ -62,8 +140,9 @@ def calculate_coefficient_of_variation(data: pd.DataFrame) -> float:
     Returns:
         float: Coeficiente de variação (em porcentagem).
     """
-    mean_energy = data["Energy"].mean()
-    std_dev = data["Energy"].std()
+    n, total, _ = energy_moments(data)
+    mean_energy = total / n if n else 0
+    std_dev = calculate_energy_std_dev(data)
     return (std_dev / mean_energy) * 100 if mean_energy > 0 else 0
 
 
@@ -82,10 +161,7 @@ def calculate_current_month_energy(data: pd.DataFrame) -> float:
     if not required_columns.issubset(data.columns):
         raise ValueError(f"O DataFrame deve conter as colunas {required_columns}.")
 
-    current_year, current_month = pd.Timestamp.now().year, pd.Timestamp.now().month
-    filtered_data = data[
-        (data["Year"] == current_year) & (data["Month"] == current_month)
-    ]
+    filtered_data = current_month_window(data, pd.Timestamp.now())
 
     if filtered_data.empty:
         return 0.0  # Retorna 0 se não houver dados para o mês atual
@@ -108,8 +184,7 @@ def alculate_current_year_energy(data: pd.DataFrame) -> float:
     if not required_columns.issubset(data.columns):
         raise ValueError(f"O DataFrame deve conter as colunas {required_columns}.")
 
-    current_year = pd.Timestamp.now().year
-    filtered_data_kwh = data[data["Year"] == current_year]
+    filtered_data_kwh = current_year_window(data, pd.Timestamp.now())
 
     if filtered_data_kwh.empty:
         return 0.0  # Retorna 0 se não houver dados para o ano atual
@@ -126,6 +201,97 @@ def calculate_total_energy(data: pd.DataFrame) -> float:
     return total_energy_kwh
 
 
+def _count_distinct(values: pd.Series) -> int:
+    """nunique() que, em colunas categóricas, conta os códigos presentes."""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes.to_numpy()
+        return int(np.count_nonzero(np.bincount(codes[codes >= 0])))
+    return values.nunique()
+
+
+@dataclass(frozen=True)
+class HomeMetrics:
+    """Valores exibidos nos cards da Home, calculados por compute_home_metrics."""
+
+    records: int
+    microinverters: int
+    start_date: pd.Timestamp
+    end_date: pd.Timestamp
+    total_energy: float
+    current_month_energy: float
+    current_year_energy: float
+    std_dev: float
+    coefficient_of_variation: float
+    efficiency: float
+
+
+# Calcula todas as métricas dos cards em uma única passada
+@profiled()
+def compute_home_metrics(
+    data: pd.DataFrame, reference_date: pd.Timestamp | None = None
+) -> HomeMetrics:
+    """
+    Calcula as métricas de todos os cards da Home de uma só vez.
+
+    As colunas são extraídas uma única vez como arrays NumPy e cada medida é
+    obtida com operações vetorizadas sobre eles, em vez de cada card refazer
+    sua própria passada sobre o DataFrame. Mês e ano atuais são fatias por
+    busca binária (ver utils.time_window.date_window).
+
+    Args:
+        data (pd.DataFrame): Linhas brutas ou tabela pré-agregada (consulta ao cubo).
+        reference_date (pd.Timestamp, opcional): Data usada para "mês atual" e
+            "ano atual". Padrão: agora.
+
+    Returns:
+        HomeMetrics: Valores prontos para formatação nos cards.
+
+    Raises:
+        ValueError: Se alguma coluna necessária estiver ausente.
+    """
+    validate_columns(data, {"Energy", "Year", "Month", "Microinversor"})
+    reference_date = reference_date or pd.Timestamp.now()
+
+    energy = data["Energy"].to_numpy(dtype="float64")
+    year_energy = current_year_window(data, reference_date)["Energy"]
+    month_energy = current_month_window(data, reference_date)["Energy"]
+
+    total = energy.sum()
+    if is_rollup(data):
+        records = int(data["Records"].sum())
+        total_sq = data["Energy_sq"].sum()
+        variance = (total_sq - total * total / records) if records else 0.0
+        start_date, end_date = data["Date_min"].min(), data["Date_max"].max()
+    else:
+        records = len(energy)
+        deviation = energy - total / records if records else energy
+        variance = np.dot(deviation, deviation)
+        start_date, end_date = data["Date"].min(), data["Date"].max()
+
+    # Desvio padrão amostral (mesma convenção de pd.Series.std)
+    std_dev = (
+        max(variance, 0.0) / (records - 1)
+    ) ** 0.5 if records > 1 else float("nan")
+    mean_energy = total / records if records else 0
+    num_days = (end_date - start_date).days + 1
+    max_capacity = num_days * SystemFactors.SYSTEM_CAPACITY_KW * 24
+
+    return HomeMetrics(
+        records=records,
+        microinverters=_count_distinct(data["Microinversor"]),
+        start_date=start_date,
+        end_date=end_date,
+        total_energy=total,
+        current_month_energy=month_energy.to_numpy(dtype="float64").sum(),
+        current_year_energy=year_energy.to_numpy(dtype="float64").sum(),
+        std_dev=std_dev,
+        coefficient_of_variation=(
+            (std_dev / mean_energy) * 100 if mean_energy > 0 else 0
+        ),
+        efficiency=(total / max_capacity) * 100 if max_capacity > 0 else 0,
+    )
+
+
 # Valida se o DataFrame contém as colunas necessárias
 def validate_columns(data: pd.DataFrame, required_columns: set):
     """
@@ -163,7 +329,9 @@ def prepare_data_for_heatmap(data: pd.DataFrame) -> pd.DataFrame:
     df["Year"] = pd.to_numeric(df["Year"], errors="coerce").dropna().astype(int)
 
     # Agregação
-    df_agg = df.groupby(["Microinversor", "Year"])["Energy"].sum().unstack()
+    df_agg = (
+        df.groupby(["Microinversor", "Year"], observed=True)["Energy"].sum().unstack()
+    )
 
     return df_agg
 
@@ -293,7 +461,7 @@ def aggregate_energy_by_year_microinverter(data: pd.DataFrame) -> pd.DataFrame:
         DataFrame agregado e ordenado
     """
     return (
-        data.groupby(["Year", "Microinversor"], as_index=False)["Energy"]
+        data.groupby(["Year", "Microinversor"], as_index=False, observed=True)["Energy"]
         .sum()
         .sort_values(["Year", "Microinversor"])
     )
@@ -340,6 +508,20 @@ def get_month_names() -> dict:
     }
 
 
+def format_year_range(years) -> str:
+    """
+    Formata o intervalo de anos exibido nos subtítulos dos gráficos.
+
+    Args:
+        years: Anos presentes nos dados (qualquer ordem, com repetições).
+
+    Returns:
+        'AAAA-AAAA' para vários anos ou 'AAAA' para um único ano.
+    """
+    years = sorted(pd.unique(pd.Series(years)))
+    return f"{years[0]}-{years[-1]}" if len(years) > 1 else f"{years[0]}"
+
+
 def calculate_yearly_averages(monthly_data: pd.DataFrame) -> dict:
     """
     Calcula médias anuais para adicionar como linhas de referência.
@@ -394,34 +576,6 @@ def prepare_year_production_data(df: pd.DataFrame) -> tuple[pd.DataFrame, list]:
     return df_agg, colors
 
 
-def handle_plot_error(error: Exception, raw_data: pd.DataFrame = None) -> None:
-    """
-    Tratamento padronizado para erros em gráficos.
-
-    Args:
-        error: Exceção capturada
-        raw_data: Dados originais para debug
-    """
-    st.error(f"Erro na geração do gráfico: {error!s}")
-    if raw_data is not None and not raw_data.empty:
-        st.warning("Visualização parcial dos dados recebidos:")
-        st.dataframe(raw_data.head(3))
-
-
-def handle_heatmap_error(error: Exception, data: pd.DataFrame | None = None) -> None:
-    """
-    Trata erros na geração do heatmap.
-
-    Args:
-        error: Exceção capturada
-        data: DataFrame original para debug (opcional)
-    """
-    st.error(f"Erro ao criar heatmap: {error!s}")
-    if data is not None and not data.empty:
-        st.warning("Dados recebidos (amostra):")
-        st.dataframe(data.head(3))
-
-
 def create_title_config(
     main_title: str, subtitle: str, title_font: dict, subtitle_font: dict
 ) -> dict:
@@ -2,6 +2,8 @@ import pandas as pd
 import plotly.express as px
 from plotly import graph_objects as go
 
+from charts.overlays import OverlayLayer
+
 
 def apply_bar_chart_defaults(fig, xlabel: str, ylabel: str) -> None:
     """
@@ -41,16 +43,18 @@ def add_average_lines(
         colors: Lista de cores
         x_range: Tuple (x0, x1) para extensão da linha
     """
-    for i, (year, avg) in enumerate(averages.items()):
-        fig.add_shape(
-            type="line",
-            x0=x_range[0],
-            y0=avg,
-            x1=x_range[1],
-            y1=avg,
-            line=dict(color=colors[i % len(colors)], width=1.5, dash="dash"),
-            opacity=0.7,
-        )
+    OverlayLayer().add_shapes(
+        type="line",
+        x0=x_range[0],
+        y0=list(averages.values()),
+        x1=x_range[1],
+        y1=list(averages.values()),
+        line=[
+            dict(color=colors[i % len(colors)], width=1.5, dash="dash")
+            for i in range(len(averages))
+        ],
+        opacity=0.7,
+    ).commit(fig)
 
 
 def add_trend_annotations(
@@ -66,16 +70,19 @@ def add_trend_annotations(
         x_pos: Posição X da anotação
         x_shift: Deslocamento horizontal
     """
-    for year, (trend_value, color) in trends.items():
-        year_data = data[data["Year"] == year]
-        fig.add_annotation(
-            x=x_pos,
-            y=year_data["Energy"].iloc[-1],
-            text=f"{'↑' if trend_value > 0 else '↓'} {abs(trend_value):.0f} kWh",
-            showarrow=False,
-            font=dict(color=color, size=12),
-            xshift=x_shift,
-        )
+    # Último valor de cada ano, de uma vez (a última linha de cada ano)
+    last = data.drop_duplicates("Year", keep="last").set_index("Year")["Energy"]
+    OverlayLayer().add_annotations(
+        x=x_pos,
+        y=last.reindex(list(trends)).to_numpy(),
+        text=[
+            f"{'↑' if value > 0 else '↓'} {abs(value):.0f} kWh"
+            for value, _ in trends.values()
+        ],
+        showarrow=False,
+        font=[dict(color=color, size=12) for _, color in trends.values()],
+        xshift=x_shift,
+    ).commit(fig)
 
 
 def validate_heatmap_input(data: pd.DataFrame) -> None:
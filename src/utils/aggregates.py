@@ -0,0 +1,261 @@
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from config.constants import CacheSettings
+from utils.lru_cache import LRUCache
+from utils.row_index import RowIndex
+from utils.time_window import date_window, sort_by_period
+
+# Granularidade das tabelas pré-agregadas usadas pelo dashboard
+ROLLUP_KEYS = ["Plant Name", "Microinversor", "Year", "Month"]
+
+# Dimensões do cubo construído a partir das linhas brutas
+CUBE_KEYS = ["Plant Name", "Microinversor", "SN", "Port", "Year", "Month", "Day"]
+
+# Medidas mantidas por grupo. Soma e soma dos quadrados permitem recompor média e
+# desvio padrão sem voltar às linhas originais; as versões "_pos" consideram
+# apenas registros com energia positiva (filtro "Mostrar valores zero").
+MEASURE_COLUMNS = [
+    "Energy",
+    "Energy_sq",
+    "Records",
+    "Records_pos",
+    "Date_min",
+    "Date_max",
+    "Date_min_pos",
+    "Date_max_pos",
+]
+
+CUBE_CACHE_SIZE = 4  # Cubos mantidos em memória (um por conjunto de dados)
+
+
+def is_rollup(data: pd.DataFrame) -> bool:
+    """Indica se o DataFrame contém medidas pré-agregadas em vez de linhas brutas."""
+    return "Records" in data.columns
+
+
+def _available_keys(df: pd.DataFrame, keys: list[str]) -> list[str]:
+    return [key for key in keys if key in df.columns]
+
+
+def aggregate_measures(df: pd.DataFrame, keys: list[str] = None) -> pd.DataFrame:
+    """
+    Reduz linhas brutas às medidas agregadas por grupo.
+
+    Args:
+        df: DataFrame normalizado contendo 'Date', 'Energy' e as colunas-chave.
+        keys: Colunas de agrupamento. Padrão: ROLLUP_KEYS.
+
+    Returns:
+        pd.DataFrame: Uma linha por grupo com as colunas de MEASURE_COLUMNS.
+    """
+    keys = _available_keys(df, keys or ROLLUP_KEYS)
+    energy = df["Energy"].astype("float64")  # Acumula em float64 (a coluna é float32)
+    positive = energy > 0
+    work = df[keys].assign(
+        Energy=energy,
+        Energy_sq=energy * energy,
+        Positive=positive,
+        Date=df["Date"],
+        Date_pos=df["Date"].where(positive),
+    )
+    return (
+        work.groupby(keys, observed=True, sort=False)
+        .agg(
+            Energy=("Energy", "sum"),
+            Energy_sq=("Energy_sq", "sum"),
+            Records=("Energy", "size"),
+            Records_pos=("Positive", "sum"),
+            Date_min=("Date", "min"),
+            Date_max=("Date", "max"),
+            Date_min_pos=("Date_pos", "min"),
+            Date_max_pos=("Date_pos", "max"),
+        )
+        .reset_index()
+    )
+
+
+def combine_measures(
+    partials: list[pd.DataFrame], keys: list[str] = None
+) -> pd.DataFrame:
+    """
+    Combina tabelas parciais de medidas (por exemplo, de blocos de um CSV).
+
+    Args:
+        partials: Tabelas geradas por aggregate_measures.
+        keys: Colunas de agrupamento. Padrão: ROLLUP_KEYS.
+
+    Returns:
+        pd.DataFrame: Tabela única com as medidas combinadas por grupo.
+    """
+    merged = pd.concat(partials, ignore_index=True)
+    keys = _available_keys(merged, keys or ROLLUP_KEYS)
+    return (
+        merged.groupby(keys, observed=True, sort=False)
+        .agg(
+            Energy=("Energy", "sum"),
+            Energy_sq=("Energy_sq", "sum"),
+            Records=("Records", "sum"),
+            Records_pos=("Records_pos", "sum"),
+            Date_min=("Date_min", "min"),
+            Date_max=("Date_max", "max"),
+            Date_min_pos=("Date_min_pos", "min"),
+            Date_max_pos=("Date_max_pos", "max"),
+        )
+        .reset_index()
+    )
+
+
+class RollupCube:
+    """
+    Cubo de medidas de energia calculado uma vez por conjunto de dados.
+
+    As dimensões são CUBE_KEYS quando a origem são linhas brutas, ou ROLLUP_KEYS
+    quando a origem já é a tabela agregada da leitura em streaming. Cada
+    combinação de dimensões (cuboide) é materializada na primeira consulta e
+    reaproveitada depois, sempre a partir do menor cuboide já calculado que a
+    contenha. As consultas filtram cada cuboide por um RowIndex próprio.
+    """
+
+    def __init__(self, source: pd.DataFrame):
+        self.source = source
+        self.fingerprint = source.attrs.get("fingerprint")
+        self.is_aggregated = is_rollup(source)
+        self.dimensions = _available_keys(
+            source, ROLLUP_KEYS if self.is_aggregated else CUBE_KEYS
+        )
+        self._cuboids: dict[tuple[str, ...], pd.DataFrame] = {}
+        self._indexes: dict[tuple[str, ...], RowIndex] = {}
+
+    def cuboid(self, dims: list[str]) -> pd.DataFrame:
+        """
+        Retorna as medidas agregadas pelas dimensões informadas.
+
+        Args:
+            dims: Dimensões desejadas (subconjunto de self.dimensions).
+
+        Returns:
+            pd.DataFrame: Uma linha por combinação das dimensões.
+
+        Raises:
+            ValueError: Se alguma dimensão não existir no cubo.
+        """
+        key = self._key(dims)
+        if key not in self._cuboids:
+            self._cuboids[key] = self._materialize(list(key))
+        return self._cuboids[key]
+
+    def index(self, dims: list[str]) -> RowIndex:
+        """Retorna o índice de linhas do cuboide, construído no primeiro uso."""
+        key = self._key(dims)
+        if key not in self._indexes:
+            self._indexes[key] = RowIndex(self.cuboid(dims), order_by="Year")
+        return self._indexes[key]
+
+    def _key(self, dims: list[str]) -> tuple[str, ...]:
+        missing = set(dims) - set(self.dimensions)
+        if missing:
+            raise ValueError(f"Dimensões ausentes no cubo: {missing}")
+        return tuple(dim for dim in self.dimensions if dim in dims)
+
+    def _materialize(self, dims: list[str]) -> pd.DataFrame:
+        parents = [
+            table
+            for parent_key, table in self._cuboids.items()
+            if set(dims) <= set(parent_key)
+        ]
+        if parents:
+            table = combine_measures([min(parents, key=len)], dims)
+        elif self.is_aggregated:
+            table = combine_measures([self.source], dims)
+        else:
+            table = aggregate_measures(self.source, dims)
+        return sort_by_period(table)  # Permite fatiar por ano/mês com busca binária
+
+    def query(
+        self,
+        dims: list[str],
+        year_range: tuple[int, int] | None = None,
+        microinverters: list[str] | None = None,
+        show_zeros: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Consulta o cubo aplicando os filtros do dashboard.
+
+        Args:
+            dims: Dimensões do resultado.
+            year_range: Intervalo de anos (inclusivo) ou None para todos.
+            microinverters: Microinversores selecionados ou None para todos.
+            show_zeros: Se False, contagens e datas consideram só energia > 0.
+
+        Returns:
+            pd.DataFrame: Medidas agregadas por `dims` após os filtros.
+        """
+        filter_dims = []
+        if year_range is not None:
+            filter_dims.append("Year")
+        if microinverters is not None:
+            filter_dims.append("Microinversor")
+
+        table = self.cuboid([*dims, *filter_dims])
+        if microinverters is not None:
+            mask = self.index([*dims, *filter_dims]).select(
+                {"Microinversor": microinverters}, between=year_range
+            )
+            table = table[mask]
+        elif year_range is not None:
+            # Cuboide ordenado por período: fatia sem cópia
+            first_year, last_year = year_range
+            table = date_window(
+                table,
+                pd.Timestamp(first_year, 1, 1),
+                pd.Timestamp(last_year, 12, 31),
+            )
+
+        if not show_zeros:
+            table = table[table["Records_pos"] > 0].assign(
+                Records=lambda t: t["Records_pos"],
+                Date_min=lambda t: t["Date_min_pos"],
+                Date_max=lambda t: t["Date_max_pos"],
+            )
+
+        if not set(filter_dims) <= set(dims):
+            table = sort_by_period(combine_measures([table], dims))
+        return table
+
+
+# Resultados de consultas filtradas, compartilhados entre sessões e conjuntos
+filter_cache = LRUCache(CacheSettings.FILTER_MAX_BYTES)
+
+_cubes: OrderedDict[str, RollupCube] = OrderedDict()
+_cubes_lock = threading.Lock()
+
+
+def get_cube(data: pd.DataFrame) -> RollupCube:
+    """
+    Retorna o cubo do conjunto de dados, construindo-o apenas na primeira vez.
+
+    O cubo é identificado por data.attrs["fingerprint"] (definido pelos
+    carregadores em utils.ingest). Sem essa identificação, um cubo novo é
+    criado a cada chamada.
+    """
+    key = data.attrs.get("fingerprint")
+    if key is None:
+        return RollupCube(data)
+
+    with _cubes_lock:
+        cube = _cubes.get(key)
+        if cube is None:
+            cube = _cubes[key] = RollupCube(data)
+        _cubes.move_to_end(key)
+        while len(_cubes) > CUBE_CACHE_SIZE:
+            _cubes.popitem(last=False)
+    return cube
+
+
+def discard_cube(fingerprint: str) -> None:
+    """Descarta o cubo de um conjunto de dados removido da memória."""
+    with _cubes_lock:
+        _cubes.pop(fingerprint, None)
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import os
+import uuid
+from pathlib import Path
+
+import pandas as pd
+
+from config.constants import CACHE_DIR, CacheSettings
+
+
+class DatasetCache:
+    """Cache em disco (Parquet) dos DataFrames já normalizados.
+
+    Cada arquivo é identificado pela impressão digital dos bytes enviados, de
+    modo que o mesmo export carregado novamente é lido direto do Parquet, com as
+    colunas derivadas já calculadas. O tamanho total é limitado por
+    ``max_bytes``: ao exceder, os arquivos menos usados recentemente são
+    removidos.
+    """
+
+    SUFFIX = ".parquet"
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        max_bytes: int = CacheSettings.MAX_BYTES,
+        version: int = CacheSettings.VERSION,
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.version = version
+
+    def fingerprint(self, raw: bytes) -> str:
+        """Gera a chave do cache a partir do conteúdo do arquivo."""
+        digest = hashlib.blake2b(raw, digest_size=16)
+        digest.update(f"v{self.version}".encode())
+        return digest.hexdigest()
+
+    def fingerprint_stream(self, handle, block_size: int = 1024 * 1024) -> str:
+        """Mesma chave de fingerprint(), lendo o arquivo binário em blocos."""
+        digest = hashlib.blake2b(digest_size=16)
+        while block := handle.read(block_size):
+            digest.update(block)
+        digest.update(f"v{self.version}".encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def _entries(self) -> list[Path]:
+        if not self.cache_dir.is_dir():
+            return []
+        return list(self.cache_dir.glob(f"*{self.SUFFIX}"))
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Retorna o DataFrame em cache ou None se não existir."""
+        path = self._path(key)
+        if not path.is_file():
+            return None
+
+        try:
+            df = pd.read_parquet(path)
+        except Exception as e:
+            logging.warning(f"Cache corrompido removido ({path.name}): {e}")
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)  # Marca como usado recentemente (política LRU)
+        return df
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        """Grava o DataFrame no cache e aplica a política de remoção."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+
+        try:
+            df.to_parquet(tmp_path, index=False)
+            tmp_path.replace(path)  # Escrita atômica
+        except Exception as e:
+            logging.warning(f"Não foi possível gravar o cache ({path.name}): {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        self._evict()
+
+    def invalidate(self, key: str | None = None) -> int:
+        """
+        Remove entradas do cache.
+
+        Args:
+            key: Chave a remover. Se None, remove todo o cache.
+
+        Returns:
+            int: Quantidade de arquivos removidos.
+        """
+        paths = [self._path(key)] if key else self._entries()
+        removed = 0
+        for path in paths:
+            if path.is_file():
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+    def stats(self) -> dict:
+        """Retorna o número de entradas e o espaço ocupado em disco."""
+        entries = self._entries()
+        return {
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for path in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def _evict(self) -> None:
+        """Remove os arquivos menos usados até respeitar o limite de tamanho."""
+        entries = sorted(self._entries(), key=lambda path: path.stat().st_mtime)
+        total = sum(path.stat().st_size for path in entries)
+
+        # Mantém sempre a entrada mais recente, mesmo que sozinha exceda o limite
+        for path in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+
+
+dataset_cache = DatasetCache()
@@ -0,0 +1,199 @@
+import logging
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+
+from config.constants import STORE_DIR, CacheSettings
+from utils.aggregates import discard_cube
+
+
+@dataclass
+class _Entry:
+    frame: pd.DataFrame
+    nbytes: int
+    path: Path | None
+    refs: int = 0
+
+
+@dataclass(eq=False)
+class DatasetHandle:
+    """Referência de uma sessão a um conjunto de dados do DatasetStore.
+
+    A sessão guarda apenas o handle (em st.session_state); o DataFrame é obtido
+    por ``frame`` e é o mesmo objeto para todas as sessões. A referência é
+    liberada por ``release()`` ou quando o handle é coletado junto com a sessão.
+    """
+
+    key: str
+    store: "DatasetStore"
+    _finalizer: weakref.finalize = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self._finalizer = weakref.finalize(self, self.store.release, self.key)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame compartilhado (somente leitura nas colunas mapeadas)."""
+        return self.store.get(self.key)
+
+    def release(self) -> None:
+        """Libera a referência; chamadas repetidas não têm efeito."""
+        self._finalizer()
+
+
+class DatasetStore:
+    """Conjuntos de dados carregados, compartilhados entre as sessões do processo.
+
+    Cada conjunto é gravado uma vez em ``store_dir`` no formato Arrow IPC sem
+    compressão e lido de volta por memory-map: as colunas numéricas e de datas
+    apontam direto para o arquivo mapeado, de modo que N sessões vendo o mesmo
+    export custam uma cópia dos dados (e as páginas podem ser devolvidas ao
+    sistema operacional). As sessões seguram um DatasetHandle, que conta
+    referências; conjuntos sem referências ficam disponíveis para reuso até que
+    o total ultrapasse ``max_bytes``, quando os usados há mais tempo são
+    removidos (com seus arquivos e cubos).
+    """
+
+    SUFFIX = ".arrow"
+
+    def __init__(
+        self,
+        store_dir: Path = STORE_DIR,
+        max_bytes: int = CacheSettings.SHARED_MAX_BYTES,
+    ):
+        self.store_dir = Path(store_dir)
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Registra o conjunto de dados e retorna a versão compartilhada.
+
+        O conjunto é identificado por df.attrs["fingerprint"]. Se já estiver
+        registrado, a cópia existente é retornada e `df` pode ser descartado.
+        Se o arquivo Arrow não puder ser gravado, o próprio `df` é compartilhado.
+
+        Raises:
+            ValueError: Se o DataFrame não tiver fingerprint.
+        """
+        return self._register(df, refs=0)[1].frame
+
+    def acquire(self, df: pd.DataFrame) -> DatasetHandle:
+        """Registra o conjunto, se preciso, e cria um handle para a sessão."""
+        key, _ = self._register(df, refs=1)
+        return DatasetHandle(key, self)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        """Retorna o conjunto compartilhado (marcando-o como recente) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry.frame
+
+    def release(self, key: str) -> None:
+        """Decrementa a contagem de referências e aplica a política de remoção."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            entry.refs = max(entry.refs - 1, 0)
+            evicted = self._evict()
+        self._discard(evicted)
+
+    def clear(self) -> int:
+        """Remove os conjuntos sem referências; retorna quantos foram removidos."""
+        with self._lock:
+            evicted = [
+                (key, self._entries.pop(key))
+                for key, entry in list(self._entries.items())
+                if entry.refs == 0
+            ]
+        self._discard(evicted)
+        return len(evicted)
+
+    def stats(self) -> dict:
+        """Retorna conjuntos, referências, bytes ocupados e orçamento."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "refs": sum(entry.refs for entry in self._entries.values()),
+                "bytes": sum(entry.nbytes for entry in self._entries.values()),
+                "max_bytes": self.max_bytes,
+            }
+
+    def _register(self, df: pd.DataFrame, refs: int) -> tuple[str, _Entry]:
+        """Insere o conjunto (se ausente) e soma `refs` referências, atomicamente."""
+        key = df.attrs.get("fingerprint")
+        if key is None:
+            raise ValueError("O DataFrame não tem attrs['fingerprint']")
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.refs += refs
+                self._entries.move_to_end(key)
+                return key, entry
+
+        mapped = self._map(key, df)  # Fora do lock: grava o arquivo
+        with self._lock:
+            # Outra sessão pode ter registrado o mesmo conjunto enquanto gravávamos
+            entry = self._entries.setdefault(key, mapped)
+            entry.refs += refs
+            self._entries.move_to_end(key)
+            evicted = self._evict()
+        self._discard(evicted)
+        return key, entry
+
+    def _map(self, key: str, df: pd.DataFrame) -> _Entry:
+        """Grava o conjunto em Arrow IPC e o lê de volta por memory-map."""
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        path = self.store_dir / f"{key.replace(':', '-')}{self.SUFFIX}"
+        tmp_path = path.with_name(f".{uuid.uuid4().hex}.tmp")
+
+        try:
+            table = pa.Table.from_pandas(df)
+            with pa.OSFile(str(tmp_path), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            tmp_path.replace(path)  # Escrita atômica
+
+            mapped = pa.ipc.open_file(pa.memory_map(str(path))).read_all()
+            frame = mapped.to_pandas(split_blocks=True)  # Colunas sem cópia
+            frame.attrs.update(df.attrs)
+            return _Entry(frame, mapped.nbytes, path)
+        except Exception as e:
+            logging.warning(f"Conjunto compartilhado sem memory-map ({key}): {e}")
+            tmp_path.unlink(missing_ok=True)
+            return _Entry(df, int(df.memory_usage(index=True, deep=True).sum()), None)
+
+    def _evict(self) -> list[tuple[str, _Entry]]:
+        """Retira (sob o lock) os conjuntos sem referências que excedem o limite."""
+        total = sum(entry.nbytes for entry in self._entries.values())
+        evicted = []
+        # Mantém sempre o conjunto mais recente, mesmo que sozinho exceda o limite
+        for key, entry in list(self._entries.items())[:-1]:
+            if total <= self.max_bytes:
+                break
+            if entry.refs == 0:
+                evicted.append((key, self._entries.pop(key)))
+                total -= entry.nbytes
+        return evicted
+
+    def _discard(self, evicted: list[tuple[str, _Entry]]) -> None:
+        """Remove arquivos e cubos dos conjuntos retirados, fora do lock."""
+        for key, entry in evicted:
+            discard_cube(key)
+            if entry.path is not None:
+                entry.path.unlink(missing_ok=True)  # O mapeamento segue válido
+
+
+dataset_store = DatasetStore()
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+
+from utils.schema import apply_schema, month_year_code
+
+DATE_PART_COLUMNS = ["Day", "Month", "Year", "Month_Year", "Week"]
+
+
+def build_date_dimension(dates: pd.DatetimeIndex) -> pd.DataFrame:
+    """
+    Calcula as partes de data para um conjunto de datas distintas.
+
+    Args:
+        dates: Datas únicas.
+
+    Returns:
+        pd.DataFrame: Uma linha por data com Day, Month, Year, Month_Year e Week.
+    """
+    year = pd.Series(dates.year)
+    month = pd.Series(dates.month)
+    return pd.DataFrame({
+        "Day": dates.day,
+        "Month": month,
+        "Year": year,
+        "Month_Year": month_year_code(year, month),
+        "Week": dates.isocalendar().week.to_numpy(),
+    })
+
+
+def derive_date_parts(dates: pd.Series) -> pd.DataFrame:
+    """
+    Deriva as colunas de data calculando cada valor uma única vez por data.
+
+    Os exports têm milhões de linhas mas poucos milhares de datas distintas, então
+    as partes são calculadas sobre as datas únicas (dimensão de datas) e depois
+    replicadas para as linhas pelos códigos inteiros de pd.factorize.
+
+    Args:
+        dates: Série datetime64 com a data de cada linha.
+
+    Returns:
+        pd.DataFrame: Colunas de DATE_PART_COLUMNS alinhadas ao índice de `dates`.
+    """
+    codes, uniques = pd.factorize(dates)
+    dimension = build_date_dimension(pd.DatetimeIndex(uniques))
+
+    # Datas nulas recebem o código -1, que aponta para uma linha final vazia
+    if (codes < 0).any():
+        dimension.loc[len(dimension)] = np.nan
+    else:
+        dimension = apply_schema(dimension)  # Tipos compactos antes de replicar
+
+    return pd.DataFrame(
+        {column: dimension[column].to_numpy()[codes] for column in DATE_PART_COLUMNS},
+        index=dates.index,
+    )
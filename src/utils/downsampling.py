@@ -0,0 +1,207 @@
+import numpy as np
+import pandas as pd
+
+from config.constants import ChartSettings
+
+DOWNSAMPLE_METHODS = ("lttb", "minmax")
+
+
+def _segments(n: int, starts) -> tuple[np.ndarray, np.ndarray]:
+    """Inícios e tamanhos das séries consecutivas que começam em `starts`."""
+    starts = np.zeros(1, np.int64) if starts is None else np.asarray(starts, np.int64)
+    return starts, np.diff(np.append(starts, n))
+
+
+def lttb_indices(
+    x: np.ndarray, y: np.ndarray, n_out: int, starts=None
+) -> np.ndarray:
+    """
+    Posições dos pontos escolhidos pelo Largest-Triangle-Three-Buckets.
+
+    O primeiro e o último ponto são mantidos; os demais são divididos em
+    `n_out - 2` faixas consecutivas e, em cada faixa, fica o ponto que forma o
+    maior triângulo com o ponto escolhido na faixa anterior e a média da faixa
+    seguinte. Assim picos e mudanças de tendência sobrevivem à redução. Valores
+    nulos (em x ou y) contam como zero na escolha, mas são devolvidos como estão.
+
+    Várias séries podem ser reduzidas de uma vez, concatenadas em `x` e `y`:
+    o laço sobre as faixas é feito uma vez para todas, com as séries em
+    paralelo (uma linha de matriz por série).
+
+    Args:
+        x: Posições no eixo x (numéricas), na ordem em que a linha é traçada.
+        y: Valores da série.
+        n_out: Número de pontos desejado por série.
+        starts: Início de cada série em `x`/`y` (crescente). None: série única.
+
+    Returns:
+        np.ndarray: Posições crescentes em `x`/`y` (todas as de uma série que
+        já couber).
+    """
+    n = len(y)
+    starts, lengths = _segments(n, starts)
+    if n_out < 3:
+        return np.arange(n)
+    long = lengths > n_out
+    if not long.any():
+        return np.arange(n)
+
+    x = np.nan_to_num(np.asarray(x, dtype=np.float64))
+    x = x - x.min()  # Somas acumuladas menores, sem perda de precisão
+    y = np.nan_to_num(np.asarray(y, dtype=np.float64))
+    x_sums = np.concatenate(([0.0], np.cumsum(x)))
+    y_sums = np.concatenate(([0.0], np.cumsum(y)))
+
+    # Limites das faixas (série x faixa) sobre os pontos 1..n-2 de cada série,
+    # mais a "faixa" do último ponto
+    first, size = starts[long], lengths[long]
+    fractions = np.linspace(0.0, 1.0, n_out - 1)
+    edges = first[:, None] + np.column_stack(
+        (1 + (fractions * (size[:, None] - 2)).astype(np.int64), size)
+    )
+    # Média da faixa seguinte a cada faixa, de todas as séries de uma vez
+    counts = edges[:, 2:] - edges[:, 1:-1]
+    next_x = (x_sums[edges[:, 2:]] - x_sums[edges[:, 1:-1]]) / counts
+    next_y = (y_sums[edges[:, 2:]] - y_sums[edges[:, 1:-1]]) / counts
+
+    # Candidatos de cada faixa (série x faixa x posição); faixas menores que a
+    # maior repetem o último ponto, de área igual
+    width = int((edges[:, 1:-1] - edges[:, :-2]).max())
+    candidates = np.minimum(
+        edges[:, :-2, None] + np.arange(width), edges[:, 1:-1, None] - 1
+    )
+    candidate_x, candidate_y = x[candidates], y[candidates]
+    rows = np.arange(len(first))
+    selected = np.empty((len(first), n_out), dtype=np.int64)
+    selected[:, 0], selected[:, -1] = first, first + size - 1
+    previous = first
+    for bucket in range(n_out - 2):
+        xa, ya = x[previous][:, None], y[previous][:, None]
+        areas = np.abs(
+            (xa - next_x[:, bucket, None]) * (candidate_y[:, bucket] - ya)
+            - (xa - candidate_x[:, bucket]) * (next_y[:, bucket, None] - ya)
+        )
+        previous = candidates[rows, bucket, np.argmax(areas, axis=1)]
+        selected[:, bucket + 1] = previous
+
+    kept = [selected.ravel()]
+    kept += [np.arange(s, s + k) for s, k in zip(starts[~long], lengths[~long])]
+    return np.sort(np.concatenate(kept))
+
+
+def minmax_indices(y: np.ndarray, n_out: int, starts=None) -> np.ndarray:
+    """
+    Posições do mínimo e do máximo de cada faixa, mais o primeiro e o último ponto.
+
+    Divide cada série em `n_out // 2` faixas consecutivas; o envelope da série
+    é preservado exatamente. Mais barato que o LTTB, porém mais serrilhado em
+    séries suaves. Valores nulos nunca são escolhidos se a faixa tiver algum
+    valor. `starts` tem o mesmo sentido que em lttb_indices.
+
+    Returns:
+        np.ndarray: Posições crescentes (todas as de uma série que já couber).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    buckets = n_out // 2
+    kept = []
+    for start, length in zip(*_segments(len(y), starts)):
+        if n_out >= length or buckets < 1:
+            kept.append(np.arange(start, start + length))
+            continue
+        edges = np.linspace(0, length, buckets + 1).astype(np.int64)
+        # Matriz faixa x posição; faixas menores repetem o último ponto
+        width = int(np.diff(edges).max())
+        grid = start + np.minimum(
+            edges[:-1, None] + np.arange(width), edges[1:, None] - 1
+        )
+        values = y[grid]
+        nulls = np.isnan(values)
+        rows = np.arange(buckets)
+        lowest = grid[rows, np.argmin(np.where(nulls, np.inf, values), axis=1)]
+        highest = grid[rows, np.argmax(np.where(nulls, -np.inf, values), axis=1)]
+        kept.append(np.unique([start, start + length - 1, *lowest, *highest]))
+    return np.concatenate(kept) if kept else np.arange(0)
+
+
+def downsample_indices(
+    x: np.ndarray, y: np.ndarray, n_out: int, method: str = "lttb", starts=None
+) -> np.ndarray:
+    """Posições mantidas das séries pelo método `method` ('lttb' ou 'minmax')."""
+    _check_method(method)
+    if method == "minmax":
+        return minmax_indices(y, n_out, starts)
+    return lttb_indices(x, y, n_out, starts)
+
+
+def _check_method(method: str) -> None:
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(
+            f"Método '{method}' inválido. Use {' ou '.join(DOWNSAMPLE_METHODS)}"
+        )
+
+
+def _numeric_axis(values: pd.Series) -> np.ndarray:
+    """Eixo x como números: datas em nanossegundos; categorias pela posição."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    if pd.api.types.is_numeric_dtype(values) and not isinstance(
+        values.dtype, pd.CategoricalDtype
+    ):
+        return values.to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.arange(len(values), dtype=np.float64)
+
+
+def downsample_frame(
+    df: pd.DataFrame,
+    x_col: str,
+    y_col: str,
+    group_col: str | None = None,
+    width_px: int | None = None,
+    method: str | None = None,
+) -> pd.DataFrame:
+    """
+    Reduz cada série do DataFrame a cerca de um ponto por pixel de largura.
+
+    Uma linha não mostra mais detalhes que a largura do gráfico em pixels;
+    pontos além disso só aumentam o JSON enviado e o tempo de desenho no
+    navegador. Cada grupo de `group_col` (uma linha do gráfico) é reduzido
+    separadamente, na ordem das linhas do DataFrame, e as linhas escolhidas
+    são devolvidas na ordem original, com todas as colunas.
+
+    Args:
+        df: Dados do gráfico.
+        x_col: Coluna do eixo x (datas, números ou rótulos).
+        y_col: Coluna dos valores.
+        group_col: Coluna que separa as linhas do gráfico. None: série única.
+        width_px: Largura-alvo em pixels. None: ChartSettings.DOWNSAMPLE_WIDTH_PX.
+        method: 'lttb' ou 'minmax'. None: ChartSettings.DOWNSAMPLE_METHOD.
+
+    Returns:
+        pd.DataFrame: O próprio `df` se já couber; senão, as linhas mantidas.
+
+    Raises:
+        ValueError: Se o método for inválido.
+    """
+    n_out = width_px or ChartSettings.DOWNSAMPLE_WIDTH_PX
+    method = method or ChartSettings.DOWNSAMPLE_METHOD
+    _check_method(method)
+    if len(df) <= n_out:
+        return df  # Nenhuma série passa do limite
+
+    if group_col is None:
+        order = np.arange(len(df))
+        starts = None
+    else:
+        groups = list(
+            df.groupby(group_col, observed=True, sort=False, dropna=False)
+            .indices.values()
+        )
+        order = np.concatenate(groups)
+        starts = np.cumsum([0] + [len(positions) for positions in groups[:-1]])
+
+    x = _numeric_axis(df[x_col])[order]
+    y = df[y_col].to_numpy(dtype=np.float64, na_value=np.nan)[order]
+    kept = np.sort(order[downsample_indices(x, y, n_out, method, starts)])
+    if len(kept) == len(df):
+        return df
+    return df.iloc[kept]
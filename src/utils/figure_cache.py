@@ -0,0 +1,89 @@
+import hashlib
+import json
+from collections.abc import Callable
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from config.constants import CacheSettings
+from utils.lru_cache import LRUCache
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Hash do conteúdo de um DataFrame (valores, índice, colunas e tipos)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr(list(zip(df.columns, map(str, df.dtypes)))).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _validated(fig: go.Figure) -> go.Figure:
+    """
+    A figura validada por inteiro, uma vez, antes de entrar no cache.
+
+    Figuras montadas sem validação (modo raw, ver charts.raw) são reconstruídas
+    com validação; propriedades inválidas levantam ValueError e nada é guardado.
+    """
+    return fig if fig._validate else go.Figure(fig.to_dict())
+
+
+class FigureCache:
+    """Figuras Plotly serializadas, endereçadas pelo conteúdo de suas entradas.
+
+    A chave combina o hash dos dados agregados recebidos pelo construtor, o
+    nome do construtor e seus parâmetros (tema, títulos e cores que não vêm dos
+    dados). O valor é o JSON da figura, com remoção LRU limitada por
+    ``max_bytes``; um acerto custa a consulta e a leitura do JSON em uma figura
+    sem validação, sem repetir agregações nem a montagem do gráfico.
+    Compartilhado entre as sessões.
+    """
+
+    def __init__(self, max_bytes: int = CacheSettings.FIGURE_MAX_BYTES):
+        self._cache = LRUCache(max_bytes, sizeof=len)
+
+    @staticmethod
+    def key(builder: Callable, digest: str, params: dict) -> str:
+        """Chave da figura montada por `builder` sobre dados com hash `digest`."""
+        name = f"{builder.__module__}.{builder.__qualname__}"
+        spec = repr(sorted(params.items()))
+        return hashlib.blake2b(
+            f"{name}|{digest}|{spec}".encode(), digest_size=16
+        ).hexdigest()
+
+    def get_or_build(
+        self,
+        builder: Callable[..., go.Figure],
+        data: pd.DataFrame,
+        digest: str | None = None,
+        **params,
+    ) -> go.Figure:
+        """
+        Devolve a figura de `builder(data, **params)`, montando-a só na falta.
+
+        Args:
+            builder: Construtor que devolve um go.Figure.
+            data: Dados agregados recebidos pelo construtor.
+            digest: Hash de `data` (ver frame_digest), se já calculado.
+            **params: Parâmetros repassados ao construtor e incluídos na chave.
+
+        Raises:
+            ValueError: Se a figura montada tiver propriedades inválidas.
+            Exception: Os erros do construtor são propagados e nada é guardado.
+        """
+        key = self.key(builder, digest or frame_digest(data), params)
+        payload = self._cache.get_or_compute(
+            key, lambda: _validated(builder(data, **params)).to_json()
+        )
+        # Só entram figuras validadas: a leitura dispensa a revalidação
+        return go.Figure(json.loads(payload), _validate=False)
+
+    def clear(self) -> None:
+        """Remove todas as figuras e zera as estatísticas."""
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        """Retorna entradas, bytes ocupados, orçamento e contagem de acertos."""
+        return self._cache.stats()
+
+
+figure_cache = FigureCache()
@@ -0,0 +1,307 @@
+import io
+import threading
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from config.constants import IngestSettings
+from utils.aggregates import (
+    ROLLUP_KEYS,
+    aggregate_measures,
+    combine_measures,
+    get_cube,
+    is_rollup,
+)
+from utils.dataset_cache import dataset_cache
+from utils.dataset_store import dataset_store
+from utils.date_parts import derive_date_parts
+from utils.schema import apply_schema
+from utils.time_window import sort_by_period
+
+
+@dataclass
+class IngestProgress:
+    """Progresso de uma carga, atualizado pela thread de ingestão.
+
+    A interface apenas lê estes campos; cada escrita é uma atribuição simples,
+    então não há necessidade de lock.
+    """
+
+    total_bytes: int
+    stage: str = "na fila"
+    bytes_read: int = 0
+    rows: int = 0
+
+    def advance(self, bytes_read: int, rows: int) -> None:
+        """Registra a posição atual no arquivo e as linhas lidas no bloco."""
+        self.bytes_read = bytes_read
+        self.rows += rows
+
+    @property
+    def fraction(self) -> float:
+        """Fração do arquivo já consumida, entre 0 e 1."""
+        if not self.total_bytes:
+            return 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+    def describe(self) -> str:
+        """Texto para a barra de progresso."""
+        return (
+            f"{self.stage.capitalize()}: {self.bytes_read / 1024**2:,.1f} de "
+            f"{self.total_bytes / 1024**2:,.1f} MB, {self.rows:,} linhas"
+        )
+
+
+class IngestJob:
+    """Executa uma carga em uma thread de fundo e expõe seu progresso.
+
+    ``target`` recebe o IngestProgress da carga e devolve o DataFrame. A thread
+    não chama funções do Streamlit; a interface consulta ``progress`` e
+    ``wait()`` a cada intervalo e usa ``result`` (ou ``error``) ao final.
+    ``key`` identifica o upload, para que reruns reutilizem a mesma carga.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[IngestProgress], pd.DataFrame],
+        total_bytes: int,
+        key: Hashable = None,
+    ):
+        self.key = key
+        self.progress = IngestProgress(total_bytes)
+        self.result: pd.DataFrame | None = None
+        self.error: Exception | None = None
+        self._target = target
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="ingest", daemon=True)
+
+    def start(self) -> "IngestJob":
+        """Inicia a thread de ingestão."""
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        try:
+            self.result = self._target(self.progress)
+            self.progress.stage = "concluído"
+        except Exception as error:  # Repassado à interface por `error`
+            self.error = error
+            self.progress.stage = "falhou"
+        finally:
+            self._target = None  # Solta o upload capturado pela carga
+            self._done.set()
+
+    @property
+    def done(self) -> bool:
+        """Indica se a carga terminou, com sucesso ou erro."""
+        return self._done.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Aguarda até `timeout` segundos e retorna se a carga terminou."""
+        return self._done.wait(timeout)
+
+
+def read_source_bytes(source) -> bytes:
+    """Lê o conteúdo bruto de um upload do Streamlit, caminho ou arquivo aberto."""
+    if hasattr(source, "getvalue"):
+        return source.getvalue()
+    if isinstance(source, (str, Path)):
+        return Path(source).read_bytes()
+    return source.read()
+
+
+def normalize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Padroniza os nomes das colunas e converte a data."""
+    df.columns = df.columns.str.strip()  # Remove espaços extras nos nomes das colunas
+    df.rename(columns={"Energy (kWh)": "Energy"}, inplace=True)  # Renomeia a coluna
+    df["Date"] = pd.to_datetime(df["Date"])  # Converter para datetime
+    return df
+
+
+def normalize_data(df: pd.DataFrame) -> pd.DataFrame:
+    """Normaliza o CSV bruto, adiciona as colunas derivadas e compacta os tipos."""
+    df = normalize_columns(df)
+
+    # Day, Month, Year, Month_Year (AAAAMM) e Week, calculados por data distinta
+    date_parts = derive_date_parts(df["Date"])
+    for column in date_parts.columns:
+        df[column] = date_parts[column]
+
+    df = apply_schema(df)  # Tipos compactos (ver utils.schema.DATASET_SCHEMA)
+    return sort_by_period(df)  # Ordem por data para consultas por intervalo
+
+
+class ProgressReader(io.RawIOBase):
+    """Arquivo binário que registra em `progress` a posição de cada leitura."""
+
+    def __init__(self, handle, progress: IngestProgress):
+        self._handle = handle
+        self._progress = progress
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        size = self._handle.readinto(buffer)
+        self._progress.advance(self._handle.tell(), 0)
+        return size
+
+
+def read_csv_chunks(handle, chunksize: int, progress: IngestProgress):
+    """Lê o CSV em blocos, registrando os bytes consumidos e as linhas lidas."""
+    for chunk in pd.read_csv(handle, chunksize=chunksize):
+        progress.advance(handle.tell(), len(chunk))
+        yield chunk
+
+
+def parse_frame(
+    raw: bytes, progress: IngestProgress | None = None, key: str | None = None
+) -> pd.DataFrame:
+    """
+    Normaliza o CSV completo, reaproveitando a cópia em Parquet se existir.
+
+    Args:
+        raw: Conteúdo do arquivo CSV.
+        progress: Progresso atualizado a cada bloco lido.
+        key: Fingerprint de `raw`, se já calculado.
+
+    Returns:
+        pd.DataFrame: Linhas normalizadas, com attrs["fingerprint"] definido.
+    """
+    progress = progress or IngestProgress(len(raw))
+    key = key or dataset_cache.fingerprint(raw)
+
+    # Reaproveita a cópia em Parquet se o mesmo arquivo já foi processado
+    progress.stage = "cache"
+    df = dataset_cache.get(key)
+    if df is None:
+        progress.stage = "leitura"
+        # Leitura em uma passada: blocos concatenados ao fim dobrariam o pico
+        df = pd.read_csv(ProgressReader(io.BytesIO(raw), progress))
+        if df.empty:
+            raise ValueError("O arquivo CSV não contém registros")
+        progress.advance(progress.bytes_read, len(df))
+        progress.stage = "normalização"
+        df = normalize_data(df)
+        progress.stage = "gravação em cache"
+        dataset_cache.put(key, df)
+    else:
+        progress.advance(len(raw), len(df))
+
+    df.attrs["fingerprint"] = key  # Identifica o conjunto de dados carregado
+    return df
+
+
+def load_frame(source) -> pd.DataFrame:
+    """Carrega e normaliza o CSV de um upload, caminho ou arquivo aberto."""
+    return parse_frame(read_source_bytes(source))
+
+
+def aggregate_stream(
+    handle,
+    key: str,
+    chunksize: int = IngestSettings.CHUNK_ROWS,
+    progress: IngestProgress | None = None,
+) -> pd.DataFrame:
+    """
+    Reduz o CSV bloco a bloco às medidas pré-agregadas.
+
+    Args:
+        handle: Arquivo binário aberto, posicionado no início do CSV.
+        key: Fingerprint do arquivo (ver DatasetCache.fingerprint).
+        chunksize: Número de linhas lidas por bloco.
+        progress: Progresso atualizado a cada bloco lido.
+
+    Returns:
+        pd.DataFrame: Tabela de medidas (ver utils.aggregates.MEASURE_COLUMNS).
+    """
+    progress = progress or IngestProgress(0)
+    progress.stage = "agregação"
+    rollup = None
+    for chunk in read_csv_chunks(handle, chunksize, progress):
+        chunk = normalize_columns(chunk)
+        chunk["Month"] = chunk["Date"].dt.month
+        chunk["Year"] = chunk["Date"].dt.year
+        partial = aggregate_measures(chunk)
+        rollup = partial if rollup is None else combine_measures([rollup, partial])
+
+    if rollup is None or rollup.empty:
+        raise ValueError("O arquivo CSV não contém registros")
+
+    rollup = sort_by_period(rollup)
+    rollup.attrs["fingerprint"] = f"{key}:rollup"  # Distingue da carga completa
+    return rollup
+
+
+def load_rollup(source, chunksize: int = IngestSettings.CHUNK_ROWS) -> pd.DataFrame:
+    """
+    Lê o CSV em blocos e devolve apenas as medidas pré-agregadas.
+
+    Cada bloco é normalizado e reduzido por (Plant Name, Microinversor, Year,
+    Month) antes de ser combinado ao acumulado, então a memória depende do número
+    de grupos e não do tamanho do arquivo.
+
+    Args:
+        source: Upload do Streamlit, caminho ou arquivo aberto.
+        chunksize: Número de linhas lidas por bloco.
+
+    Returns:
+        pd.DataFrame: Tabela de medidas (ver utils.aggregates.MEASURE_COLUMNS).
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as handle:
+            key = dataset_cache.fingerprint_stream(handle)
+            handle.seek(0)
+            return aggregate_stream(handle, key, chunksize)
+
+    source.seek(0)
+    key = dataset_cache.fingerprint_stream(source)
+    source.seek(0)
+    return aggregate_stream(source, key, chunksize)
+
+
+def start_ingest(uploaded_file, streaming: bool = False, key=None) -> IngestJob:
+    """
+    Inicia a carga do upload em uma thread de fundo.
+
+    A thread lê e normaliza o CSV (ou apenas o agrega, se `streaming`),
+    registra o resultado no dataset_store e já constrói o cubo e o índice
+    usados pela Home, atualizando job.progress a cada bloco lido. Arquivos já
+    abertos por outra sessão são reaproveitados do dataset_store; arquivos já
+    vistos são lidos direto do cache em Parquet.
+
+    Args:
+        uploaded_file: Upload do Streamlit, caminho ou arquivo aberto.
+        streaming: Mantém apenas as medidas pré-agregadas (arquivos grandes).
+        key: Identificação do upload, guardada em job.key.
+
+    Returns:
+        IngestJob: Carga em andamento.
+    """
+    # O upload passa à thread e sai daqui: depois da cópia no dataset_store nada
+    # mais o mantém vivo (nem o job guardado na sessão)
+    pending = [read_source_bytes(uploaded_file)]
+    total_bytes = len(pending[0])
+
+    def target(progress: IngestProgress) -> pd.DataFrame:
+        raw = pending.pop()
+        key = dataset_cache.fingerprint(raw)
+        data = dataset_store.get(f"{key}:rollup" if streaming else key)
+        if data is not None:  # Já carregado por outra sessão
+            rows = int(data["Records"].sum()) if is_rollup(data) else len(data)
+            progress.advance(len(raw), rows)
+        else:
+            if streaming:
+                data = aggregate_stream(io.BytesIO(raw), key, progress=progress)
+            else:
+                data = parse_frame(raw, progress, key)
+            progress.stage = "compartilhamento"
+            data = dataset_store.put(data)  # Cópia única, mapeada em memória
+        del raw
+        progress.stage = "índice"
+        get_cube(data).index(ROLLUP_KEYS)  # Cubo e índice já na carga
+        return data
+
+    return IngestJob(target, total_bytes, key).start()
@@ -1,17 +1,18 @@
-import pandas as pd
 import streamlit as st
 
+from config.constants import IngestSettings
+from utils.ingest import load_frame, load_rollup
+
+# Adaptador do Streamlit: cache por sessão sobre utils.ingest, que não depende dele
+
 
 @st.cache_data
 def load_data(uploaded_file):
     """Carrega e processa os dados do arquivo CSV"""
-    df = pd.read_csv(uploaded_file)
-    df.columns = df.columns.str.strip()  # Remove espaços extras nos nomes das colunas
-    df.rename(columns={"Energy (kWh)": "Energy"}, inplace=True)  # Renomeia a coluna
-    df["Date"] = pd.to_datetime(df["Date"])  # Converter para datetime
-    df["Day"] = df["Date"].dt.day  # Adiciona a coluna de dias do mês
-    df["Month"] = df["Date"].dt.month  # Adiciona a coluna do mês
-    df["Month_Year"] = df["Date"].dt.strftime("%Y-%m")  # Adiciona a coluna Ano-Mês
-    df["Year"] = df["Date"].dt.year  # Adiciona a coluna do ano
-    df["Week"] = df["Date"].dt.isocalendar().week  # Adiciona a coluna de semana do ano
-    return df
+    return load_frame(uploaded_file)
+
+
+@st.cache_data
+def load_data_streaming(uploaded_file, chunksize: int = IngestSettings.CHUNK_ROWS):
+    """Lê o CSV em blocos e devolve as medidas pré-agregadas (ver load_rollup)."""
+    return load_rollup(uploaded_file, chunksize)
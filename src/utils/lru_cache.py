@@ -0,0 +1,80 @@
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+
+import pandas as pd
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Tamanho em memória de um DataFrame, incluindo strings e categorias."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+class LRUCache:
+    """Cache em memória com remoção LRU limitada por orçamento de bytes.
+
+    O tamanho de cada valor é medido por ``sizeof`` na inserção. Ao exceder
+    ``max_bytes``, as entradas usadas há mais tempo são descartadas; um valor
+    que sozinho ultrapasse o orçamento não é armazenado. Seguro para uso entre
+    as threads de sessões do Streamlit.
+    """
+
+    def __init__(self, max_bytes: int, sizeof: Callable[[object], int] = frame_nbytes):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries: OrderedDict[Hashable, tuple[object, int]] = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """Retorna o valor em cache (marcando-o como recente) ou None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[0]
+
+    def put(self, key: Hashable, value) -> None:
+        """Armazena o valor e remove as entradas menos recentes se necessário."""
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], object]):
+        """Retorna o valor em cache ou o calcula com `compute` e armazena."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove todas as entradas e zera as estatísticas."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = self._hits = self._misses = 0
+
+    def stats(self) -> dict:
+        """Retorna entradas, bytes ocupados, orçamento e contagem de acertos."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+            }
@@ -0,0 +1,225 @@
+import json
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import TYPE_CHECKING
+
+from config.constants import ProfilerSettings
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Profiler da execução em andamento (uma por thread de script do Streamlit)
+_active_profiler: ContextVar["StageProfiler | None"] = ContextVar(
+    "active_profiler", default=None
+)
+
+
+# tracemalloc é global ao processo e as sessões do Streamlit rodam em threads:
+# o rastreamento é ligado pelo primeiro run() que o pede e desligado pelo último
+_tracing_lock = threading.Lock()
+_tracing_runs = 0  # run() rastreando memória agora
+_tracing_owned = False  # Ligado por um run() (e não por quem já rastreava)
+_tracing_epoch = 0  # Conta os run() que passaram a rastrear
+
+
+def _acquire_tracing() -> tuple[int, bool]:
+    """Registra um run() que rastreia memória; devolve (época, se está sozinho)."""
+    global _tracing_runs, _tracing_owned, _tracing_epoch
+    with _tracing_lock:
+        if _tracing_runs == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_runs += 1
+        _tracing_epoch += 1
+        return _tracing_epoch, _tracing_runs == 1
+
+
+def _release_tracing(epoch: int) -> bool:
+    """Encerra o rastreamento do run(); devolve se nenhum outro começou depois."""
+    global _tracing_runs, _tracing_owned
+    with _tracing_lock:
+        alone = _tracing_epoch == epoch
+        _tracing_runs -= 1
+        if _tracing_runs == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+        return alone
+
+
+class StageProfiler:
+    """
+    Mede tempo, número de chamadas e pico de memória por etapa de cada rerun.
+
+    Cada rerun é delimitado por run(); dentro dele, as etapas são medidas por
+    stage() ou pelas funções decoradas com @profiled. Fora de um run() as
+    funções decoradas executam sem medição. O pico de memória usa tracemalloc
+    e só é coletado quando solicitado, pois deixa a execução mais lenta. Como o
+    pico do tracemalloc é global ao processo, reruns que rastreiam memória ao
+    mesmo tempo (outras sessões) zeram o pico uns dos outros: nesse caso os
+    picos desses reruns ficam em None.
+    """
+
+    def __init__(self, history: int = ProfilerSettings.HISTORY_RUNS):
+        self.runs: deque[dict] = deque(maxlen=history)
+        self._stages: dict[str, dict] | None = None
+        self._stack: list[dict] = []
+        self._tracing = False  # O run() atual rastreia memória
+
+    @contextmanager
+    def run(self, trace_memory: bool = False):
+        """Delimita um rerun e guarda suas medições no histórico."""
+        self._stages = {}
+        token = _active_profiler.set(self)
+        self._tracing = trace_memory
+        if trace_memory:
+            epoch, alone = _acquire_tracing()
+        # Quadro raiz: acumula o pico do rerun inteiro entre as etapas
+        root = {"base": 0, "peak": 0}
+        if trace_memory:
+            root["base"] = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._stack = [root]
+        started_at = time.time()
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            elapsed = time.perf_counter() - start
+            _active_profiler.reset(token)
+            peak_bytes = None
+            if trace_memory:
+                peak = max(root["peak"], tracemalloc.get_traced_memory()[1])
+                peak_bytes = peak - root["base"]
+                if not (_release_tracing(epoch) and alone):
+                    # Outro rerun rastreou ao mesmo tempo: os picos não valem
+                    peak_bytes = None
+                    for stats in self._stages.values():
+                        stats["peak_bytes"] = None
+            self._tracing = False
+            self.runs.append({
+                "started_at": started_at,
+                "wall_s": elapsed,
+                "peak_bytes": peak_bytes,
+                "stages": self._stages,
+            })
+            self._stages = None
+            self._stack.clear()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Mede uma etapa do rerun atual (etapas podem ser aninhadas)."""
+        if self._stages is None:
+            yield
+            return
+
+        tracing = self._tracing
+        frame = {"base": 0, "peak": 0}
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # O pico é zerado para esta etapa; as etapas externas guardam o anterior
+            for parent in self._stack:
+                parent["peak"] = max(parent["peak"], peak)
+            tracemalloc.reset_peak()
+            frame["base"] = current
+        self._stack.append(frame)
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            stats = self._stages.setdefault(
+                name, {"calls": 0, "wall_s": 0.0, "peak_bytes": None}
+            )
+            stats["calls"] += 1
+            stats["wall_s"] += elapsed
+            if tracing:
+                peak = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                for parent in self._stack:
+                    parent["peak"] = max(parent["peak"], peak)
+                stats["peak_bytes"] = max(
+                    stats["peak_bytes"] or 0, peak - frame["base"]
+                )
+
+    def summary(self) -> "pd.DataFrame":
+        """
+        Resume as etapas dos últimos reruns.
+
+        Returns:
+            pd.DataFrame: Uma linha por etapa com chamadas, tempo médio, último e
+            máximo por rerun (ms) e maior pico de memória (MB), ordenada pelo
+            tempo médio.
+        """
+        import pandas as pd  # Adiado: só o painel de Debug usa o resumo
+
+        rows = {}
+        for run in self.runs:
+            stages = {"rerun (total)": {"calls": 1, **run}}
+            stages.update(run["stages"])
+            for name, stats in stages.items():
+                row = rows.setdefault(name, {"reruns": 0, "calls": 0, "wall_ms": []})
+                row["reruns"] += 1
+                row["calls"] += stats["calls"]
+                row["wall_ms"].append(stats["wall_s"] * 1000)
+                if stats.get("peak_bytes") is not None:
+                    row["peak_mb"] = max(
+                        row.get("peak_mb", 0.0), stats["peak_bytes"] / 1024**2
+                    )
+
+        summary = pd.DataFrame(
+            [
+                {
+                    "etapa": name,
+                    "reruns": row["reruns"],
+                    "chamadas": row["calls"],
+                    "média (ms)": sum(row["wall_ms"]) / len(row["wall_ms"]),
+                    "último (ms)": row["wall_ms"][-1],
+                    "máximo (ms)": max(row["wall_ms"]),
+                    "pico (MB)": row.get("peak_mb"),
+                }
+                for name, row in rows.items()
+            ]
+        )
+        if summary.empty:
+            return summary
+        return summary.sort_values("média (ms)", ascending=False, ignore_index=True)
+
+    def to_json(self) -> str:
+        """Serializa o histórico de reruns para comparação offline."""
+        return json.dumps({"runs": list(self.runs)}, indent=2)
+
+
+def stage(name: str):
+    """Mede uma etapa no profiler ativo; sem profiler ativo, não faz nada."""
+    profiler = _active_profiler.get()
+    return profiler.stage(name) if profiler is not None else nullcontext()
+
+
+def profiled(name: str | None = None):
+    """
+    Decorador que registra cada chamada como uma etapa do profiler ativo.
+
+    Args:
+        name: Nome da etapa. Padrão: nome qualificado da função.
+    """
+
+    def decorator(function):
+        label = name or function.__qualname__
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            profiler = _active_profiler.get()
+            if profiler is None:
+                return function(*args, **kwargs)
+            with profiler.stage(label):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+
+# Colunas com lista de posições por valor (índice invertido)
+INDEX_COLUMNS = ["Microinversor", "SN", "Port"]
+
+
+class RowIndex:
+    """
+    Índice de linhas para filtrar um DataFrame sem varrer as colunas.
+
+    Para cada valor de INDEX_COLUMNS guarda as posições das linhas que o contêm
+    (índice invertido em formato CSR: uma permutação agrupada por valor e os
+    deslocamentos de cada grupo). A coluna `order_by` ganha um índice ordenado
+    para consultas de intervalo por busca binária (np.searchsorted).
+
+    Os filtros são respondidos como bitmaps (máscaras booleanas) montados a
+    partir das posições selecionadas: valores de uma coluna são unidos (OR) e
+    colunas diferentes combinadas com AND.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        columns: list[str] = None,
+        order_by: str = "Date",
+    ):
+        self.size = len(df)
+        self._postings: dict[str, tuple[dict, np.ndarray, np.ndarray]] = {}
+        for column in columns or INDEX_COLUMNS:
+            if column in df.columns:
+                self._postings[column] = self._build_postings(df[column])
+
+        self.order_by = order_by if order_by in df.columns else None
+        self._values = None
+        self._sorted = None
+        self._permutation = None  # None: coluna já ordenada (posição = índice)
+        if self.order_by is not None:
+            values = self._values = df[self.order_by].to_numpy()
+            if not df[self.order_by].is_monotonic_increasing:
+                self._permutation = np.argsort(values, kind="stable")
+                values = values[self._permutation]
+            self._sorted = values
+
+    @staticmethod
+    def _build_postings(values: pd.Series) -> tuple[dict, np.ndarray, np.ndarray]:
+        codes, uniques = pd.factorize(values)
+        order = np.argsort(codes, kind="stable")
+        # Códigos -1 (valores nulos) ficam no início da permutação
+        counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+        offsets = np.concatenate([[0], np.cumsum(counts)]) + np.count_nonzero(codes < 0)
+        lookup = {value: code for code, value in enumerate(uniques)}
+        return lookup, order, offsets
+
+    def positions(self, column: str, values) -> np.ndarray:
+        """
+        Retorna as posições das linhas cujo `column` está em `values`.
+
+        Raises:
+            KeyError: Se a coluna não estiver indexada.
+        """
+        lookup, order, offsets = self._postings[column]
+        codes = [lookup[value] for value in values if value in lookup]
+        if not codes:
+            return np.empty(0, dtype=order.dtype)
+        return np.concatenate(
+            [order[offsets[code] : offsets[code + 1]] for code in codes]
+        )
+
+    def _bounds(self, low, high) -> tuple:
+        """Converte os limites para o dtype da coluna (ex.: Timestamp -> datetime64)."""
+        dtype = self._sorted.dtype
+        return np.asarray(low).astype(dtype), np.asarray(high).astype(dtype)
+
+    def range_positions(self, low, high) -> np.ndarray | slice:
+        """
+        Retorna as linhas com `order_by` entre `low` e `high` (inclusivo).
+
+        Se a coluna já estiver ordenada no DataFrame, o resultado é um slice.
+        """
+        low, high = self._bounds(low, high)
+        start = np.searchsorted(self._sorted, low, side="left")
+        stop = np.searchsorted(self._sorted, high, side="right")
+        if self._permutation is None:
+            return slice(start, stop)
+        return self._permutation[start:stop]
+
+    def select(
+        self, filters: dict | None = None, between: tuple | None = None
+    ) -> np.ndarray:
+        """
+        Combina os filtros em um bitmap de linhas.
+
+        A seleção parte da menor lista de posições; o intervalo sobre `order_by`
+        é então conferido apenas nessas linhas candidatas, de modo que o custo
+        acompanha o tamanho do resultado e não o do DataFrame.
+
+        Args:
+            filters: {coluna indexada: valores aceitos}; valores de uma coluna
+                são combinados com OR e colunas diferentes com AND.
+            between: Intervalo (inclusivo) sobre a coluna `order_by`.
+
+        Returns:
+            np.ndarray: Máscara booleana com uma posição por linha.
+        """
+        selections = sorted(
+            (
+                self.positions(column, values)
+                for column, values in (filters or {}).items()
+            ),
+            key=len,
+        )
+        if not selections:
+            if between is None:
+                return np.ones(self.size, dtype=bool)
+            selections = [self.range_positions(*between)]
+        elif between is not None:
+            low, high = self._bounds(*between)
+            candidates = selections[0]
+            values = self._values[candidates]
+            selections[0] = candidates[(values >= low) & (values <= high)]
+
+        mask = np.zeros(self.size, dtype=bool)
+        mask[selections[0]] = True
+        for selected in selections[1:]:
+            bitmap = np.zeros(self.size, dtype=bool)
+            bitmap[selected] = True
+            mask &= bitmap
+        return mask
@@ -0,0 +1,86 @@
+import logging
+
+import pandas as pd
+
+# Tipos declarados para o DataFrame carregado. Identificadores viram categorias,
+# partes de data viram inteiros pequenos e a energia usa float32.
+DATASET_SCHEMA: dict[str, str] = {
+    "Plant Name": "category",
+    "SN": "category",
+    "Microinversor": "category",
+    "Port": "int8",
+    "Energy": "float32",
+    "Year": "int16",
+    "Month": "int8",
+    "Day": "int8",
+    "Week": "int8",
+    "Month_Year": "int32",
+}
+
+
+def month_year_code(year: pd.Series, month: pd.Series) -> pd.Series:
+    """
+    Gera o código inteiro do período no formato AAAAMM (ex.: 202504).
+
+    Args:
+        year: Série com os anos.
+        month: Série com os meses.
+
+    Returns:
+        pd.Series: Código do período, ordenável e 4 bytes por linha.
+    """
+    return year.astype("int32") * 100 + month.astype("int32")
+
+
+def format_month_year(code: int) -> str:
+    """Converte o código AAAAMM de volta para o texto 'AAAA-MM'."""
+    return f"{code // 100}-{code % 100:02d}"
+
+
+def apply_schema(df: pd.DataFrame, schema: dict[str, str] = None) -> pd.DataFrame:
+    """
+    Converte as colunas para os tipos compactos declarados.
+
+    Colunas ausentes são ignoradas e, se a conversão de uma coluna falhar (por
+    exemplo, valores nulos em um inteiro), o tipo original é mantido.
+
+    Args:
+        df: DataFrame normalizado.
+        schema: Mapeamento coluna -> dtype. Padrão: DATASET_SCHEMA.
+
+    Returns:
+        pd.DataFrame: O mesmo DataFrame com os tipos convertidos.
+    """
+    for column, dtype in (schema or DATASET_SCHEMA).items():
+        if column not in df.columns:
+            continue
+        try:
+            df[column] = df[column].astype(dtype)
+        except (TypeError, ValueError) as e:
+            logging.warning(f"Coluna '{column}' mantida como {df[column].dtype}: {e}")
+    return df
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compara o uso de memória por coluna antes e depois da conversão de tipos.
+
+    Args:
+        before: DataFrame com os tipos originais.
+        after: DataFrame com os tipos compactos.
+
+    Returns:
+        pd.DataFrame: Tipos, bytes antes/depois e fator de redução por coluna,
+        com uma linha 'Total' ao final.
+    """
+    usage_before = before.memory_usage(deep=True, index=False)
+    usage_after = after.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype_before": before.dtypes.astype(str),
+        "dtype_after": after.dtypes.astype(str),
+        "bytes_before": usage_before,
+        "bytes_after": usage_after.reindex(usage_before.index),
+    })
+    report.loc["Total"] = ["", "", usage_before.sum(), usage_after.sum()]
+    report["reduction"] = report["bytes_before"] / report["bytes_after"]
+    return report
@@ -0,0 +1,160 @@
+import numpy as np
+import pandas as pd
+
+# Chaves de período, da mais grossa para a mais fina, usadas nas tabelas agregadas
+PERIOD_KEYS = ["Year", "Month", "Day"]
+
+SORTED_BY_ATTR = "sorted_by"
+
+
+def period_keys(df: pd.DataFrame) -> list[str]:
+    """Colunas que definem a ordem temporal: 'Date' ou as partes de data."""
+    if "Date" in df.columns:
+        return ["Date"]
+    keys = []
+    for key in PERIOD_KEYS:  # Apenas prefixos contíguos (Year, Year+Month, ...)
+        if key not in df.columns:
+            break
+        keys.append(key)
+    return keys
+
+
+def sort_by_period(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ordena o DataFrame pelo período e registra as chaves em df.attrs["sorted_by"].
+
+    A ordenação é estável, então linhas do mesmo período mantêm a ordem original.
+
+    Args:
+        df: Linhas brutas (com 'Date') ou tabela agregada (com Year/Month/Day).
+
+    Returns:
+        pd.DataFrame: Novo DataFrame ordenado, com índice 0..n-1.
+    """
+    keys = period_keys(df)
+    if not keys:
+        return df
+    result = df.sort_values(keys, kind="stable", ignore_index=True)
+    result.attrs[SORTED_BY_ATTR] = keys
+    return result
+
+
+def is_period_sorted(df: pd.DataFrame) -> bool:
+    """
+    Indica se as linhas estão em ordem de período, verificando os próprios dados.
+
+    df.attrs["sorted_by"] é só uma indicação: o pandas copia os attrs em
+    operações que reordenam as linhas (sort_values por outra coluna, concat),
+    então a ordem é conferida nos valores (O(n), vetorizado). Em 'Date', datas
+    nulas só são aceitas no fim, onde sort_by_period as coloca.
+    """
+    keys = period_keys(df)
+    if not keys:
+        return False
+    if keys == ["Date"]:
+        values = df["Date"].to_numpy()
+        missing = np.isnat(values)
+        valid = len(values) - int(missing.sum())
+        if missing[:valid].any():
+            return False  # Datas nulas fora do fim
+        values = values[:valid]
+    else:
+        values = _period_codes(df, keys)
+    return bool((values[1:] >= values[:-1]).all())
+
+
+def _period_code(key: tuple) -> int:
+    return sum(value * 100 ** (2 - position) for position, value in enumerate(key))
+
+
+def _period_codes(df: pd.DataFrame, keys: list[str]) -> np.ndarray:
+    """Código AAAAMMDD (com as chaves disponíveis) de cada linha."""
+    return sum(
+        df[key].to_numpy().astype("int64") * 100 ** (2 - position)
+        for position, key in enumerate(keys)
+    )
+
+
+def _lexsearch(columns: list[np.ndarray], key: tuple, side: str) -> int:
+    """searchsorted sobre colunas em ordem lexicográfica (ex.: Year, Month)."""
+    start, stop = 0, len(columns[0])
+    for values, value in zip(columns[:-1], key[:-1]):
+        part = values[start:stop]
+        start, stop = (
+            start + np.searchsorted(part, value, side="left"),
+            start + np.searchsorted(part, value, side="right"),
+        )
+    return start + np.searchsorted(columns[-1][start:stop], key[-1], side=side)
+
+
+def date_window(
+    df: pd.DataFrame,
+    date_from: pd.Timestamp | None = None,
+    date_to: pd.Timestamp | None = None,
+) -> pd.DataFrame:
+    """
+    Retorna as linhas entre `date_from` e `date_to` (ambas inclusivas, por dia).
+
+    Em DataFrames em ordem de período (ver is_period_sorted; load_data e o cubo
+    os entregam assim), os limites são encontrados por busca binária e o
+    resultado é uma fatia sem cópia (iloc[início:fim]). Tabelas agregadas são
+    comparadas na granularidade de suas chaves (ex.: mês). Fora de ordem, cai
+    para a comparação coluna a coluna.
+
+    Args:
+        df: Linhas brutas ou tabela agregada.
+        date_from: Primeiro dia da janela. None: desde o início.
+        date_to: Último dia da janela. None: até o fim.
+
+    Returns:
+        pd.DataFrame: Linhas dentro da janela.
+
+    Raises:
+        ValueError: Se o DataFrame não tiver colunas de período.
+    """
+    keys = period_keys(df)
+    if not keys:
+        raise ValueError("O DataFrame deve conter 'Date' ou 'Year'.")
+
+    if keys == ["Date"]:
+        # Limites como datetime64; NaT como limite superior exclui as datas nulas
+        low = np.datetime64(
+            pd.Timestamp.min
+            if date_from is None
+            else pd.Timestamp(date_from).normalize()
+        )
+        high = np.datetime64("NaT", "ns")
+        if date_to is not None:
+            high = np.datetime64(
+                pd.Timestamp(date_to).normalize() + pd.Timedelta(days=1)
+            )
+
+        values = df["Date"].to_numpy()
+        if not is_period_sorted(df):
+            mask = values >= low
+            if date_to is not None:
+                mask &= values < high
+            return df[mask]
+
+        start = np.searchsorted(values, low, side="left")
+        stop = np.searchsorted(values, high, side="left")  # NaT ficam no fim
+        return df.iloc[start:stop]
+
+    def key_of(date) -> tuple:
+        date = pd.Timestamp(date)
+        return tuple(getattr(date, key.lower()) for key in keys)
+
+    if not is_period_sorted(df):
+        # Código AAAAMMDD (com as chaves disponíveis) comparado linha a linha
+        codes = _period_codes(df, keys)
+        mask = np.ones(len(df), dtype=bool)
+        if date_from is not None:
+            mask &= codes >= _period_code(key_of(date_from))
+        if date_to is not None:
+            mask &= codes <= _period_code(key_of(date_to))
+        return df[mask]
+
+    columns = [df[key].to_numpy() for key in keys]
+    start = 0 if date_from is None else _lexsearch(columns, key_of(date_from), "left")
+    stop = len(df) if date_to is None else _lexsearch(columns, key_of(date_to), "right")
+    return df.iloc[start:stop]
@@ -1,5 +1,7 @@
 import streamlit as st
 
+from utils.downsampling import downsample_frame
+
 
 class MonthView:
     def display(self, data):
@@ -13,5 +15,6 @@ class MonthView:
         with col2:
             st.metric("Média Mensal", f"{data['Energy'].mean():,.2f} kWh")
 
-        # Gráfico de exemplo
-        st.line_chart(data.set_index("Date")["Energy"])
+        # Gráfico de exemplo (reduzido a ~1 ponto por pixel)
+        series = downsample_frame(data[["Date", "Energy"]], "Date", "Energy")
+        st.line_chart(series.set_index("Date")["Energy"])
@@ -1,6 +1,12 @@
 import pandas as pd
+import pytest
 
-from src.modules.home.metrics import calculate_current_month_energy, calculate_total_energy
+from src.modules.home.metrics import (
+    calculate_current_month_energy,
+    calculate_total_energy,
+)
+from src.utils.dataset_cache import DatasetCache
+from src.utils.dataset_store import DatasetStore
 
 
 def test_calculate_total_energy():
@@ -9,9 +15,649 @@ def test_calculate_total_energy():
 
 
 def test_calculate_current_month_energy():
+    now = pd.Timestamp.now()
     data = pd.DataFrame({
-        "Year": [2025, 2025, 2024],
-        "Month": [4, 4, 3],
+        "Year": [now.year, now.year, now.year - 1],
+        "Month": [now.month, now.month, now.month],
         "Energy": [100, 200, 300],
     })
-    assert calculate_current_month_energy(data) == 300  # Supondo que o mês atual seja abril de 2025
+    assert calculate_current_month_energy(data) == 300  # Apenas o mês atual
+
+
+def test_dataset_cache_roundtrip_and_eviction(tmp_path):
+    cache = DatasetCache(cache_dir=tmp_path, max_bytes=1)
+    df = pd.DataFrame({"Energy": [1.0, 2.0]})
+
+    key_a = cache.fingerprint(b"a")
+    cache.put(key_a, df)
+    pd.testing.assert_frame_equal(cache.get(key_a), df)
+
+    # O limite de 1 byte mantém apenas a entrada mais recente
+    key_b = cache.fingerprint(b"b")
+    cache.put(key_b, df)
+    assert cache.get(key_a) is None
+    assert cache.stats()["entries"] == 1
+
+    assert cache.invalidate() == 1
+    assert cache.get(key_b) is None
+
+
+def test_load_data_reuses_parquet_cache(tmp_path, monkeypatch):
+    from src.utils import load_data as load_data_module
+    from utils import ingest  # Módulo usado por load_data (importado sem "src.")
+
+    cache = DatasetCache(cache_dir=tmp_path)
+    monkeypatch.setattr(ingest, "dataset_cache", cache)
+    csv = tmp_path / "export.csv"
+    csv.write_text("Date,Energy (kWh),Microinversor\n2025-04-06,1.5,Micro_01\n")
+
+    first = load_data_module.load_data.__wrapped__(csv)
+    assert cache.stats()["entries"] == 1
+
+    cached = load_data_module.load_data.__wrapped__(csv)
+    assert cached.attrs["fingerprint"] == first.attrs["fingerprint"]
+    assert list(cached.columns) == list(first.columns)
+
+
+def test_load_data_streaming_matches_full_load(tmp_path):
+    from src.modules.home.metrics import calculate_energy_std_dev, count_records
+    from src.utils.ingest import normalize_data
+    from src.utils.load_data import load_data_streaming
+
+    csv = tmp_path / "export.csv"
+    rows = [
+        f"Wilkne,2024-{month:02d}-{day:02d},{sn},{port},{(day * port) % 7 * 0.5},Micro_0{sn}"
+        for month in (1, 2)
+        for day in (1, 15, 28)
+        for sn in (1, 2)
+        for port in (1, 2)
+    ]
+    csv.write_text(
+        " Plant Name,Date,SN,Port,Energy (kWh),Microinversor\n" + "\n".join(rows)
+    )
+
+    full = normalize_data(pd.read_csv(csv))
+    rollup = load_data_streaming.__wrapped__(csv, chunksize=5)
+
+    assert count_records(rollup) == len(full)
+    assert rollup["Energy"].sum() == pytest.approx(full["Energy"].sum())
+    assert calculate_energy_std_dev(rollup) == pytest.approx(full["Energy"].std())
+    assert rollup["Records_pos"].sum() == (full["Energy"] > 0).sum()
+
+
+def test_start_ingest_reports_progress_and_result(tmp_path, monkeypatch):
+    from src.utils import ingest
+
+    monkeypatch.setattr(ingest, "dataset_cache", DatasetCache(tmp_path))
+    monkeypatch.setattr(ingest, "dataset_store", DatasetStore(tmp_path / "shared"))
+    csv = tmp_path / "export.csv"
+    rows = [f"Wilkne,2024-01-{day:02d},1,1,{day * 0.5},Micro_01" for day in range(1, 29)]
+    csv.write_text(
+        " Plant Name,Date,SN,Port,Energy (kWh),Microinversor\n" + "\n".join(rows)
+    )
+
+    job = ingest.start_ingest(csv, key="export")
+    assert job.wait(timeout=30)
+    assert job.error is None
+    assert job.key == "export"
+    assert len(job.result) == 28
+    assert job.progress.rows == 28
+    assert job.progress.fraction == pytest.approx(1.0)
+    assert job.progress.stage == "concluído"
+    assert job._target is None  # O job guardado na sessão não retém o upload
+
+    empty = tmp_path / "vazio.csv"
+    empty.write_text("Plant Name,Date,SN,Port,Energy (kWh),Microinversor\n")
+    failed = ingest.start_ingest(empty, streaming=True)
+    assert failed.wait(timeout=30)
+    assert isinstance(failed.error, ValueError)
+    assert failed.result is None
+
+
+def test_dataset_store_shares_one_mapped_copy(tmp_path):
+    df = pd.DataFrame({"Energy": [1.5, 2.0, 0.0], "Year": [2024, 2024, 2025]})
+    df.attrs["fingerprint"] = "a"
+    store = DatasetStore(tmp_path, max_bytes=1)
+
+    first, second = store.acquire(df), store.acquire(df.copy())
+    assert first.frame is second.frame  # Uma cópia para todas as sessões
+    pd.testing.assert_frame_equal(first.frame, df)
+    assert not first.frame["Energy"].to_numpy().flags.writeable  # Memory-map
+    assert store.stats()["refs"] == 2
+
+    # Com referências, o conjunto resiste ao limite de 1 byte
+    other = pd.DataFrame({"Energy": [3.0]})
+    other.attrs["fingerprint"] = "b"
+    store.put(other)
+    assert store.stats()["entries"] == 2
+
+    first.release()
+    first.release()  # Sem efeito na segunda chamada
+    assert store.stats()["refs"] == 1
+    assert store.stats()["entries"] == 2
+    del second  # Coletado junto com a sessão: "a" sai da memória e do disco
+    assert store.stats()["refs"] == 0
+    assert store.get("a") is None
+    assert not (tmp_path / "a.arrow").exists()
+
+    assert store.clear() == 1  # "b", sem referências
+    assert store.stats()["entries"] == 0
+
+
+def test_apply_schema_compacts_loaded_frame():
+    from src.utils.ingest import normalize_data
+    from src.utils.schema import format_month_year, memory_report
+
+    raw = pd.DataFrame({
+        "Plant Name": ["Wilkne"] * 3,
+        "Date": ["2024-12-30", "2025-01-02", "2025-04-06"],
+        "SN": [106272403152] * 3,
+        "Port": [1, 2, 3],
+        "Energy (kWh)": [1.5, 0.0, 2.25],
+        "Microinversor": ["Micro_01", "Micro_01", "Micro_02"],
+    })
+    df = normalize_data(raw.copy())
+
+    assert df["Microinversor"].dtype == "category"
+    assert df["Year"].dtype == "int16"
+    assert df["Week"].tolist() == [1, 1, 14]
+    assert df["Month_Year"].tolist() == [202412, 202501, 202504]
+    assert format_month_year(df["Month_Year"].iloc[0]) == "2024-12"
+
+    before = raw.rename(columns={"Energy (kWh)": "Energy"})
+    report = memory_report(before, df[before.columns])
+    assert report.loc["Total", "bytes_after"] < report.loc["Total", "bytes_before"]
+
+
+def test_derive_date_parts_broadcasts_unique_dates():
+    from src.utils.date_parts import derive_date_parts
+
+    dates = pd.Series(pd.to_datetime(["2025-01-02", None, "2025-01-02", "2024-12-30"]))
+    parts = derive_date_parts(dates)
+
+    assert parts.loc[[0, 2, 3], "Week"].tolist() == [1, 1, 1]
+    assert parts.loc[[0, 3], "Month_Year"].tolist() == [202501, 202412]
+    assert parts.loc[1].isna().all()
+
+
+def test_rollup_cube_query_matches_filtered_rows():
+    from src.modules.home.metrics import count_records, date_bounds
+    from src.utils.aggregates import RollupCube, get_cube
+    from src.utils.ingest import normalize_data
+
+    raw = pd.DataFrame({
+        "Plant Name": ["Wilkne"] * 6,
+        "Date": ["2023-05-01", "2024-01-10", "2024-01-11", "2024-02-01", "2024-03-05", "2025-01-01"],
+        "SN": [1, 1, 1, 2, 2, 2],
+        "Port": [1, 2, 1, 1, 2, 1],
+        "Energy (kWh)": [1.0, 0.0, 2.0, 3.0, 0.0, 4.0],
+        "Microinversor": ["Micro_01"] * 3 + ["Micro_02"] * 3,
+    })
+    df = normalize_data(raw)
+    df.attrs["fingerprint"] = "test-cube"
+    cube = get_cube(df)
+    assert get_cube(df) is cube  # Construído uma única vez por conjunto de dados
+
+    result = cube.query(
+        ["Microinversor", "Year", "Month"],
+        year_range=(2024, 2024),
+        microinverters=["Micro_01", "Micro_02"],
+        show_zeros=False,
+    )
+    expected = df[df["Year"].eq(2024) & (df["Energy"] > 0)]
+
+    assert count_records(result) == len(expected)
+    assert result["Energy"].sum() == pytest.approx(expected["Energy"].sum())
+    assert date_bounds(result) == (expected["Date"].min(), expected["Date"].max())
+    assert cube.query(["Year"], microinverters=["Micro_02"])["Records"].tolist() == [2, 1]
+
+    with pytest.raises(ValueError, match="Dimensões ausentes"):
+        RollupCube(df).cuboid(["Week"])
+
+
+def test_compute_home_metrics_matches_per_card_functions():
+    from src.modules.home.metrics import (
+        calculate_coefficient_of_variation,
+        calculate_energy_std_dev,
+        compute_home_metrics,
+    )
+    from src.utils.aggregates import aggregate_measures
+
+    data = pd.DataFrame({
+        "Date": pd.to_datetime(["2024-12-30", "2025-01-02", "2025-01-03", "2025-02-01"]),
+        "Year": [2024, 2025, 2025, 2025],
+        "Month": [12, 1, 1, 2],
+        "Microinversor": ["Micro_01", "Micro_01", "Micro_02", "Micro_02"],
+        "Energy": [1.0, 2.0, 4.0, 8.0],
+    })
+    reference = pd.Timestamp("2025-01-15")
+
+    raw = compute_home_metrics(data, reference_date=reference)
+    rollup = compute_home_metrics(aggregate_measures(data), reference_date=reference)
+
+    assert raw.records == 4
+    assert raw.microinverters == 2
+    assert (raw.current_month_energy, raw.current_year_energy) == (6.0, 14.0)
+    assert raw.std_dev == pytest.approx(calculate_energy_std_dev(data))
+    assert raw.coefficient_of_variation == pytest.approx(
+        calculate_coefficient_of_variation(data)
+    )
+    assert (rollup.start_date, rollup.end_date) == (raw.start_date, raw.end_date)
+    for field in ("records", "total_energy", "std_dev", "efficiency"):
+        assert getattr(rollup, field) == pytest.approx(getattr(raw, field)), field
+
+
+def test_lru_cache_evicts_by_byte_budget():
+    from src.utils.lru_cache import LRUCache
+
+    cache = LRUCache(max_bytes=10, sizeof=len)
+    cache.put("a", "aaaa")
+    cache.put("b", "bbbb")
+    assert cache.get("a") == "aaaa"  # "a" passa a ser a mais recente
+
+    cache.put("c", "cccc")  # Excede 10 bytes: remove "b", a menos recente
+    assert cache.get("b") is None
+    assert cache.get_or_compute("c", lambda: "novo") == "cccc"
+
+    cache.put("big", "x" * 11)  # Maior que o orçamento: não é armazenado
+    assert cache.get("big") is None
+    assert cache.stats() == {
+        "entries": 2, "bytes": 8, "max_bytes": 10, "hits": 2, "misses": 2
+    }
+
+
+def test_row_index_select_matches_column_scans():
+    from src.utils.row_index import RowIndex
+
+    df = pd.DataFrame({
+        "Microinversor": pd.Categorical(["M1", "M2", "M1", "M3", None, "M2"]),
+        "Port": [1, 2, 1, 2, 1, 1],
+        "Date": pd.to_datetime(
+            ["2024-03-01", "2024-01-01", "2023-12-31", "2024-02-01", "2024-01-15", "2025-01-01"]
+        ),
+    })
+    index = RowIndex(df)
+    period = (pd.Timestamp("2024-01-01"), pd.Timestamp("2024-12-31"))
+
+    expected = df["Microinversor"].isin(["M1", "M2", "M9"]) & df["Date"].between(*period)
+    mask = index.select({"Microinversor": ["M1", "M2", "M9"]}, between=period)
+    assert mask.tolist() == expected.tolist()
+
+    mask = index.select({"Microinversor": ["M1", "M2"], "Port": [1]})
+    assert mask.tolist() == [True, False, True, False, False, True]
+    assert index.select(between=period).tolist() == df["Date"].between(*period).tolist()
+    assert index.select().all()
+
+
+def test_date_window_slices_sorted_frames_without_copy():
+    import numpy as np
+
+    from src.utils.aggregates import aggregate_measures
+    from src.utils.time_window import date_window, is_period_sorted, sort_by_period
+
+    raw = pd.DataFrame({
+        "Date": pd.to_datetime(["2024-03-05", "2024-01-31", None, "2023-12-31", "2024-02-01"]),
+        "Year": [2024, 2024, 2024, 2023, 2024],
+        "Month": [3, 1, 1, 12, 2],
+        "Energy": [1.0, 2.0, 4.0, 8.0, 16.0],
+    })
+    data = sort_by_period(raw)
+    assert is_period_sorted(data)
+    assert not is_period_sorted(raw)
+
+    window = date_window(data, "2024-01-01", "2024-02-29")
+    assert window["Energy"].tolist() == [2.0, 16.0]
+    assert np.shares_memory(window["Energy"].to_numpy(), data["Energy"].to_numpy())
+    assert window["Energy"].tolist() == date_window(raw, "2024-01-01", "2024-02-29")[
+        "Energy"
+    ].tolist()
+    assert date_window(data, date_from="2024-02-01")["Energy"].tolist() == [16.0, 1.0]
+
+    rollup = sort_by_period(aggregate_measures(raw.dropna(), ["Year", "Month"]))
+    assert date_window(rollup, "2024-01-15", "2024-02-01")["Energy"].tolist() == [2.0, 16.0]
+    assert date_window(rollup, date_to="2023-12-01")["Records"].tolist() == [1]
+
+    # Reordenada por outra coluna, a tabela mantém os attrs mas não a ordem
+    shuffled = data.sort_values("Energy", ascending=False)
+    assert not is_period_sorted(shuffled)
+    assert sorted(date_window(shuffled, "2024-01-01", "2024-02-29")["Energy"]) == [2.0, 16.0]
+
+
+def test_stage_profiler_records_nested_stages_per_run():
+    import json
+    import tracemalloc
+
+    from src.utils.profiler import StageProfiler, profiled, stage
+
+    @profiled("build")
+    def build(size):
+        return [0] * size
+
+    assert build(3) == [0, 0, 0]  # Sem run() ativo: executa sem medir
+
+    profiler = StageProfiler(history=2)
+    for _ in range(3):
+        with profiler.run(trace_memory=True):
+            with stage("render"):
+                build(100_000)
+                build(10)
+
+    assert len(profiler.runs) == 2  # Apenas os últimos reruns
+    stages = profiler.runs[-1]["stages"]
+    assert stages["build"]["calls"] == 2
+    assert stages["render"]["peak_bytes"] >= stages["build"]["peak_bytes"] > 800_000
+
+    summary = profiler.summary().set_index("etapa")
+    assert summary.loc["build", "chamadas"] == 4
+    assert summary.loc["rerun (total)", "reruns"] == 2
+    assert len(json.loads(profiler.to_json())["runs"]) == 2
+
+    # Reruns simultâneos (duas sessões) dividem o tracemalloc: picos inválidos
+    other = StageProfiler()
+    with profiler.run(trace_memory=True):
+        with other.run(trace_memory=True), stage("render"):
+            build(10)
+        assert tracemalloc.is_tracing()  # Ainda em uso pelo primeiro rerun
+    assert not tracemalloc.is_tracing()  # Desligado pelo último
+    assert profiler.runs[-1]["peak_bytes"] is None
+    assert other.runs[-1]["stages"]["render"]["peak_bytes"] is None
+
+
+def test_core_imports_without_streamlit():
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    src = Path(__file__).resolve().parents[1] / "src"
+    check = (
+        "import sys, core; "
+        "print(','.join(m for m in ('streamlit', 'plotly') if m in sys.modules))"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=src,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == ""
+
+
+def test_section_result_recomputes_only_when_inputs_change(monkeypatch):
+    from src.modules.home import home_view
+
+    monkeypatch.setattr(home_view.st, "session_state", {})
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert home_view.section_result("cards", ("a", (2020, 2021)), compute) == 1
+    assert home_view.section_result("cards", ("a", (2020, 2021)), compute) == 1
+    assert home_view.section_result("charts", ("a", (2020, 2021)), compute) == 2
+    assert home_view.section_result("cards", ("a", (2021, 2021)), compute) == 3
+    assert home_view.section_result("cards", None, compute) == 4
+    assert len(calls) == 4
+
+
+def test_figure_registry_builds_each_figure_once(monkeypatch):
+    import plotly.graph_objects as go
+
+    from src.modules.home import charts
+
+    monkeypatch.setattr(charts, "figure_cache", type(charts.figure_cache)())
+    calls = []
+
+    def builder(data):
+        calls.append(len(data))
+        return go.Figure(go.Bar(y=data["Energy"]))
+
+    def failing(data):
+        raise ValueError("sem dados")
+
+    monkeypatch.setattr(
+        charts.FigureRegistry, "BUILDERS", {"barchart": builder, "heatmap": failing}
+    )
+    registry = charts.FigureRegistry(pd.DataFrame({"Energy": [1.0, 2.0]}))
+
+    assert registry.built == []  # Nada é montado antes de ser pedido
+    figure = registry.get("barchart")
+    assert registry.get("barchart") is figure
+    assert calls == [2]
+    assert isinstance(registry.get("heatmap"), ValueError)
+    assert registry.built == ["barchart", "heatmap"]
+
+
+def test_figure_cache_is_addressed_by_content():
+    import plotly.graph_objects as go
+
+    from src.utils.figure_cache import FigureCache
+
+    cache = FigureCache(max_bytes=1024 * 1024)
+    calls = []
+
+    def builder(data, title="Energia"):
+        calls.append(title)
+        return go.Figure(go.Bar(y=data["Energy"]), layout={"title": title})
+
+    data = pd.DataFrame({"Energy": [1.0, 2.0]})
+    first = cache.get_or_build(builder, data)
+    again = cache.get_or_build(builder, data.copy())  # Mesmo conteúdo, outro objeto
+    assert again.to_dict() == first.to_dict()
+    assert calls == ["Energia"]
+
+    cache.get_or_build(builder, data, title="Outro")  # Parâmetros fazem parte da chave
+    cache.get_or_build(builder, data.assign(Energy=[1.0, 3.0]))
+    assert calls == ["Energia", "Outro", "Energia"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["entries"] == 3
+
+    # Figuras sem validação (modo raw) são validadas antes de entrar no cache
+    def unvalidated(data):
+        return go.Figure({"data": [{"type": "bar", "bogus": 1}]}, _validate=False)
+
+    with pytest.raises(ValueError, match="Invalid property"):
+        cache.get_or_build(unvalidated, data)
+    assert cache.stats()["entries"] == 3
+
+
+def test_wire_figure_sends_typed_arrays():
+    import json
+
+    import numpy as np
+    import plotly.express as px
+
+    from src.charts.serialization import wire_figure
+
+    df = pd.DataFrame({
+        "Date": pd.date_range("2020-01-01", periods=6),
+        "Energy": np.arange(6, dtype="float64"),
+        "Label": list("abcdef"),
+    })
+    fig = wire_figure(px.line(df, x="Date", y="Energy", text="Label"), min_points=1)
+
+    trace = fig.data[0]
+    assert trace.y.dtype == np.float32
+    epoch_ms = pd.Timestamp("2020-01-01").value / 1e6  # ms desde a época
+    assert trace.x[0] == pytest.approx(epoch_ms)
+    assert fig.layout.xaxis.type == "date"
+    assert list(trace.text) == list("abcdef")  # Textos não são convertidos
+    assert "bdata" in json.dumps(fig.to_dict()["data"][0]["y"])
+
+
+def test_heatmap_keeps_float32_matrix():
+    import numpy as np
+
+    from src.charts.safe_heatmap_chart import Heatmap
+
+    values = np.array([[100.0, 250.0], [0.0, 50.0]], dtype=np.float32)
+    z = Heatmap(values, ["d1", "d2"], ["MI-1", "MI-2"], ["#000", "#fff"]).fig.data[0].z
+    assert isinstance(z, np.ndarray)
+    assert z.dtype == np.float32
+    np.testing.assert_allclose(z, values / 100)  # kWh -> MWh
+
+    from_lists = Heatmap(values.tolist(), ["d1", "d2"], ["MI-1", "MI-2"], ["#000", "#fff"]).fig
+    np.testing.assert_allclose(from_lists.data[0].z, z)
+
+
+def test_downsample_frame_keeps_peaks_per_series():
+    import numpy as np
+
+    from src.utils.downsampling import downsample_frame, lttb_indices
+
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2015-01-01", periods=5_000)
+    df = pd.DataFrame({
+        "Date": np.tile(dates, 2),
+        "Energy": rng.random(10_000),
+        "Porta": np.repeat(["MI-1/1", "MI-1/2"], 5_000),
+    })
+    df.loc[1234, "Energy"] = 50.0  # Pico isolado da primeira série
+
+    for method in ("lttb", "minmax"):
+        reduced = downsample_frame(df, "Date", "Energy", "Porta", 200, method)
+        sizes = reduced.groupby("Porta").size()
+        assert sizes.between(190, 202).all()
+        assert reduced.index.is_monotonic_increasing
+        assert 1234 in reduced.index
+        for _, series in reduced.groupby("Porta"):  # Extremos de cada linha
+            assert series["Date"].iloc[[0, -1]].tolist() == [dates[0], dates[-1]]
+
+    small = df.head(100)  # Séries que já cabem não são copiadas
+    assert downsample_frame(small, "Date", "Energy", "Porta", 200) is small
+    # Várias séries de uma vez dão o mesmo resultado que uma por vez
+    x, y = np.arange(10_000.0), df["Energy"].to_numpy()
+    together = lttb_indices(x, y, 200, starts=[0, 5_000])
+    first = lttb_indices(x[:5_000], y[:5_000], 200)
+    second = 5_000 + lttb_indices(x[5_000:], y[5_000:], 200)
+    apart = np.concatenate([first, second])
+    assert (together == apart).all()
+
+
+def test_dense_charts_switch_to_webgl(monkeypatch):
+    import numpy as np
+
+    from config.constants import ChartSettings  # O módulo que os gráficos leem
+    from src.charts.chart_area import AreaChart
+    from src.charts.line_chart import LineChart
+
+    monkeypatch.setattr(ChartSettings, "WEBGL_MIN_POINTS", 100)
+    df = pd.DataFrame({
+        "Month": np.tile(np.arange(1, 61), 2),
+        "Energy": np.arange(120, dtype="float64") + 1,
+        "Year": np.repeat([2023, 2024], 60),
+    })
+
+    line = LineChart(df, "Month", "Energy", "Year").add_peaks_per_group()
+    assert [trace.type for trace in line.fig.data] == ["scattergl"] * 2 + ["scatter"] * 2
+    assert LineChart(df.head(50), "Month", "Energy", "Year").fig.data[0].type == "scatter"
+
+    area = AreaChart(df, "Month", "Energy", "Year", ["#111", "#222"], {1: "jan"})
+    lower, upper = area.fig.data
+    assert (lower.type, lower.fill, upper.fill) == ("scattergl", "tozeroy", "tonexty")
+    assert upper.y[0] == 1 + 61  # Empilhado sobre 2023
+    assert upper.customdata[0] == 61  # Valor do ponto no hover
+    assert "customdata" in upper.hovertemplate
+
+
+def test_overlay_layer_commits_items_in_one_update():
+    import plotly.graph_objects as go
+
+    from src.charts.overlays import OverlayLayer
+
+    fig = go.Figure(go.Bar(x=["2023", "2024"], y=[1, 2]))
+    fig.add_annotation(x="2023", y=1, text="existente")
+    layer = (
+        OverlayLayer()
+        .add_annotations(x=["2023", "2024"], y=0, text=["a", "b"], showarrow=False)
+        .add_shapes(type="line", x0=0, x1=1, y0=[1.0, 2.0], y1=[1.0, 2.0])
+        .add_segments(["2023", "2024"], 0, ["2023", "2024"], [1.5, 2.5], showlegend=False)
+    )
+    assert fig.layout.shapes == ()  # Nada entra antes do commit
+    layer.commit(fig)
+
+    assert [a.text for a in fig.layout.annotations] == ["existente", "a", "b"]
+    assert [s.y0 for s in fig.layout.shapes] == [1.0, 2.0]
+    segments = fig.data[-1]  # Um traço para todos os segmentos
+    assert list(segments.x) == ["2023", "2023", None, "2024", "2024", None]
+    assert list(segments.y) == [0, 1.5, None, 0, 2.5, None]
+    assert layer.annotations == []
+    assert layer.traces == []
+
+    with pytest.raises(ValueError, match="tamanhos diferentes"):
+        OverlayLayer().add_annotations(x=[1, 2], y=[1, 2, 3])
+
+
+@pytest.mark.parametrize(
+    "chart",
+    ["BarChart", "LineChart", "AreaChart", "GroupedBarChart", "Heatmap"],
+)
+def test_raw_figures_match_plotly_express(chart):
+    import json
+
+    import numpy as np
+    import plotly.graph_objects as go
+
+    from charts.raw import FigureSpec  # O módulo que os gráficos importam
+    from src.charts.bar_chart import BarChart
+    from src.charts.chart_area import AreaChart
+    from src.charts.grouped_bar_chart import GroupedBarChart
+    from src.charts.line_chart import LineChart
+    from src.charts.safe_heatmap_chart import Heatmap
+
+    df = pd.DataFrame({
+        "Month": np.tile(np.arange(1, 13), 2),
+        "Energy": np.arange(24, dtype="float64") * 10,
+        "Year": np.repeat([2023, 2024], 12),
+    })
+    colors = ["#111", "#222"]
+    months = {1: "jan", 2: "fev"}
+    builders = {
+        # Os mesmos passos dos construtores da Home
+        "BarChart": lambda raw: BarChart(
+            df.head(12), "Month", "Energy", colors, yaxis_title="Energia", raw=raw
+        )
+        .set_titles("Título", "Subtítulo")
+        .apply_customizations(line_width=2, opacity=0.9),
+        "LineChart": lambda raw: LineChart(
+            df, "Month", "Energy", "Year", period_mapping=months, raw=raw
+        )
+        .set_titles("Título", "Subtítulo")
+        .apply_style()
+        .add_peaks_per_group(),
+        "AreaChart": lambda raw: AreaChart(
+            df, "Month", "Energy", "Year", colors, months, theme="light", raw=raw
+        )
+        .set_titles("Título", "Subtítulo")
+        .apply_style(opacity=0.8, line_width=3, show_legend=False)
+        .add_peak_annotation(y_offset=50, bgcolor="rgba(200,200,200,0.3)"),
+        "GroupedBarChart": lambda raw: GroupedBarChart(
+            df.astype({"Year": str}), "Month", "Energy", "Year", colors, raw=raw
+        ),
+        "Heatmap": lambda raw: Heatmap(
+            np.arange(24, dtype="float32").reshape(2, 12),
+            list(range(1, 13)),
+            ["2023", "2024"],
+            colors,
+            theme="dark",
+            xlabel="Mês",
+            raw=raw,
+        ).set_titles("Título", "Subtítulo", subtitle_font={"size": 12, "color": "#ccc"}),
+    }
+
+    def spec(fig):
+        # Sem dicionários vazios (ex.: title={"font": {}}), que não desenham nada
+        def prune(value):
+            if isinstance(value, dict):
+                value = {key: prune(item) for key, item in value.items()}
+                return {key: item for key, item in value.items() if item != {}}
+            return [prune(item) for item in value] if isinstance(value, list) else value
+
+        return prune(json.loads(fig.to_json()))
+
+    expected, built = builders[chart](False), builders[chart](True)
+    assert isinstance(built._figure, FigureSpec)
+    # Validada por inteiro, a figura raw é a mesma do Plotly Express
+    assert spec(go.Figure(built.fig)) == spec(expected.fig)